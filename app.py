@@ -1,44 +1,58 @@
 import os
-import re
 import json
 import datetime
 from datetime import timedelta
-import pandas as pd
+from functools import partial
 import streamlit as st
-import google.generativeai as genai
-from ics import Calendar, Event
-import PyPDF2
-from docx import Document
+import exports
+import resume_parser
+import telemetry
+from resume_parser import ResumeParseError
+from gemini_gateway import configure as configure_gemini, get_gateway
+from plan_parser import DAYS_PER_WEEK, PlanStream, format_plan_markdown, week_days
+from career_ai import MAX_PLAN_WEEKS, clean_github_input
+from task_queue import FAILED, FINISHED, TASK_WORKERS, get_task_queue
+from roles import canonicalize_role
+from skills import canonical_skills
 
 # ──────────────────────────────────────────────────────────────
 # App Setup
 # ──────────────────────────────────────────────────────────────
 st.set_page_config(page_title="Career-iFy", page_icon="🧠", layout="wide")
 
-# Get API key - try multiple methods
-GEMINI_KEY = None
-
-# Method 1: Try Streamlit secrets (for Streamlit Cloud)
-try:
-    GEMINI_KEY = st.secrets["GEMINI_API_KEY"]
-except:
-    pass
-
-# Method 2: Try environment variable
-if not GEMINI_KEY:
-    GEMINI_KEY = os.getenv("GEMINI_API_KEY")
-
-# Method 3: Try loading from .env file (for local development)
-if not GEMINI_KEY:
+@st.cache_resource(show_spinner=False)
+def load_gemini_key() -> str | None:
+    """Find the API key and hand it to the Gemini gateway, once per process rather than every rerun."""
+    # Method 1: Try Streamlit secrets (for Streamlit Cloud)
+    key = None
     try:
-        from dotenv import load_dotenv
-        load_dotenv()
-        GEMINI_KEY = os.getenv("GEMINI_API_KEY")
+        key = st.secrets["GEMINI_API_KEY"]
     except:
         pass
 
+    # Method 2: Try environment variable
+    if not key:
+        key = os.getenv("GEMINI_API_KEY")
+
+    # Method 3: Try loading from .env file (for local development)
+    if not key:
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+            key = os.getenv("GEMINI_API_KEY")
+        except:
+            pass
+
+    # The SDK itself is imported on the first Gemini call, not at startup
+    if key:
+        configure_gemini(key)
+    return key
+
+GEMINI_KEY = load_gemini_key()
+
 # Check if we have a key
 if not GEMINI_KEY:
+    load_gemini_key.clear()  # look again on the next run instead of caching the miss
     st.error("⚠️ GEMINI_API_KEY not found. Please add it to Streamlit Cloud Secrets or create a .env file locally.")
     st.info("""
     **For Streamlit Cloud:**
@@ -51,213 +65,133 @@ if not GEMINI_KEY:
     """)
     st.stop()
 
-genai.configure(api_key=GEMINI_KEY)
-MODEL_NAME = "gemini-2.5-flash"
+# Upper bound on daily-plan week chunks one session has queued or running at once (override per deployment);
+# kept below the process-wide task workers so one session's plans never hold all of them
+PLAN_WORKERS = max(1, min(int(os.getenv("CAREERIFY_PLAN_WORKERS", "3")), TASK_WORKERS - 1))
+
+# How often the page polls a running analysis, and redraws while daily plans are streaming in
+TASK_POLL_SECONDS = 1.0
+PLAN_REFRESH_SECONDS = 0.3
+
+# Analysis stages in the order the task reports them, with the status shown while each is pending
+ANALYSIS_STEPS = (
+    ("resume_skills", "📄 Analyzing your resume..."),
+    ("github_repos", "🔍 Fetching your GitHub repositories..."),
+    ("repo_skills", "🔍 Analyzing your GitHub repositories..."),
+    ("market", "🌍 Analyzing job market trends..."),
+    ("skills", "🧩 Merging your skills..."),
+    ("report", "🤖 Generating personalized projects..."),
+)
+
+# Sidebar panel with the stage timing waterfall of the latest analysis and daily plans
+DEBUG_PANEL = os.getenv("CAREERIFY_DEBUG_PANEL", "0") == "1"
 
 # ──────────────────────────────────────────────────────────────
 # Utility Functions
 # ──────────────────────────────────────────────────────────────
-def safe_gemini_text(resp) -> str:
-    """Safely extract plain text from Gemini responses."""
-    try:
-        if getattr(resp, "candidates", None):
-            cand = resp.candidates[0]
-            parts = getattr(cand, "content", None)
-            if parts and getattr(parts, "parts", None):
-                text = "".join([p.text for p in parts.parts if hasattr(p, "text")])
-                return text.strip()
-    except Exception:
-        return ""
-    return ""
-
-def clean_github_input(s: str) -> str:
-    """Normalize GitHub username or URL."""
-    s = (s or "").strip()
-    return s.rstrip("/").split("/")[-1] if "github.com" in s else s
-
-def fetch_github_repos(username: str) -> list[str]:
-    """Fetch public GitHub repositories."""
-    import requests
-    url = f"https://api.github.com/users/{username}/repos"
-    
-    headers = {
-        "Accept": "application/vnd.github+json",
-        "User-Agent": "Career-iFy-App"
-    }
-    
-    try:
-        r = requests.get(url, headers=headers, timeout=20)
-        if r.status_code != 200:
-            return []
-        return [repo.get("name", "") for repo in r.json() if isinstance(repo, dict)]
-    except Exception:
-        return []
-
-def extract_text_from_pdf(file) -> str:
-    """Extract text from uploaded PDF file."""
-    try:
-        pdf_reader = PyPDF2.PdfReader(file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text.strip()
-    except Exception as e:
-        st.error(f"Error reading PDF: {e}")
-        return ""
-
-def extract_text_from_docx(file) -> str:
-    """Extract text from uploaded DOCX file."""
-    try:
-        doc = Document(file)
-        text = "\n".join([para.text for para in doc.paragraphs])
-        return text.strip()
-    except Exception as e:
-        st.error(f"Error reading DOCX: {e}")
-        return ""
-
-def extract_text_from_txt(file) -> str:
-    """Extract text from uploaded TXT file."""
-    try:
-        return file.read().decode("utf-8").strip()
-    except Exception as e:
-        st.error(f"Error reading TXT: {e}")
-        return ""
+def build_daily_task_rows(plans: list[tuple[str, int, list[tuple[int, str]]]], start_date: datetime.date) -> list[dict]:
+    """Turn parsed (project, weeks, days) plans into dated task rows, projects back to back."""
+    rows = []
+    current_date = start_date
+    for project_title, weeks, days in plans:
+        for day_num, task in days:
+            task_date = current_date + timedelta(days=day_num - 1)
+            rows.append({
+                "Date": task_date.strftime("%Y-%m-%d"),
+                "Day": f"Day {day_num}",
+                "Project": project_title,
+                "Task": task
+            })
+        current_date = current_date + timedelta(weeks=weeks)
+    return rows
 
 def extract_resume_text(uploaded_file) -> str:
     """Extract text from various resume formats."""
     if uploaded_file is None:
         return ""
     
-    file_type = uploaded_file.type
-    
-    if file_type == "application/pdf":
-        return extract_text_from_pdf(uploaded_file)
-    elif file_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-        return extract_text_from_docx(uploaded_file)
-    elif file_type == "text/plain":
-        return extract_text_from_txt(uploaded_file)
-    else:
-        st.error("Unsupported file format. Please upload PDF, DOCX, or TXT.")
+    try:
+        return resume_parser.extract_resume_text(uploaded_file.getvalue(), uploaded_file.type)
+    except ResumeParseError as e:
+        st.error(str(e))
         return ""
 
-# ──────────────────────────────────────────────────────────────
-# Gemini AI Logic
-# ──────────────────────────────────────────────────────────────
-def extract_skills_from_resume(resume_text: str) -> str:
-    """Extract skills from resume using Gemini AI."""
-    model = genai.GenerativeModel(MODEL_NAME)
-    prompt = (
-        f"You are a career mentor AI. Analyze this resume and extract all technical skills, "
-        f"programming languages, frameworks, tools, certifications, and soft skills mentioned.\n\n"
-        f"Resume:\n{resume_text}\n\n"
-        "Return only a comma-separated list of skills. Be comprehensive but concise."
-    )
-    resp = model.generate_content(prompt)
-    return safe_gemini_text(resp)
-
-def infer_skills_from_repos(repo_names: list[str]) -> str:
-    model = genai.GenerativeModel(MODEL_NAME)
-    prompt = (
-        f"You are a career mentor AI. Based on these GitHub project names:\n{repo_names}\n"
-        "List the technical skills, frameworks, and tools the person is proficient in. "
-        "Return only a comma-separated list."
+@st.cache_data(show_spinner=False)
+def skill_count(skills_text: str) -> int:
+    return len(canonical_skills(skills_text))
+
+@st.cache_data(show_spinner=False)
+def planner_summary(projects: tuple[str, ...], weeks: tuple[int, ...], start_date: datetime.date) -> list[dict]:
+    """Back-to-back project schedule rows for the planner table."""
+    events = []
+    for title, project_weeks in zip(projects, weeks):
+        end_date = start_date + timedelta(weeks=project_weeks) - timedelta(days=1)
+        events.append({
+            "Project": title,
+            "Start Date": start_date.strftime("%Y-%m-%d"),
+            "End Date": end_date.strftime("%Y-%m-%d"),
+            "Duration (Weeks)": project_weeks
+        })
+        start_date = end_date + timedelta(days=1)
+    return events
+
+def download_button(label: str, fmt: str, summary_rows: list[dict], daily_rows: list[dict]):
+    """Download button whose file is only built (and memoized) when it is clicked."""
+    mime, file_name = exports.FORMATS[fmt]
+    st.download_button(
+        label,
+        partial(exports.render, fmt, summary_rows, daily_rows),
+        file_name,
+        mime,
+        key=f"download_{fmt}",
+        on_click="ignore",
+        width="stretch"
     )
-    resp = model.generate_content(prompt)
-    return safe_gemini_text(resp)
 
-def merge_skills(resume_skills: str, github_skills: str) -> str:
-    """Merge and deduplicate skills from resume and GitHub."""
-    all_skills = []
-    
-    if resume_skills:
-        all_skills.extend([s.strip() for s in resume_skills.split(",")])
-    if github_skills:
-        all_skills.extend([s.strip() for s in github_skills.split(",")])
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_skills = []
-    for skill in all_skills:
-        skill_lower = skill.lower()
-        if skill_lower not in seen and skill:
-            seen.add(skill_lower)
-            unique_skills.append(skill)
-    
-    return ", ".join(unique_skills)
-
-def get_job_market_context(job_title: str) -> str:
-    model = genai.GenerativeModel(MODEL_NAME)
-    prompt = (
-        f"Provide a concise overview of the current job market for the role '{job_title}'. "
-        "Include:\n1. Top technical & soft skills in demand\n2. Common tools or certifications\n"
-        "3. Industries or domains hiring for this role\nRespond in Markdown bullet points."
-    )
-    resp = model.generate_content(prompt)
-    return safe_gemini_text(resp)
-
-def generate_daily_plan(project_title: str, weeks: int, job_title: str) -> str:
-    """Generate a detailed day-by-day learning plan for a project."""
-    model = genai.GenerativeModel(MODEL_NAME)
-    total_days = weeks * 7
-    prompt = (
-        f"You are a career mentor creating a detailed daily learning plan.\n\n"
-        f"Project: {project_title}\n"
-        f"Duration: {weeks} weeks ({total_days} days)\n"
-        f"Target Role: {job_title}\n\n"
-        f"Create a day-by-day breakdown with specific tasks. Use EXACTLY this format:\n\n"
-        f"**Day 1:** [Specific actionable task]\n\n"
-        f"**Day 2:** [Specific actionable task]\n\n"
-        f"**Day 3:** [Specific actionable task]\n\n"
-        f"And so on...\n\n"
-        f"IMPORTANT FORMATTING RULES:\n"
-        f"- Each day MUST be on its own line with double line breaks\n"
-        f"- Use **Day X:** format (bold with markdown)\n"
-        f"- Keep each task to 1-2 sentences maximum\n"
-        f"- DO NOT write paragraphs - one task per day per line\n"
-        f"- Include empty line between each day\n\n"
-        f"Guidelines for content:\n"
-        f"- Include setup, learning, implementation, and review phases\n"
-        f"- Make tasks concrete and actionable (e.g., 'Set up React project and install dependencies')\n"
-        f"- Every 7th day should be 'Review progress, consolidate learnings, and rest'\n"
-        f"- Progress from basics to advanced concepts\n"
-        f"- End with a deliverable or portfolio addition\n"
-        f"- Be realistic about what can be done each day (2-3 hours of focused work)\n\n"
-        f"Generate exactly {total_days} days. Start now:"
-    )
-    resp = model.generate_content(prompt)
-    return safe_gemini_text(resp)
-
-def compare_skills_and_suggest_projects(skills: str, job_title: str, market_data: str) -> str:
-    model = genai.GenerativeModel(MODEL_NAME)
-    prompt = (
-        f"My current skills: {skills}\n\nJob market overview for {job_title}:\n{market_data}\n\n"
-        "Compare my skills with job market requirements and return three clear sections:\n"
-        "### Matched Skills\n- ...\n\n"
-        "### Missing Skills\n- ...\n\n"
-        "### Suggested Projects\n"
-        "Provide exactly **3** unique and practical projects aligned with the missing skills. "
-        "Use this consistent format:\n"
-        "1. Project Title — one-line description (skill learned)\n"
-        "2. ...\n3. ...\n"
-        "Make sure each title and description are on the same line."
-    )
-    resp = model.generate_content(prompt)
-    return safe_gemini_text(resp)
-    model = genai.GenerativeModel(MODEL_NAME)
-    prompt = (
-        f"My current skills: {skills}\n\nJob market overview for {job_title}:\n{market_data}\n\n"
-        "Compare my skills with job market requirements and return three clear sections:\n"
-        "### Matched Skills\n- ...\n\n"
-        "### Missing Skills\n- ...\n\n"
-        "### Suggested Projects\n"
-        "Provide exactly **3** unique and practical projects aligned with the missing skills. "
-        "Use this consistent format:\n"
-        "1. Project Title — one-line description (skill learned)\n"
-        "2. ...\n3. ...\n"
-        "Make sure each title and description are on the same line."
-    )
-    resp = model.generate_content(prompt)
-    return safe_gemini_text(resp)
+def gemini_queue_caption() -> str:
+    """Status line while calls wait on the shared Gemini quota; empty when nothing is queued."""
+    status = get_gateway().status()
+    if status["breaker"] == "open":
+        return "⏸️ Gemini is having trouble right now — pausing requests briefly before retrying."
+    if status["waiting"]:
+        return f"⏳ {status['waiting']} request(s) queued for Gemini quota (recent wait {status['recent_wait']:.1f}s)"
+    return ""
+
+def merge_task_spans(task_id: str, run: telemetry.Run | None):
+    """Add the spans of a finished background task to a run shown in the debug panel."""
+    task_run = get_task_queue().runs.get(task_id)
+    if run is not None and task_run is not None:
+        for span in task_run.spans:
+            run.add(span)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def plan_week_days(text: str) -> list[tuple[int, str]]:
+    """Days of one generated plan week."""
+    return PlanStream(text, structured=True).snapshot()[1]
+
+def render_debug_panel(runs: dict):
+    """Sidebar waterfall of the stages of each recorded run."""
+    with st.sidebar:
+        st.markdown("### 🛠️ Stage Timings")
+        for name, run in runs.items():
+            rows = run.waterfall()
+            if not rows:
+                continue
+            for i, row in enumerate(rows, 1):
+                row["Step"] = f"{i:02d} {row['Stage']}"
+            st.markdown(f"**{name}** · run `{run.id}`")
+            st.vega_lite_chart(rows, {
+                "mark": "bar",
+                "encoding": {
+                    "y": {"field": "Step", "type": "nominal", "title": None},
+                    "x": {"field": "Start (s)", "type": "quantitative", "title": "seconds"},
+                    "x2": {"field": "End (s)"},
+                    "color": {"field": "Status", "type": "nominal"},
+                    "tooltip": [{"field": k} for k in rows[0] if k != "Step"],
+                },
+            }, width="stretch")
+            with st.expander("Details"):
+                st.dataframe([{k: v for k, v in row.items() if k != "Step"} for row in rows], width="stretch", hide_index=True)
 
 # ──────────────────────────────────────────────────────────────
 # Streamlit App
@@ -332,7 +266,7 @@ st.markdown("---")
 # ──────────────────────────────────────────────────────────────
 # Analysis Section
 # ──────────────────────────────────────────────────────────────
-if st.button("🚀 Analyze My Career Path", type="primary", use_container_width=True):
+if st.button("🚀 Analyze My Career Path", type="primary", width="stretch"):
     if not job_title:
         st.warning("⚠️ Please enter your target job role to continue.")
         st.stop()
@@ -341,10 +275,6 @@ if st.button("🚀 Analyze My Career Path", type="primary", use_container_width=
         st.warning("⚠️ Please provide at least a resume OR GitHub profile to analyze.")
         st.stop()
 
-    resume_skills = ""
-    github_skills = ""
-    repos = []
-    
     # Determine analysis mode
     analysis_mode = ""
     if uploaded_resume and gh_input:
@@ -357,109 +287,221 @@ if st.button("🚀 Analyze My Career Path", type="primary", use_container_width=
         analysis_mode = "📊 **Analysis Mode:** GitHub Only (Technical Skills)"
         st.info(analysis_mode)
 
-    # Step 1 – Extract Resume Skills
+    # Equivalent titles ("ML Engineer", "Machine Learning Eng.") share one market snapshot
+    canonical_role = canonicalize_role(job_title)
+    if canonical_role.lower() != job_title.strip().lower():
+        st.caption(f"🎯 Using job market data for **{canonical_role}**")
+
+    # The analysis runs as a background task: reruns and page changes don't interrupt it, and the
+    # status fragment below picks the result up once it is done
+    analysis_run = telemetry.start_run("Analysis")
+    resume_text = ""
     if uploaded_resume:
-        with st.spinner("📄 Analyzing your resume..."):
+        with st.spinner("📄 Reading your resume..."), telemetry.span("resume_parse", file_type=uploaded_resume.type):
             resume_text = extract_resume_text(uploaded_resume)
-            if resume_text:
-                resume_skills = extract_skills_from_resume(resume_text)
-                st.success("✅ Resume analyzed successfully!")
-            else:
-                st.warning("⚠️ Could not extract text from resume.")
-
-    # Step 2 – Fetch GitHub repos and infer skills
-    if gh_input:
-        username = clean_github_input(gh_input)
-        with st.spinner("🔍 Fetching your GitHub repositories..."):
-            repos = fetch_github_repos(username)
-        
-        if repos:
-            with st.spinner("🧠 Analyzing GitHub projects..."):
-                github_skills = infer_skills_from_repos(repos)
-            st.success(f"✅ Analyzed {len(repos)} GitHub repositories!")
-        else:
-            st.info("ℹ️ Could not fetch GitHub repositories. Continuing with resume analysis only...")
+        if not resume_text:
+            st.warning("⚠️ Could not extract text from resume.")
+    telemetry.end_run(analysis_run)
+    st.session_state.setdefault("telemetry_runs", {})["Analysis"] = analysis_run
+
+    # The live demand table is fetched next to the analysis, so the job boards never hold up its result
+    for key in ("market_demand", "demand_postings"):
+        st.session_state.pop(key, None)
+    st.session_state.demand_task = get_task_queue().submit("demand", {"role": canonical_role})
+    st.session_state.analysis_task = {
+        "id": get_task_queue().submit("analysis", {
+            "role": job_title,
+            "github_user": clean_github_input(gh_input) if gh_input else "",
+            "resume_text": resume_text,
+        }),
+        "job_title": job_title,
+        "analysis_mode": analysis_mode,
+        "github": bool(gh_input),
+    }
 
-    # Step 3 – Merge Skills
-    combined_skills = merge_skills(resume_skills, github_skills)
-    
-    if not combined_skills:
+@st.fragment(run_every=TASK_POLL_SECONDS)
+def analysis_status():
+    """Progress of the running analysis; moves the result into the session once the task finishes."""
+    pending = st.session_state.get("analysis_task")
+    if not pending:
+        return
+    task = get_task_queue().get(pending["id"])
+    if task is None:
+        del st.session_state.analysis_task
+        st.error("❌ The analysis was lost before it finished. Please run it again.")
+        return
+    if task["status"] not in FINISHED:
+        done = task["progress"].get("done", [])
+        st.progress(len(done) / len(ANALYSIS_STEPS), text=next(
+            (label for stage, label in ANALYSIS_STEPS if stage not in done), ANALYSIS_STEPS[-1][1]
+        ))
+        caption = gemini_queue_caption()
+        if caption:
+            st.caption(caption)
+        return
+
+    del st.session_state.analysis_task
+    merge_task_spans(pending["id"], st.session_state.get("telemetry_runs", {}).get("Analysis"))
+    if task["status"] == FAILED:
+        st.error(f"❌ {task['error']}")
+        return
+    result = task["result"]
+    if not result["combined_skills"]:
         st.error("❌ Could not extract skills from the provided sources. Please check your inputs and try again.")
-        st.stop()
+        return
 
-    # Step 4 – Job Market Trends
-    with st.spinner("🌍 Analyzing job market trends..."):
-        market_data = get_job_market_context(job_title)
-    
-    # Step 5 – Skill Comparison + Project Ideas
-    with st.spinner("🤖 Generating personalized projects..."):
-        report = compare_skills_and_suggest_projects(combined_skills, job_title, market_data)
-    
     # Store everything in session state
     st.session_state.analysis_complete = True
-    st.session_state.resume_skills = resume_skills
-    st.session_state.github_skills = github_skills
-    st.session_state.combined_skills = combined_skills
-    st.session_state.market_data = market_data
-    st.session_state.report = report
-    st.session_state.job_title = job_title
-    st.session_state.analysis_mode = analysis_mode
+    for key in ("resume_skills", "github_skills", "combined_skills", "market_data", "report",
+                "project_titles", "language_shares"):
+        st.session_state[key] = result[key]
+    st.session_state.job_title = pending["job_title"]
+    st.session_state.analysis_mode = pending["analysis_mode"]
+    if result["resume_skills"]:
+        st.toast("✅ Resume analyzed successfully!")
+    if result["repos"]:
+        st.toast(f"✅ Analyzed {result['repos']} GitHub repositories!")
+    elif pending["github"]:
+        st.toast("ℹ️ Could not fetch GitHub repositories. Continuing with resume analysis only...")
+    st.rerun()
+
+if st.session_state.get("analysis_task"):
+    analysis_status()
+
+@st.fragment(run_every=TASK_POLL_SECONDS)
+def demand_status():
+    """Placeholder for the live demand table until its task finishes; then reruns the page to show it."""
+    task_id = st.session_state.get("demand_task")
+    if not task_id:
+        return
+    task = get_task_queue().get(task_id)
+    if task is not None and task["status"] not in FINISHED:
+        st.caption("📈 Counting in-demand skills in live job postings...")
+        return
+    del st.session_state.demand_task
+    # A lost or failed table only leaves the overview without it
+    if task is not None and task["status"] != FAILED:
+        st.session_state.market_demand = task["result"]["market_demand"]
+        st.session_state.demand_postings = task["result"]["demand_postings"]
+    st.rerun()
 
-# Display results if analysis is complete
-if st.session_state.get("analysis_complete", False):
-    # Display analysis mode
-    if st.session_state.get("analysis_mode"):
-        st.markdown("---")
-        st.markdown(st.session_state.analysis_mode)
-    
-    # Display Skills Analysis
-    st.markdown("---")
-    st.markdown("## 💼 Your Current Skills")
-    
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Resume Skills", len(st.session_state.resume_skills.split(",")) if st.session_state.resume_skills else 0)
-    with col2:
-        st.metric("GitHub Skills", len(st.session_state.github_skills.split(",")) if st.session_state.github_skills else 0)
-    with col3:
-        st.metric("Total Unique Skills", len(st.session_state.combined_skills.split(",")))
-    
-    with st.expander("📝 View All Extracted Skills", expanded=True):
-        st.success(st.session_state.combined_skills)
-    
-    st.markdown("---")
-    st.markdown("## 📊 Job Market Snapshot")
-    st.markdown(st.session_state.market_data)
-    
-    st.markdown("---")
-    st.markdown("## 🔎 Skill Fit Report & Project Recommendations")
-    st.markdown(st.session_state.report)
+# ──────────────────────────────────────────────────────────────
+# Daily Plans (one background task per project week)
+# ──────────────────────────────────────────────────────────────
+def plan_chunks(events: list[dict]) -> list[tuple[str, int]]:
+    return [(row["Project"], week) for row in events for week in range(1, row["Duration (Weeks)"] + 1)]
+
+def plan_weeks_pending(events: list[dict]) -> bool:
+    """Whether any week of the plan is still to be generated (and hasn't failed this round)."""
+    done = st.session_state.get("daily_plans", {})
+    failed = st.session_state.get("plan_failures", {})
+    return any(chunk not in done and chunk not in failed for chunk in plan_chunks(events))
+
+def render_daily_plans(events: list[dict], live: bool = False):
+    """
+    Day-by-day plan of every project. Each (project, week) is generated by a background task;
+    weeks generated earlier are reused, so changing a project's length only generates the weeks it
+    doesn't have yet. With live, this runs as a polling fragment until every week is in.
+    """
+    daily_plans = st.session_state.setdefault("daily_plans", {})
+    plan_tasks = st.session_state.setdefault("plan_tasks", {})
+    plan_failures = st.session_state.setdefault("plan_failures", {})
+    queue = get_task_queue()
+
+    # Pick up finished weeks; a week that was cut off keeps the days it had
+    progress = {}
+    for chunk, task_id in list(plan_tasks.items()):
+        task = queue.get(task_id)
+        if task is None:
+            # Expired, or lost to a server restart: it is generated again below
+            del plan_tasks[chunk]
+        elif task["status"] not in FINISHED:
+            progress[chunk] = [tuple(day) for day in task["progress"].get("days", [])]
+        else:
+            del plan_tasks[chunk]
+            merge_task_spans(task_id, st.session_state.get("telemetry_runs", {}).get("Daily plans"))
+            if task["status"] == FAILED:
+                cut_off = task["progress"]
+                plan_failures[chunk] = len(cut_off.get("days", []))
+                if cut_off.get("days"):
+                    daily_plans[chunk] = cut_off["text"]
+            else:
+                daily_plans[chunk] = task["result"]
+
+    # Week by week across projects, so every project's plan starts filling in at once
+    chunks = plan_chunks(events)
+    missing = sorted((chunk for chunk in chunks if chunk not in daily_plans and chunk not in plan_failures),
+                     key=lambda chunk: chunk[1])
+    for chunk in missing:
+        if len(plan_tasks) >= PLAN_WORKERS:
+            break
+        if chunk not in plan_tasks:
+            project, week = chunk
+            plan_tasks[chunk] = queue.submit("plan_week", {"project": project, "week": week, "role": st.session_state.job_title})
+
+    if missing:
+        st.info("🤖 Generating personalized daily tasks for each project...")
+    plans = []
+    for i, row in enumerate(events, 1):
+        project = row["Project"]
+        days = [
+            day
+            for week in range(1, row["Duration (Weeks)"] + 1)
+            for day in week_days(week, plan_week_days(daily_plans[(project, week)])
+                                 if (project, week) in daily_plans else progress.get((project, week), []))
+        ]
+        with st.expander(f"📖 {project} - Daily Breakdown", expanded=(i==1)):
+            st.markdown(format_plan_markdown(days) or "⏳ Waiting for the first tasks...")
+        plans.append((project, row["Duration (Weeks)"], days))
+
+    for project, week in chunks:
+        if (project, week) in plan_failures:
+            st.warning(f"⚠️ Week {week} of '{project}' was cut off after {plan_failures[(project, week)]} days.")
+
+    all_daily_tasks = build_daily_task_rows(plans, datetime.date.today())
+    if all_daily_tasks:
+        st.markdown("### 📊 Complete Daily Task Schedule")
+        if missing:
+            st.caption(" · ".join(filter(None, [
+                f"{len(all_daily_tasks)} of {len(chunks) * DAYS_PER_WEEK} daily tasks",
+                gemini_queue_caption(),
+            ])))
+        st.dataframe(all_daily_tasks, width="stretch", height=400)
+
+    if missing:
+        return
+    if live:
+        # Everything is in: stop polling and render the finished plan with its downloads
+        st.rerun()
 
-    # ──────────────────────────────────────────────────────────────
-    # Learning Planner Section
-    # ──────────────────────────────────────────────────────────────
-    st.markdown("---")
-    st.markdown("## 🗓️ Create Your Learning Planner")
+    if all_daily_tasks:
+        # Download options: files are generated on click, not on every rerun
+        st.markdown("### 💾 Download Your Detailed Planner")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            download_button("📊 Download Summary (CSV)", "summary_csv", events, all_daily_tasks)
+        with col2:
+            download_button("📋 Download Daily Plan (CSV)", "daily_csv", events, all_daily_tasks)
+        with col3:
+            download_button("📆 Download Calendar (.ics)", "ics", events, all_daily_tasks)
+        col1, col2, _ = st.columns(3)
+        with col1:
+            download_button("🧾 Download Plan (JSON)", "json", events, all_daily_tasks)
+        with col2:
+            download_button("🗃️ Download Daily Plan (Parquet)", "parquet", events, all_daily_tasks)
 
-    # --- Improved Project Extraction Logic ---
-    report = st.session_state.report
-    pattern_variants = [
-        r"\*\*Title\*\*[:\-]?\s*(.+)",
-        r"###\s*Project\s*\d*[:\-]?\s*(.+)",
-        r"\d+[.)-]\s*(.+)",
-        r"[-•]\s*(.+)"
-    ]
-
-    project_titles = []
-    for pat in pattern_variants:
-        matches = re.findall(pat, report)
-        for m in matches:
-            cleaned = re.sub(r"[\*\_#\-•]+", "", m).strip()
-            if cleaned and len(cleaned.split()) > 2:
-                project_titles.append(cleaned)
-
-    project_titles = list(dict.fromkeys(project_titles))[:3]
+        st.success("✅ Your detailed day-by-day planner is ready! Download and start learning! 🚀")
+    else:
+        st.warning("⚠️ Could not parse daily tasks. Please try regenerating the plan.")
+
+# Polls the plan tasks without holding the script thread between redraws
+live_daily_plans = st.fragment(render_daily_plans, run_every=PLAN_REFRESH_SECONDS)
 
+# ──────────────────────────────────────────────────────────────
+# Learning Planner (a fragment: its widgets rerun only this section)
+# ──────────────────────────────────────────────────────────────
+@st.fragment
+def render_planner(project_titles: list[str]):
     # --- Display Planner ---
     if project_titles:
         # Initialize persistent states only once - use a hash to detect if projects changed
@@ -485,7 +527,7 @@ if st.session_state.get("analysis_complete", False):
                 st.session_state.weeks[i] = st.number_input(
                     "Weeks",
                     min_value=1,
-                    max_value=12,
+                    max_value=MAX_PLAN_WEEKS,
                     value=st.session_state.weeks.get(i, 2),
                     key=weeks_key,
                     help="Set how many weeks you plan to spend on this project"
@@ -496,36 +538,24 @@ if st.session_state.get("analysis_complete", False):
         # Stateful Planner Button
         col1, col2 = st.columns([1, 1])
         with col1:
-            if st.button("📅 Generate Learning Planner", key="generate_planner_btn", type="primary", use_container_width=True):
+            if st.button("📅 Generate Learning Planner", key="generate_planner_btn", type="primary", width="stretch"):
                 st.session_state.planner_generated = True
                 st.session_state.daily_plan_generated = False  # Reset daily plan
         
         with col2:
             if st.session_state.get("planner_generated", False):
-                if st.button("📋 Generate Detailed Daily Plan", key="generate_daily_plan_btn", type="secondary", use_container_width=True):
+                if st.button("📋 Generate Detailed Daily Plan", key="generate_daily_plan_btn", type="secondary", width="stretch"):
                     st.session_state.daily_plan_generated = True
+                    st.session_state.plan_failures = {}  # retry weeks that failed last time
+                    st.session_state.setdefault("telemetry_runs", {})["Daily plans"] = telemetry.Run("Daily plans")
 
         # Generate planner table if user clicked
         if st.session_state.get("planner_generated", False):
             st.markdown("### 📅 Your Personalized Learning Schedule")
             
-            start_date = datetime.date.today()
-            events = []
-            total_weeks = 0
-            
-            for i, title in enumerate(st.session_state.projects, 1):
-                weeks = int(st.session_state.weeks[i])
-                total_weeks += weeks
-                end_date = start_date + timedelta(weeks=weeks) - timedelta(days=1)
-                events.append({
-                    "Project": title,
-                    "Start Date": start_date.strftime("%Y-%m-%d"),
-                    "End Date": end_date.strftime("%Y-%m-%d"),
-                    "Duration (Weeks)": weeks
-                })
-                start_date = end_date + timedelta(days=1)
-
-            df = pd.DataFrame(events)
+            weeks = tuple(int(st.session_state.weeks[i]) for i in range(1, len(st.session_state.projects) + 1))
+            events = planner_summary(tuple(st.session_state.projects), weeks, datetime.date.today())
+            total_weeks = sum(weeks)
             
             # Display summary metrics
             col1, col2, col3 = st.columns(3)
@@ -537,128 +567,80 @@ if st.session_state.get("analysis_complete", False):
                 completion_date = events[-1]["End Date"]
                 st.metric("Expected Completion", completion_date)
             
-            st.dataframe(df, use_container_width=True)
+            st.dataframe(events, width="stretch")
 
             # Generate detailed daily plan if requested
             if st.session_state.get("daily_plan_generated", False):
                 st.markdown("---")
                 st.markdown("### 📋 Detailed Day-by-Day Learning Plan")
-                st.info("🤖 Generating personalized daily tasks for each project...")
-                
-                # Store daily plans in session state
-                if "daily_plans" not in st.session_state:
-                    st.session_state.daily_plans = {}
-                
-                all_daily_tasks = []
-                current_date = datetime.date.today()
-                
-                for i, row in enumerate(events, 1):
-                    project_title = row["Project"]
-                    weeks = row["Duration (Weeks)"]
-                    
-                    # Generate daily plan for this project if not already done
-                    if project_title not in st.session_state.daily_plans:
-                        with st.spinner(f"📝 Creating daily plan for Project {i}..."):
-                            daily_plan = generate_daily_plan(
-                                project_title, 
-                                weeks, 
-                                st.session_state.job_title
-                            )
-                            st.session_state.daily_plans[project_title] = daily_plan
-                    else:
-                        daily_plan = st.session_state.daily_plans[project_title]
-                    
-                    # Display the plan for this project
-                    with st.expander(f"📖 {project_title} - Daily Breakdown", expanded=(i==1)):
-                        st.markdown(daily_plan)
-                    
-                    # Parse daily plan and create structured data
-                    day_pattern = r"Day (\d+):\s*(.+)"
-                    matches = re.findall(day_pattern, daily_plan)
-                    
-                    for day_num, task in matches:
-                        task_date = current_date + timedelta(days=int(day_num) - 1)
-                        all_daily_tasks.append({
-                            "Date": task_date.strftime("%Y-%m-%d"),
-                            "Day": f"Day {day_num}",
-                            "Project": project_title,
-                            "Task": task.strip()
-                        })
-                    
-                    # Move to next project start date
-                    current_date = current_date + timedelta(weeks=weeks)
-                
-                # Create comprehensive daily task dataframe
-                if all_daily_tasks:
-                    daily_df = pd.DataFrame(all_daily_tasks)
-                    
-                    st.markdown("### 📊 Complete Daily Task Schedule")
-                    st.dataframe(daily_df, use_container_width=True, height=400)
-                    
-                    # Download options
-                    st.markdown("### 💾 Download Your Detailed Planner")
-                    col1, col2, col3 = st.columns(3)
-                    
-                    with col1:
-                        # Download summary planner as CSV
-                        csv_summary = df.to_csv(index=False).encode("utf-8")
-                        st.download_button(
-                            "📊 Download Summary (CSV)",
-                            csv_summary,
-                            "career_planner_summary.csv",
-                            "text/csv",
-                            key="download_csv_summary",
-                            use_container_width=True
-                        )
-                    
-                    with col2:
-                        # Download detailed daily plan as CSV
-                        csv_detailed = daily_df.to_csv(index=False).encode("utf-8")
-                        st.download_button(
-                            "📋 Download Daily Plan (CSV)",
-                            csv_detailed,
-                            "career_planner_detailed.csv",
-                            "text/csv",
-                            key="download_csv_detailed",
-                            use_container_width=True
-                        )
-                    
-                    with col3:
-                        # Download as .ics calendar with daily tasks
-                        cal = Calendar()
-                        for _, task_row in daily_df.iterrows():
-                            e = Event()
-                            e.name = f"{task_row['Project']}: {task_row['Day']}"
-                            e.begin = task_row['Date']
-                            e.description = task_row['Task']
-                            e.duration = timedelta(hours=2)  # Default 2 hour task
-                            cal.events.add(e)
-                        
-                        st.download_button(
-                            "📆 Download Calendar (.ics)",
-                            str(cal),
-                            "career_planner_daily.ics",
-                            "text/calendar",
-                            key="download_ics_daily",
-                            use_container_width=True
-                        )
-                    
-                    st.success("✅ Your detailed day-by-day planner is ready! Download and start learning! 🚀")
+                if plan_weeks_pending(events):
+                    live_daily_plans(events, live=True)
                 else:
-                    st.warning("⚠️ Could not parse daily tasks. Please try regenerating the plan.")
+                    render_daily_plans(events)
             
             elif not st.session_state.get("daily_plan_generated", False):
                 st.info("💡 Click 'Generate Detailed Daily Plan' to get a day-by-day breakdown of tasks for each project!")
     else:
         st.info("💡 No project titles detected — try analyzing again for better project details.")
 
+# Display results if analysis is complete
+if st.session_state.get("analysis_complete", False):
+    # Display analysis mode
+    if st.session_state.get("analysis_mode"):
+        st.markdown("---")
+        st.markdown(st.session_state.analysis_mode)
+    
+    # Display Skills Analysis
+    st.markdown("---")
+    st.markdown("## 💼 Your Current Skills")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Resume Skills", skill_count(st.session_state.resume_skills))
+    with col2:
+        st.metric("GitHub Skills", skill_count(st.session_state.github_skills))
+    with col3:
+        st.metric("Total Unique Skills", skill_count(st.session_state.combined_skills))
+    if st.session_state.get("language_shares"):
+        st.caption("🧩 Code by language: " + " · ".join(f"{language} {share:.0%}" for language, share in st.session_state.language_shares[:6]))
+    
+    with st.expander("📝 View All Extracted Skills", expanded=True):
+        st.success(st.session_state.combined_skills)
+    
+    st.markdown("---")
+    st.markdown("## 📊 Job Market Snapshot")
+    st.markdown(st.session_state.market_data)
+    if st.session_state.get("demand_task"):
+        demand_status()
+    elif st.session_state.get("market_demand"):
+        with st.expander(f"📈 In-Demand Skills Across {st.session_state.demand_postings} Live Job Postings"):
+            st.dataframe(st.session_state.market_demand, width="stretch")
+    
+    st.markdown("---")
+    st.markdown("## 🔎 Skill Fit Report & Project Recommendations")
+    st.markdown(st.session_state.report)
+
+    # ──────────────────────────────────────────────────────────────
+    # Learning Planner Section
+    # ──────────────────────────────────────────────────────────────
+    st.markdown("---")
+    st.markdown("## 🗓️ Create Your Learning Planner")
+
+    # Project titles come straight from the structured report, decoded once at analysis time
+    project_titles = list(dict.fromkeys(st.session_state.get("project_titles", [])))[:3]
+
+    render_planner(project_titles)
+
+if DEBUG_PANEL and st.session_state.get("telemetry_runs"):
+    render_debug_panel(st.session_state.telemetry_runs)
+
 # Footer
 st.markdown("---")
 
 # Reset button
 col_reset1, col_reset2, col_reset3 = st.columns([1, 1, 1])
 with col_reset2:
-    if st.button("🔄 Reset & Start Fresh", key="reset_button", type="secondary", use_container_width=True):
+    if st.button("🔄 Reset & Start Fresh", key="reset_button", type="secondary", width="stretch"):
         # Clear all session state
         for key in list(st.session_state.keys()):
             del st.session_state[key]
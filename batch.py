@@ -0,0 +1,190 @@
+# batch.py
+"""
+Headless batch analysis of many candidates against one target role.
+
+    python batch.py --role "Data Scientist" --resumes ./resumes --github-users users.txt --output results.jsonl
+
+Each resume file and each GitHub user is one candidate. Results are appended to the JSONL output
+as soon as each candidate finishes; re-running with the same output skips candidates already done,
+so an interrupted run resumes where it stopped.
+"""
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import statistics
+from contextlib import contextmanager
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import gemini_gateway
+from config import GEMINI_KEY
+import resume_parser
+import telemetry
+from career_ai import (
+    analyze_github_profile,
+    clean_github_input,
+    compare_skills_and_suggest_projects,
+    extract_skills_from_resume,
+    get_job_market_context,
+    merge_skills,
+)
+
+RESUME_TYPES = {
+    ".pdf": resume_parser.PDF_TYPE,
+    ".docx": resume_parser.DOCX_TYPE,
+    ".txt": resume_parser.TXT_TYPE,
+}
+
+
+@contextmanager
+def timed(timings: dict, stage: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = round(time.perf_counter() - start, 4)
+
+
+def load_candidates(resume_dir: str | None, github_users: list[str]) -> list[dict]:
+    candidates = []
+    if resume_dir:
+        for name in sorted(os.listdir(resume_dir)):
+            ext = os.path.splitext(name)[1].lower()
+            if ext in RESUME_TYPES:
+                candidates.append({"id": f"resume:{name}", "resume": os.path.join(resume_dir, name)})
+    for user in github_users:
+        username = clean_github_input(user)
+        if username:
+            candidates.append({"id": f"github:{username}", "github": username})
+    return candidates
+
+
+def completed_ids(output_path: str) -> set[str]:
+    """IDs already written successfully by a previous (possibly interrupted) run."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a line cut off by the interruption
+            if record.get("status") == "ok":
+                done.add(record.get("id"))
+    return done
+
+
+def analyze_candidate(candidate: dict, role: str, market_data: str) -> dict:
+    """Run the same stages as the app for one candidate; never raises."""
+    timings = {}
+    record = {"id": candidate["id"], "role": role, "status": "ok", "timings": timings}
+    try:
+        resume_skills, github_skills = "", ""
+        if candidate.get("resume"):
+            path = candidate["resume"]
+            with timed(timings, "resume_parse"):
+                with open(path, "rb") as f:
+                    data = f.read()
+                text = resume_parser.extract_resume_text(data, RESUME_TYPES[os.path.splitext(path)[1].lower()])
+            if text:
+                with timed(timings, "resume_skills"):
+                    resume_skills = extract_skills_from_resume(text)
+        if candidate.get("github"):
+            with timed(timings, "github"):
+                repos, github_skills = analyze_github_profile(candidate["github"])
+            record["repos"] = len(repos)
+
+        combined = merge_skills(resume_skills, github_skills)
+        record.update(resume_skills=resume_skills, github_skills=github_skills, combined_skills=combined)
+        if not combined:
+            record.update(status="error", error="no skills extracted")
+            return record
+
+        with timed(timings, "report"):
+            report = compare_skills_and_suggest_projects(combined, role, market_data)
+        record.update(
+            matched=report.matched,
+            missing=report.missing,
+            projects=[asdict(p) for p in report.projects],
+        )
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    return record
+
+
+def print_summary(records: list[dict], elapsed: float) -> None:
+    ok = sum(1 for r in records if r["status"] == "ok")
+    print(f"\nProcessed {len(records)} candidate(s) in {elapsed:.1f}s "
+          f"({len(records) / elapsed if elapsed else 0:.2f}/s), {ok} ok, {len(records) - ok} failed")
+    stages = {}
+    for r in records:
+        for stage, seconds in r.get("timings", {}).items():
+            stages.setdefault(stage, []).append(seconds)
+    if stages:
+        print(f"{'stage':<16}{'count':>7}{'mean s':>9}{'p50 s':>9}{'p95 s':>9}")
+        for stage, values in stages.items():
+            values.sort()
+            p95 = values[min(len(values) - 1, int(round(0.95 * (len(values) - 1))))]
+            print(f"{stage:<16}{len(values):>7}{statistics.mean(values):>9.2f}"
+                  f"{statistics.median(values):>9.2f}{p95:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze many resumes / GitHub users against one role.")
+    parser.add_argument("--role", required=True, help="target job role")
+    parser.add_argument("--resumes", help="directory of PDF/DOCX/TXT resumes")
+    parser.add_argument("--github-users", help="file with one GitHub username or URL per line")
+    parser.add_argument("--output", default="results.jsonl", help="JSONL file results are appended to")
+    parser.add_argument("--workers", type=int, default=4, help="candidates analyzed concurrently")
+    parser.add_argument("--verbose", action="store_true", help="log token counts and per-stage telemetry as JSON lines")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(asctime)s %(name)s %(message)s")
+
+    users = []
+    if args.github_users:
+        with open(args.github_users, "r", encoding="utf-8") as f:
+            users = [line.strip() for line in f if line.strip()]
+    candidates = load_candidates(args.resumes, users)
+    if not candidates:
+        raise SystemExit("No candidates found. Pass --resumes and/or --github-users.")
+
+    if not GEMINI_KEY:
+        raise SystemExit("GEMINI_API_KEY not found. Set it in the environment or a .env file.")
+    gemini_gateway.configure(GEMINI_KEY)
+
+    done = completed_ids(args.output)
+    pending = [c for c in candidates if c["id"] not in done]
+    print(f"{len(candidates)} candidate(s), {len(done & {c['id'] for c in candidates})} already done, "
+          f"{len(pending)} to analyze with {args.workers} worker(s)")
+    if not pending:
+        return
+
+    start = time.perf_counter()
+    market_start = time.perf_counter()
+    market_data = get_job_market_context(args.role)
+    print(f"Market context for '{args.role}' ready in {time.perf_counter() - market_start:.1f}s")
+
+    records = []
+    write_lock = threading.Lock()
+    with open(args.output, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = [executor.submit(analyze_candidate, c, args.role, market_data) for c in pending]
+        for future in as_completed(futures):
+            record = future.result()
+            with write_lock:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+            records.append(record)
+            status = "✓" if record["status"] == "ok" else f"✗ {record.get('error', '')}"
+            print(f"[{len(records)}/{len(pending)}] {record['id']} {status}", file=sys.stderr)
+
+    print_summary(records, time.perf_counter() - start)
+    telemetry.metrics.write(force=True)
+
+
+if __name__ == "__main__":
+    main()
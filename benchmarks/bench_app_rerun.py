@@ -0,0 +1,123 @@
+# benchmarks/bench_app_rerun.py
+"""
+Streamlit cold start and rerun latency of app.py, offline (stubbed Gemini / HTTP).
+
+    python benchmarks/bench_app_rerun.py
+    python benchmarks/bench_app_rerun.py --app /tmp/app_before.py   # e.g. `git show HEAD~1:app.py`
+
+Cold start: first script run of a fresh process (imports, secrets, Gemini setup), median of
+several subprocesses. Reruns: with an analysis and a maximum-length daily plan (3 projects x 12
+weeks) in session state, the time to rerun after nudging a project's "Weeks" input, and after a
+rerun with no widget change. AppTest always reruns the whole script, so fragment-scoped reruns
+in the browser are cheaper still than the numbers measured here.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_WORKDIR = tempfile.mkdtemp(prefix="careerify-bench-app-")
+os.environ.setdefault("GEMINI_API_KEY", "stub")
+os.environ.setdefault("CAREERIFY_CACHE_PATH", os.path.join(_WORKDIR, "llm_cache.sqlite3"))
+os.environ.setdefault("CAREERIFY_METRICS_PATH", os.path.join(_WORKDIR, "metrics.prom"))
+os.environ.setdefault("CAREERIFY_TASKS_PATH", os.path.join(_WORKDIR, "tasks.sqlite3"))
+os.environ.setdefault("CAREERIFY_GEMINI_RPM", "1000000")
+
+
+def _app_test(app_path: str):
+    import stubs
+    from streamlit.testing.v1 import AppTest
+    stubs.install(latency=0.0, tokens_per_second=1e9, http_latency=0.0)
+    return AppTest.from_file(app_path, default_timeout=120)
+
+
+def cold_start_once(app_path: str) -> float:
+    """Seconds for the first run of app.py in this (fresh) process, imports included."""
+    start = time.perf_counter()
+    at = _app_test(app_path)
+    at.run()
+    assert not at.exception, at.exception
+    return time.perf_counter() - start
+
+
+def _button(at, key):
+    return next(b for b in at.button if b.key == key)
+
+
+def _weeks_input(at, project: int):
+    return next(n for n in at.number_input if n.key == f"weeks_input_{project}")
+
+
+def _settle(at, timeout: float = 120):
+    """Rerun until the background analysis and plan tasks have been picked up (AppTest doesn't poll like the browser)."""
+    deadline = time.monotonic() + timeout
+    pending = lambda key: key in at.session_state and at.session_state[key]
+    while pending("analysis_task") or pending("plan_tasks"):
+        assert time.monotonic() < deadline, "background tasks did not finish"
+        time.sleep(0.05)
+        at.run()
+        assert not at.exception, at.exception
+
+
+def rerun_latency(app_path: str, repeat: int) -> dict:
+    at = _app_test(app_path)
+    at.run()
+    at.text_input[0].input("octocat")
+    at.text_input[1].input("Data Scientist")
+    at.button[0].click().run()
+    _settle(at)
+    for project in (1, 2, 3):
+        _weeks_input(at, project).set_value(12).run()
+    _button(at, "generate_planner_btn").click().run()
+    _button(at, "generate_daily_plan_btn").click().run()
+    _settle(at)
+    assert not at.exception, at.exception
+
+    weeks, idle = [], []
+    for i in range(repeat):
+        value = 11 if i % 2 == 0 else 12
+        start = time.perf_counter()
+        _weeks_input(at, 1).set_value(value).run()
+        _settle(at)
+        weeks.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        at.run()
+        idle.append(time.perf_counter() - start)
+    assert not at.exception, at.exception
+    return {"weeks_change_ms": statistics.median(weeks) * 1000, "idle_rerun_ms": statistics.median(idle) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--app", default=APP_PATH, help="app script to measure")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--cold-runs", type=int, default=5)
+    parser.add_argument("--cold-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    args.app = os.path.abspath(args.app)
+
+    if args.cold_child:
+        print(json.dumps({"cold": cold_start_once(args.app)}))
+        return
+
+    cold = []
+    for _ in range(args.cold_runs):
+        out = subprocess.run([sys.executable, __file__, "--cold-child", "--app", args.app], capture_output=True, text=True, check=True)
+        cold.append(json.loads(out.stdout.strip().splitlines()[-1])["cold"])
+    rerun = rerun_latency(args.app, args.repeat)
+    print(f"cold start            {statistics.median(cold) * 1000:10.1f} ms (median of {len(cold)})")
+    print(f"rerun, weeks changed  {rerun['weeks_change_ms']:10.1f} ms (median of {args.repeat})")
+    print(f"rerun, no change      {rerun['idle_rerun_ms']:10.1f} ms (median of {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/bench_resume_parser.py
+"""
+Resume extraction benchmarks on synthetic 1, 10 and 100 page documents.
+
+    python benchmarks/bench_resume_parser.py
+
+Compares the old string-concatenation loop with the bounded extractor (sequential and
+process-pool) and with a memoized re-parse of the same upload.
+"""
+import io
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PyPDF2
+import resume_parser
+
+LINES_PER_PAGE = 45
+SAMPLE_LINE = "Built data pipelines in Python, SQL and Airflow; deployed services with Docker on AWS."
+
+
+def make_pdf(pages: int) -> bytes:
+    """A minimal multi-page PDF with real text content streams."""
+    objects = []
+    page_ids = []
+    font_id = 3
+    next_id = 4
+    page_objects = []
+    for n in range(pages):
+        lines = [f"({n + 1}.{i} {SAMPLE_LINE}) Tj T*" for i in range(LINES_PER_PAGE)]
+        stream = "BT /F1 9 Tf 11 TL 40 800 Td " + " ".join(lines) + " ET"
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        page_ids.append(page_id)
+        page_objects.append((content_id, f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream"))
+        page_objects.append((page_id, f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                                      f"/Contents {content_id} 0 R /Resources << /Font << /F1 {font_id} 0 R >> >> >>"))
+    objects.append((1, "<< /Type /Catalog /Pages 2 0 R >>"))
+    kids = " ".join(f"{p} 0 R" for p in page_ids)
+    objects.append((2, f"<< /Type /Pages /Kids [{kids}] /Count {pages} >>"))
+    objects.append((font_id, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"))
+    objects.extend(page_objects)
+    objects.sort()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for obj_id, body in objects:
+        offsets.append(out.tell())
+        out.write(f"{obj_id} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for off in offsets:
+        out.write(f"{off:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(pages: int) -> bytes:
+    from docx import Document
+    doc = Document()
+    for n in range(pages * LINES_PER_PAGE):
+        doc.add_paragraph(f"{n} {SAMPLE_LINE}")
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def legacy_pdf_text(data: bytes) -> str:
+    """The original extractor: no page cap, quadratic string building."""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text() + "\n"
+    return text.strip()
+
+
+def timed(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    header = f"{'document':<12}{'legacy ms':>12}{'sequential ms':>16}{'pool ms':>10}{'capped ms':>12}{'memo hit ms':>14}"
+    print(header)
+    for pages in (1, 10, 100):
+        data = make_pdf(pages)
+        repeat = 5 if pages < 100 else 3
+        legacy = timed(lambda: legacy_pdf_text(data), repeat)
+        sequential = timed(lambda: _extract_pdf(data, pages, parallel_from=pages + 1), repeat)
+        pool = timed(lambda: _extract_pdf(data, pages, parallel_from=1), repeat)
+        capped = timed(lambda: resume_parser.extract_text_from_pdf(data), repeat)
+        resume_parser.extract_resume_text(data, resume_parser.PDF_TYPE)
+        memo = timed(lambda: resume_parser.extract_resume_text(data, resume_parser.PDF_TYPE), repeat)
+        print(f"{f'pdf {pages}p':<12}{legacy:>12.1f}{sequential:>16.1f}{pool:>10.1f}{capped:>12.1f}{memo:>14.3f}")
+
+    for pages in (1, 10, 100):
+        data = make_docx(pages)
+        parse = timed(lambda: resume_parser.extract_text_from_docx(data), 3)
+        resume_parser.extract_resume_text(data, resume_parser.DOCX_TYPE)
+        memo = timed(lambda: resume_parser.extract_resume_text(data, resume_parser.DOCX_TYPE), 3)
+        print(f"{f'docx {pages}p':<12}{'-':>12}{parse:>16.1f}{'-':>10}{'-':>12}{memo:>14.3f}")
+
+    print(f"\nPage cap: {resume_parser.MAX_PAGES} pages, pool from {resume_parser.PARALLEL_PAGE_THRESHOLD} pages "
+          f"with {resume_parser.PDF_WORKERS} workers")
+
+
+def _extract_pdf(data: bytes, pages: int, parallel_from: int) -> str:
+    """Uncapped extraction with the process pool switched on or off."""
+    threshold, workers = resume_parser.PARALLEL_PAGE_THRESHOLD, resume_parser.PDF_WORKERS
+    resume_parser.PARALLEL_PAGE_THRESHOLD = parallel_from
+    resume_parser.PDF_WORKERS = max(2, workers) if parallel_from <= pages else workers
+    try:
+        return resume_parser.extract_text_from_pdf(data, max_pages=pages, timeout=60)
+    finally:
+        resume_parser.PARALLEL_PAGE_THRESHOLD, resume_parser.PDF_WORKERS = threshold, workers
+
+
+if __name__ == "__main__":
+    main()
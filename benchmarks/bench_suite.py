@@ -0,0 +1,337 @@
+# benchmarks/bench_suite.py
+"""
+Offline benchmark suite: Gemini, GitHub and the job boards are replaced by the deterministic stubs
+in benchmarks/stubs.py, so results do not depend on API quota or network jitter.
+
+    python benchmarks/bench_suite.py                       # run everything, save JSON
+    python benchmarks/bench_suite.py --only parse,export   # selected groups only
+    python benchmarks/bench_suite.py --baseline benchmarks/results/bench-20260101-120000.json
+
+Results are written to benchmarks/results/ (or --output) as JSON; with --baseline each benchmark's
+median is compared against the saved run and regressions above --threshold are flagged.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import date, datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Isolated caches and no pre-warmed market index, so the cold pipeline really calls the stub
+_WORKDIR = tempfile.mkdtemp(prefix="careerify-bench-")
+os.environ.setdefault("CAREERIFY_CACHE_PATH", os.path.join(_WORKDIR, "llm_cache.sqlite3"))
+os.environ.setdefault("CAREERIFY_MARKET_INDEX_PATH", os.path.join(_WORKDIR, "market_index.json"))
+os.environ.setdefault("CAREERIFY_METRICS_PATH", os.path.join(_WORKDIR, "metrics.prom"))
+os.environ.setdefault("CAREERIFY_GEMINI_RPM", "1000000")
+os.environ.setdefault("CAREERIFY_GEMINI_TPM", "1000000000")
+
+import stubs
+from bench_resume_parser import make_docx, make_pdf
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+ROLE = "Data Scientist"
+MAX_WEEKS = 12      # the planner's per-project maximum
+PLAN_PROJECTS = 3
+
+
+def measure(fn, repeat: int, setup=None) -> dict:
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "p95_ms": round(samples[min(len(samples) - 1, int(round(0.95 * (len(samples) - 1))))], 3),
+        "min_ms": round(samples[0], 3),
+        "repeat": repeat,
+    }
+
+
+# ──────────────────────────────────────────────────────────────
+# Benchmarks
+# ──────────────────────────────────────────────────────────────
+def reset_caches():
+    import jobs
+    import github_client
+    import resume_parser
+    from career_ai import get_llm_cache
+    get_llm_cache().clear()
+    github_client._client = None
+    jobs._http_cache = jobs.HTTPCache()
+    with resume_parser._text_cache_lock:
+        resume_parser._text_cache.clear()
+
+
+def run_pipeline(resume_path: str, weeks: int = 2) -> dict:
+    """What one user triggers: analysis of resume + GitHub, then every project's daily plan."""
+    import batch
+    from career_ai import generate_daily_plan, get_job_market_context
+
+    market_data = get_job_market_context(ROLE)
+    record = batch.analyze_candidate({"id": "bench", "resume": resume_path, "github": "octocat"}, ROLE, market_data)
+    if record["status"] != "ok":
+        raise RuntimeError(record.get("error"))
+    titles = [p["title"] for p in record["projects"]]
+    with ThreadPoolExecutor(max_workers=len(titles) or 1) as executor:
+        plans = executor.map(lambda title: generate_daily_plan(title, weeks, ROLE), titles)
+    return dict(zip(titles, plans))
+
+
+def bench_pipeline(repeat: int) -> dict:
+    path = os.path.join(_WORKDIR, "resume.pdf")
+    with open(path, "wb") as f:
+        f.write(make_pdf(2))
+    results = {}
+    stubs.StubModel.calls = 0
+    results["pipeline.cold"] = measure(lambda: run_pipeline(path), repeat, setup=reset_caches)
+    results["pipeline.cold"]["gemini_calls_per_run"] = stubs.StubModel.calls / repeat
+    stubs.StubModel.calls = 0
+    results["pipeline.warm"] = measure(lambda: run_pipeline(path), repeat)
+    results["pipeline.warm"]["gemini_calls_per_run"] = stubs.StubModel.calls / repeat
+    return results
+
+
+def bench_extract(repeat: int) -> dict:
+    import resume_parser
+    results = {}
+    for pages in (1, 10, 30, 100):
+        pdf = make_pdf(pages)
+        results[f"extract.pdf.{pages}p"] = measure(lambda: resume_parser.extract_text_from_pdf(pdf, timeout=120), repeat)
+        docx = make_docx(pages)
+        results[f"extract.docx.{pages}p"] = measure(lambda: resume_parser.extract_text_from_docx(docx), repeat)
+    return results
+
+
+def bench_skills(repeat: int) -> dict:
+    from career_ai import merge_skills
+    from skills import get_taxonomy
+    taxonomy = get_taxonomy()
+    names = []
+    for skill in taxonomy.skills.values():
+        names.extend([skill["name"], *skill.get("aliases", [])])
+    results = {}
+    for size in (50, 500):
+        resume = ", ".join(names[i % len(names)] for i in range(size))
+        github = ", ".join(f"{names[(i * 7) % len(names)]} ({i})" if i % 5 == 0 else names[(i * 7) % len(names)]
+                           for i in range(size))
+        results[f"skills.merge.{size}"] = measure(lambda: merge_skills(resume, github), repeat)
+    # Semantic coverage: every user skill against every market skill, misspelled variants included
+    import skill_vectors
+    related = [r for skill in taxonomy.skills.values() for r in skill.get("related", [])]
+    for size in (100, 1000):
+        user = [f"{names[i % len(names)]} {i}" if i % 3 else names[i % len(names)] for i in range(size)]
+        market = [related[(i * 5) % len(related)] if i % 2 else f"{names[(i * 11) % len(names)]}s" for i in range(size)]
+        results[f"skills.semantic.{size}x{size}"] = measure(lambda: skill_vectors.covered(user, market), repeat)
+    return results
+
+
+def bench_github(repeat: int) -> dict:
+    import github_client
+    from career_ai import infer_skills_from_profile
+    client = github_client.GitHubClient(token="stub")
+
+    def enrich():
+        client._enriched.clear()
+        return client.enrich_repos("octocat")
+
+    def rest_names():
+        client._repos.clear()
+        client._etags.clear()
+        return client.list_repos("octocat")
+
+    results = {}
+    for name, fn in (("github.enrich.graphql", enrich), ("github.list.rest", rest_names)):
+        kind = "graphql" if "graphql" in name else "rest"
+        stubs.http_calls.clear()
+        results[name] = measure(fn, repeat)
+        results[name]["round_trips"] = stubs.http_calls[kind] / repeat
+    repos = client.enrich_repos("octocat")
+    results["github.enrich.graphql"]["repos"] = len(repos)
+    # Prompt construction (language shares, per-repo lines, budget fit); the Gemini answer is cached after the first run
+    results["github.repo_skills.enriched"] = measure(lambda: infer_skills_from_profile(repos), repeat)
+    return results
+
+
+def _json_plan(days: int) -> str:
+    tasks = stubs.StubModel.fixtures["daily_plan_tasks"]
+    return json.dumps({"days": [{"day": d, "task": tasks[(d - 1) % len(tasks)]} for d in range(1, days + 1)]})
+
+
+def bench_parse(repeat: int) -> dict:
+    from plan_parser import DayParser, parse_days
+    from schemas import decode_projects, decode_report
+    days = MAX_WEEKS * 7
+    plan = _json_plan(days)
+    chunks = [plan[i:i + 160] for i in range(0, len(plan), 160)]
+    markdown = "\n\n".join(f"**Day {d}:** {task}" for d, task in parse_days(plan, structured=True))
+
+    def streamed():
+        parser = DayParser(structured=True)
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+        assert len(parser.days) == days
+
+    projects = json.dumps(stubs.StubModel.fixtures["projects"])
+    report = json.dumps(stubs.StubModel.fixtures["report"])
+    return {
+        f"parse.days.json_stream.{days}d": measure(streamed, repeat),
+        f"parse.days.json.{days}d": measure(lambda: parse_days(plan, structured=True), repeat),
+        f"parse.days.markdown.{days}d": measure(lambda: parse_days(markdown), repeat),
+        # Project titles are decoded from the structured report (formerly regex-scraped from Markdown)
+        "parse.projects": measure(lambda: decode_projects(projects), repeat),
+        "parse.report": measure(lambda: decode_report(report), repeat),
+    }
+
+
+def max_plan_rows() -> list[dict]:
+    """Dated task rows for the longest plan the planner allows."""
+    tasks = stubs.StubModel.fixtures["daily_plan_tasks"]
+    rows, start = [], date.today()
+    for p in range(PLAN_PROJECTS):
+        for d in range(1, MAX_WEEKS * 7 + 1):
+            rows.append({
+                "Date": (start + timedelta(days=d - 1)).strftime("%Y-%m-%d"),
+                "Day": f"Day {d}",
+                "Project": f"Project {p + 1}",
+                "Task": tasks[(d - 1) % len(tasks)],
+            })
+        start += timedelta(weeks=MAX_WEEKS)
+    return rows
+
+
+def bench_export(repeat: int) -> dict:
+    import pandas as pd
+    import exports
+    from ics import Calendar, Event
+    rows = max_plan_rows()
+    summary = [{"Project": f"Project {p + 1}", "Weeks": MAX_WEEKS} for p in range(PLAN_PROJECTS)]
+    daily_df = pd.DataFrame(rows)
+
+    def ics_objects():
+        # The previous calendar export: one ics.Event per DataFrame row
+        cal = Calendar()
+        for _, task_row in daily_df.iterrows():
+            e = Event()
+            e.name = f"{task_row['Project']}: {task_row['Day']}"
+            e.begin = task_row['Date']
+            e.description = task_row['Task']
+            e.duration = timedelta(hours=2)
+            cal.events.add(e)
+        return str(cal)
+
+    def memoized():
+        exports.render("ics", summary, rows)
+
+    n = len(rows)
+    return {
+        f"export.csv.pandas.{n}rows": measure(lambda: daily_df.to_csv(index=False).encode("utf-8"), repeat),
+        f"export.csv.{n}rows": measure(lambda: exports.to_csv(rows), repeat),
+        f"export.ics.objects.{n}rows": measure(ics_objects, repeat),
+        f"export.ics.{n}rows": measure(lambda: exports.to_ics(rows), repeat),
+        f"export.json.{n}rows": measure(lambda: exports.to_json(summary, rows), repeat),
+        f"export.parquet.{n}rows": measure(lambda: exports.to_parquet(rows), repeat),
+        # A repeat download of an unchanged plan: hash + cache lookup only
+        f"export.ics.memoized.{n}rows": measure(memoized, repeat, setup=memoized),
+    }
+
+
+BENCHMARKS = {
+    "pipeline": bench_pipeline,
+    "extract": bench_extract,
+    "skills": bench_skills,
+    "github": bench_github,
+    "parse": bench_parse,
+    "export": bench_export,
+}
+
+
+# ──────────────────────────────────────────────────────────────
+# Reporting
+# ──────────────────────────────────────────────────────────────
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_table(results: dict, baseline: dict | None, threshold: float) -> int:
+    """Print results (and ratios against baseline); returns the number of regressions."""
+    regressions = 0
+    print(f"{'benchmark':<32}{'median ms':>12}{'p95 ms':>12}{'baseline ms':>14}{'ratio':>8}")
+    for name, r in results.items():
+        line = f"{name:<32}{r['median_ms']:>12.3f}{r['p95_ms']:>12.3f}"
+        base = (baseline or {}).get(name)
+        if base and base["median_ms"]:
+            ratio = r["median_ms"] / base["median_ms"]
+            flag = "  ← slower" if ratio > threshold else ""
+            regressions += bool(flag)
+            line += f"{base['median_ms']:>14.3f}{ratio:>8.2f}{flag}"
+        print(line)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline Career-iFy benchmarks against stubbed Gemini / HTTP.")
+    parser.add_argument("--only", help="comma-separated benchmark groups: " + ", ".join(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub Gemini seconds before the first token")
+    parser.add_argument("--token-rate", type=float, default=2000.0, help="stub Gemini output tokens per second")
+    parser.add_argument("--http-latency", type=float, default=0.01, help="stub GitHub / job-board seconds per request")
+    parser.add_argument("--output", help="results JSON path (default: benchmarks/results/bench-<timestamp>.json)")
+    parser.add_argument("--baseline", help="earlier results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.2, help="median ratio above which a benchmark is flagged")
+    args = parser.parse_args()
+
+    stubs.install(args.latency, args.token_rate, args.http_latency)
+    groups = [g.strip() for g in args.only.split(",")] if args.only else list(BENCHMARKS)
+    results = {}
+    for group in groups:
+        if group not in BENCHMARKS:
+            raise SystemExit(f"Unknown benchmark group '{group}'. Choose from: {', '.join(BENCHMARKS)}")
+        results.update(BENCHMARKS[group](args.repeat))
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    regressions = print_table(results, baseline, args.threshold)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "commit": git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpus": os.cpu_count(),
+                "stub": {"latency": args.latency, "token_rate": args.token_rate, "http_latency": args.http_latency},
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"\nSaved {output}")
+    if regressions:
+        print(f"{regressions} benchmark(s) slower than {args.threshold:.2f}x baseline")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
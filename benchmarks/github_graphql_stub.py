@@ -0,0 +1,71 @@
+# benchmarks/github_graphql_stub.py
+"""
+Local stand-in for the GitHub API: POST /graphql answers the repository enrichment query and
+GET /users/<name>/repos the REST repo list, from the synthetic repos in benchmarks/stubs.py.
+
+    python benchmarks/github_graphql_stub.py --port 8765
+    GITHUB_API_URL=http://127.0.0.1:8765 GITHUB_TOKEN=stub streamlit run app.py
+
+The login "ghost" answers like a user that does not exist.
+"""
+import os
+import sys
+import json
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stubs import github_graphql_nodes, github_repos, graphql_response
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    nodes: list[dict] = []
+    repos: list[dict] = []
+
+    def _send(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/graphql":
+            return self._send(404, {"message": "Not Found"})
+        if not self.headers.get("Authorization"):
+            return self._send(401, {"message": "This endpoint requires you to be authenticated."})
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._send(400, {"message": "Problems parsing JSON"})
+        self._send(200, graphql_response(body, self.nodes))
+
+    def do_GET(self):
+        parts = self.path.split("?")[0].strip("/").split("/")
+        if len(parts) == 3 and parts[0] == "users" and parts[2] == "repos":
+            return self._send(200, self.repos)
+        self._send(404, {"message": "Not Found"})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local GitHub REST + GraphQL stub.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--repos", type=int, default=150, help="repositories every user has")
+    args = parser.parse_args()
+
+    StubHandler.nodes = github_graphql_nodes(args.repos)
+    StubHandler.repos = github_repos(args.repos)
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    print(f"GitHub stub on http://{args.host}:{args.port} (GraphQL at /graphql)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
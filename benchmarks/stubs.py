@@ -0,0 +1,217 @@
+# benchmarks/stubs.py
+"""
+Deterministic offline stand-ins for Gemini and the HTTP services, for benchmarks.
+
+install() replaces genai.GenerativeModel with StubModel, which answers from recorded fixtures
+after a fixed latency and streams at a fixed token rate, and routes requests' GET calls for
+GitHub and the job boards, and POSTs to GitHub GraphQL, to synthetic local responses. No network
+or API quota is used.
+"""
+import os
+import re
+import json
+import time
+import random
+import types
+import collections
+import requests
+import google.generativeai as genai
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "gemini_responses.json")
+
+_DAYS_RE = re.compile(r"Generate exactly (\d+) days")
+
+LANGUAGES = ["Python", "TypeScript", "JavaScript", "Go", "Jupyter Notebook", "Rust"]
+TOPICS = ["machine-learning", "fastapi", "react", "docker", "kubernetes", "pandas", "postgresql", "aws", "cli", "etl"]
+
+# Stubbed HTTP requests by kind ("rest", "graphql"), to count round trips
+http_calls: collections.Counter = collections.Counter()
+
+
+def _tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _response(text: str, prompt_tokens: int, candidates_tokens: int):
+    part = types.SimpleNamespace(text=text)
+    return types.SimpleNamespace(
+        text=text,
+        candidates=[types.SimpleNamespace(content=types.SimpleNamespace(parts=[part]))],
+        usage_metadata=types.SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=candidates_tokens,
+            total_token_count=prompt_tokens + candidates_tokens,
+        ),
+    )
+
+
+class StubModel:
+    """Drop-in for genai.GenerativeModel with configurable latency and output token rate."""
+
+    latency = 0.05          # seconds before the first token
+    tokens_per_second = 2000.0
+    fixtures: dict = {}
+    calls = 0
+
+    def __init__(self, model_name: str = "", **kwargs):
+        self.model_name = model_name
+
+    @classmethod
+    def answer(cls, prompt: str, generation_config: dict | None) -> str:
+        schema = json.dumps((generation_config or {}).get("response_schema") or {})
+        if '"days"' in schema:
+            m = _DAYS_RE.search(prompt)
+            total = int(m.group(1)) if m else 14
+            tasks = cls.fixtures["daily_plan_tasks"]
+            return json.dumps({"days": [{"day": d, "task": tasks[(d - 1) % len(tasks)]} for d in range(1, total + 1)]})
+        if '"weeks"' in schema:
+            total = int(m.group(1)) if (m := re.search(r"Write a (\d+)-week outline", prompt)) else 12
+            return json.dumps({"weeks": [{"week": w, "focus": f"Milestone {w}"} for w in range(1, total + 1)]})
+        if '"matched_skills"' in schema:
+            return json.dumps(cls.fixtures["report"])
+        if '"projects"' in schema:
+            return json.dumps(cls.fixtures["projects"])
+        if "job market" in prompt:
+            return cls.fixtures["market_context"]
+        if "GitHub project names" in prompt:
+            return cls.fixtures["repo_skills"]
+        return cls.fixtures["resume_skills"]
+
+    def count_tokens(self, contents):
+        return types.SimpleNamespace(total_tokens=_tokens(str(contents)))
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        StubModel.calls += 1
+        prompt = str(prompt)
+        text = self.answer(prompt, generation_config)
+        prompt_tokens, output_tokens = _tokens(prompt), _tokens(text)
+        time.sleep(self.latency)
+        if not stream:
+            time.sleep(output_tokens / self.tokens_per_second)
+            return _response(text, prompt_tokens, output_tokens)
+        return self._stream(text, prompt_tokens)
+
+    def _stream(self, text: str, prompt_tokens: int, chunk_chars: int = 160):
+        sent = 0
+        for start in range(0, len(text), chunk_chars):
+            chunk = text[start:start + chunk_chars]
+            time.sleep(_tokens(chunk) / self.tokens_per_second)
+            sent += _tokens(chunk)
+            yield _response(chunk, prompt_tokens, sent)
+
+
+class StubResponse:
+    def __init__(self, status_code: int = 200, payload=None, text: str = "", headers: dict | None = None):
+        self.status_code = status_code
+        self._payload = payload
+        self.text = text or (json.dumps(payload) if payload is not None else "")
+        self.headers = headers or {}
+        self.links = {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} stub error")
+
+
+def github_repos(count: int = 60) -> list[dict]:
+    rng = random.Random(1)
+    stems = ["api", "dashboard", "etl", "bot", "cli", "notebook", "service", "scraper", "ml-model", "web-app"]
+    return [{"name": f"{rng.choice(stems)}-{i}", "language": rng.choice(LANGUAGES)} for i in range(count)]
+
+
+def github_graphql_nodes(count: int = 150) -> list[dict]:
+    """GitHub GraphQL repository nodes (as REPOS_QUERY selects them) for the repos of github_repos()."""
+    rng = random.Random(3)
+    nodes = []
+    for i, repo in enumerate(github_repos(count)):
+        primary = repo["language"]
+        others = rng.sample([language for language in LANGUAGES if language != primary], 2)
+        topics = rng.sample(TOPICS, 3)
+        readme = (
+            f"[![CI](https://example.com/{repo['name']}/badge.svg)](https://example.com/{repo['name']})\n"
+            f"# {repo['name']}\n\nA {primary} project using {', '.join(topics)}. "
+            + "Setup, usage and deployment notes follow. " * 40
+        )
+        nodes.append({
+            "name": repo["name"],
+            "description": f"{repo['name'].rsplit('-', 1)[0].replace('-', ' ').title()} in {primary}",
+            "isFork": i % 10 == 9,
+            "primaryLanguage": {"name": primary},
+            "languages": {"edges": [
+                {"size": rng.randint(20_000, 200_000), "node": {"name": primary}},
+                *({"size": rng.randint(500, 20_000), "node": {"name": language}} for language in others),
+            ]},
+            "repositoryTopics": {"nodes": [{"topic": {"name": topic}} for topic in topics]},
+            "readme": {"text": readme},
+            "readmeLower": None,
+        })
+    return nodes
+
+
+def graphql_response(body: dict, nodes: list[dict]) -> dict:
+    """Answer a REPOS_QUERY request like GitHub does, paginating nodes with an opaque cursor."""
+    variables = body.get("variables") or {}
+    if str(variables.get("login", "")).lower() == "ghost":
+        return {"data": {"user": None}, "errors": [{"message": "Could not resolve to a User with the login of 'ghost'."}]}
+    start = int(variables.get("after") or 0)
+    page = nodes[start:start + min(int(variables.get("first") or 100), 100)]
+    end = start + len(page)
+    return {"data": {"user": {"repositories": {
+        "pageInfo": {"hasNextPage": end < len(nodes), "endCursor": str(end)},
+        "nodes": page,
+    }}}}
+
+
+def remoteok_feed(count: int = 300) -> list[dict]:
+    """A RemoteOK-shaped feed with skill mentions drawn from the bundled taxonomy."""
+    from skills import get_taxonomy
+    rng = random.Random(2)
+    names = [s["name"] for s in get_taxonomy().skills.values()]
+    titles = ["Data Scientist", "Senior Data Scientist", "Machine Learning Engineer", "Backend Engineer",
+              "Frontend Developer", "Data Engineer", "DevOps Engineer", "Full Stack Developer"]
+    feed = [{"legal": "stub feed"}]
+    for i in range(count):
+        skills = ", ".join(rng.sample(names, 8))
+        feed.append({
+            "position": rng.choice(titles),
+            "description": f"<p>We are hiring. You will work with {skills}.</p><ul><li>Remote</li></ul>",
+        })
+    return feed
+
+
+def install(latency: float = 0.05, tokens_per_second: float = 2000.0, http_latency: float = 0.01) -> None:
+    """Swap Gemini and outbound HTTP for the stubs (for the rest of the process)."""
+    with open(FIXTURES_PATH, "r", encoding="utf-8") as f:
+        StubModel.fixtures = json.load(f)
+    StubModel.latency = latency
+    StubModel.tokens_per_second = tokens_per_second
+    genai.GenerativeModel = StubModel
+    genai.configure = lambda **kwargs: None
+
+    repos, nodes, feed = github_repos(), github_graphql_nodes(), remoteok_feed()
+
+    def stub_get(url, *args, **kwargs):
+        time.sleep(http_latency)
+        http_calls["rest"] += 1
+        if "/users/" in url and url.endswith("/repos"):
+            return StubResponse(payload=repos, headers={"ETag": '"stub-repos"'})
+        if "remoteok.com" in url:
+            return StubResponse(payload=feed)
+        if "indeed.com" in url:
+            return StubResponse(text="<html><body>no results</body></html>")
+        return StubResponse(status_code=404, payload={})
+
+    def stub_post(url, *args, **kwargs):
+        time.sleep(http_latency)
+        if url.endswith("/graphql"):
+            http_calls["graphql"] += 1
+            return StubResponse(payload=graphql_response(kwargs.get("json") or {}, nodes))
+        return StubResponse(status_code=404, payload={})
+
+    requests.get = stub_get
+    requests.Session.get = lambda self, url, *args, **kwargs: stub_get(url, *args, **kwargs)
+    requests.post = stub_post
+    requests.Session.post = lambda self, url, *args, **kwargs: stub_post(url, *args, **kwargs)
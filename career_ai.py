@@ -0,0 +1,420 @@
+# career_ai.py
+"""
+Gemini-backed analysis stages shared by the Streamlit app and the offline jobs.
+Callers are expected to run gemini_gateway.configure(api_key) before using these functions.
+"""
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+import telemetry
+import model_routing
+from llm_cache import LLMCache, STAGE_TTLS, make_key
+from roles import canonicalize_role, get_market_index
+from github_client import get_client as get_github_client, language_shares
+from skills import SKILL_EXTRACTION_MODE, canonical_skills, compute_skill_gap, get_taxonomy
+from token_budget import compact_resume, fit_items, log_compaction, stage_budget, trim_to_budget
+from plan_parser import DAYS_PER_WEEK, parse_days, week_days
+from schemas import (
+    DAILY_PLAN_SCHEMA, PLAN_OUTLINE_SCHEMA, PROJECTS_SCHEMA, REPORT_SCHEMA, SkillReport,
+    decode_outline, decode_projects, decode_report,
+)
+
+# The planner's per-project maximum; plan outlines always cover this many weeks
+MAX_PLAN_WEEKS = 12
+
+# README excerpts are only sent for the most recently pushed repos, the rest are described by
+# languages, topics and description so that up to 100 repos fit the repo_profile budget
+README_PROMPT_REPOS = 20
+README_PROMPT_CHARS = 300
+
+# Ground new market overviews in skill frequencies from live job postings, and show them as a table
+LIVE_DEMAND = os.getenv("CAREERIFY_LIVE_DEMAND", "1") == "1"
+# Seconds a demand table is reused, and an empty one (no postings, a blocked board) before it is
+# fetched again; the job feeds themselves refresh and retry this often (see jobs.py)
+DEMAND_REFRESH_SECONDS = float(os.getenv("CAREERIFY_JOB_FEED_REFRESH", "1800"))
+DEMAND_RETRY_SECONDS = float(os.getenv("CAREERIFY_JOB_FEED_RETRY", "300"))
+# Other popular roles whose feed postings the role's skills are TF-IDF-ranked against
+DEMAND_PEER_ROLES = 12
+DEMAND_PEER_POSTINGS = 50
+DEMAND_POSTINGS_LIMIT = 200
+MIN_DEMAND_POSTINGS = 5
+
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+# Striped by (project, role) so concurrent week chunks share a single outline call; a fixed
+# set keeps memory flat however many projects a long-running server outlines
+OUTLINE_LOCK_STRIPES = 64
+_outline_locks = [threading.Lock() for _ in range(OUTLINE_LOCK_STRIPES)]
+
+# ──────────────────────────────────────────────────────────────
+# Utility Functions
+# ──────────────────────────────────────────────────────────────
+def get_llm_cache() -> LLMCache:
+    """One SQLite-backed response cache per process, shared by every session."""
+    global _llm_cache
+    with _llm_cache_lock:
+        if _llm_cache is None:
+            _llm_cache = LLMCache()
+        return _llm_cache
+
+def safe_gemini_text(resp, strip: bool = True) -> str:
+    """Safely extract plain text from Gemini responses (or a single streamed chunk)."""
+    try:
+        if getattr(resp, "candidates", None):
+            cand = resp.candidates[0]
+            parts = getattr(cand, "content", None)
+            if parts and getattr(parts, "parts", None):
+                text = "".join([p.text for p in parts.parts if hasattr(p, "text")])
+                return text.strip() if strip else text
+    except Exception:
+        return ""
+    return ""
+
+def clean_github_input(s: str) -> str:
+    """Normalize GitHub username or URL."""
+    s = (s or "").strip()
+    return s.rstrip("/").split("/")[-1] if "github.com" in s else s
+
+def fetch_github_repos(username: str) -> list[str]:
+    """Fetch the names of all public GitHub repositories."""
+    with telemetry.span("github.fetch") as s:
+        try:
+            repos = get_github_client().list_repos(username)
+        except Exception as e:
+            s.set(error=type(e).__name__)
+            return []
+        s.set(repos=len(repos))
+    return [repo.get("name", "") for repo in repos]
+
+def fetch_github_profile(username: str) -> list[dict]:
+    """
+    A user's repositories with languages, topics and README excerpts, fetched in one paginated
+    GraphQL query when a GitHub token is configured; otherwise just their names, from REST.
+    """
+    client = get_github_client()
+    if client.token:
+        with telemetry.span("github.enrich") as s:
+            try:
+                repos = client.enrich_repos(username)
+            except Exception as e:
+                s.set(error=type(e).__name__)
+                repos = []
+            s.set(repos=len(repos))
+        if repos:
+            return repos
+    return [{"name": name} for name in fetch_github_repos(username)]
+
+# ──────────────────────────────────────────────────────────────
+# Gemini AI Logic
+# ──────────────────────────────────────────────────────────────
+def json_generation_config(response_schema: dict | None) -> dict | None:
+    """Generation config asking Gemini for JSON matching response_schema."""
+    if response_schema is None:
+        return None
+    return {"response_mime_type": "application/json", "response_schema": response_schema}
+
+def cache_key(stage: str, prompt: str, response_schema: dict | None = None) -> str:
+    """Cache key for a stage's prompt, under the stage's primary model; structured requests are keyed on their schema too."""
+    if response_schema is not None:
+        prompt = prompt + "\n" + json.dumps(response_schema, sort_keys=True)
+    return make_key(model_routing.primary_model(stage), prompt)
+
+def cacheable(text: str, response_schema: dict | None = None) -> bool:
+    """Whether a response is worth caching: non-empty and, for structured requests, a decodable JSON object."""
+    if not text:
+        return False
+    if response_schema is None:
+        return True
+    try:
+        return isinstance(json.loads(text), dict)
+    except ValueError:
+        return False
+
+def generate_text(stage: str, prompt: str, response_schema: dict | None = None,
+                  miss_prompt: Callable[[], str] | None = None, refresh: bool = False) -> str:
+    """
+    Run a prompt through the stage's Gemini model (see model_routing), reusing a cached response for
+    identical prompts. With a response_schema the model answers in JSON matching it. With miss_prompt
+    the response is still cached under prompt, but a cache miss sends miss_prompt() instead, so
+    volatile grounding data is only gathered when needed and never changes the key. With refresh the
+    cached response is skipped and replaced by the new one.
+    """
+    with telemetry.span(f"gemini.{stage}") as s:
+        cache = get_llm_cache()
+        key = cache_key(stage, prompt, response_schema)
+        cached = None if refresh else cache.get(key, stage)
+        if cached is not None:
+            s.set(cache="hit")
+            return cached
+        s.set(cache="refresh" if refresh else "miss")
+        if miss_prompt is not None:
+            prompt = miss_prompt()
+        resp = model_routing.generate(stage, prompt, json_generation_config(response_schema))
+        text = safe_gemini_text(resp)
+        # A structured answer that doesn't decode is retried next time rather than replayed for the TTL
+        if cacheable(text, response_schema):
+            cache.set(key, stage, text, STAGE_TTLS.get(stage))
+        return text
+
+def extract_skills_from_resume(resume_text: str, mode: str = SKILL_EXTRACTION_MODE) -> str:
+    """
+    Extract skills from a resume.
+    mode "llm" asks Gemini, "local" only scans the bundled taxonomy (no network),
+    and "hybrid" scans locally and asks Gemini just for skills the taxonomy missed.
+    Gemini sees the resume compacted to the resume_skills token budget.
+    """
+    if mode in ("local", "hybrid"):
+        local_skills = ", ".join(get_taxonomy().extract(resume_text))
+        if mode == "local":
+            return local_skills
+
+    compacted = compact_resume(resume_text, stage_budget("resume_skills")) or resume_text
+    log_compaction("resume_skills", resume_text, compacted)
+    resume_text = compacted
+    if mode == "hybrid":
+        prompt = (
+            f"You are a career mentor AI. These skills were already found in the resume below: {local_skills or 'none'}.\n"
+            f"List any OTHER technical skills, programming languages, frameworks, tools, certifications, "
+            f"and soft skills it mentions that are not in that list.\n\n"
+            f"Resume:\n{resume_text}\n\n"
+            "Return only a comma-separated list, or NONE if there are no others."
+        )
+        leftovers = generate_text("resume_skills", prompt)
+        if leftovers.strip().upper().rstrip(".") == "NONE":
+            leftovers = ""
+        return merge_skills(local_skills, leftovers)
+
+    prompt = (
+        f"You are a career mentor AI. Analyze this resume and extract all technical skills, "
+        f"programming languages, frameworks, tools, certifications, and soft skills mentioned.\n\n"
+        f"Resume:\n{resume_text}\n\n"
+        "Return only a comma-separated list of skills. Be comprehensive but concise."
+    )
+    return generate_text("resume_skills", prompt)
+
+def infer_skills_from_repos(repo_names: list[str]) -> str:
+    """Skills guessed from repository names alone."""
+    # Most recently pushed repositories come first, so these are the ones kept
+    repo_names = fit_items(repo_names, stage_budget("repo_skills"))
+    prompt = (
+        f"You are a career mentor AI. Based on these GitHub project names:\n{repo_names}\n"
+        "List the technical skills, frameworks, and tools the person is proficient in. "
+        "Return only a comma-separated list."
+    )
+    return generate_text("repo_skills", prompt)
+
+def describe_repo(repo: dict, readme: bool = True) -> str:
+    """One prompt line per repository: name, languages, topics, description and README excerpt."""
+    line = f"- {repo['name']}"
+    tags = list(repo.get("languages") or ([repo["language"]] if repo.get("language") else []))
+    if repo.get("topics"):
+        tags.append("topics: " + ", ".join(repo["topics"]))
+    if tags:
+        line += f" [{'; '.join(tags)}]"
+    if repo.get("description"):
+        line += f" — {repo['description']}"
+    if readme and repo.get("readme"):
+        line += f" README: {repo['readme'][:README_PROMPT_CHARS]}"
+    return line
+
+def infer_skills_from_profile(repos: list[dict]) -> str:
+    """
+    Skills from enriched repositories (fetch_github_profile), grounded in the user's language byte
+    shares. Repositories are described most recently pushed first, within the repo_profile token budget.
+    """
+    if not any(len(repo) > 1 for repo in repos):
+        return infer_skills_from_repos([repo["name"] for repo in repos])
+    shares = ", ".join(f"{language} {share:.0%}" for language, share in language_shares(repos)[:8] if share >= 0.005)
+    lines = [describe_repo(repo, readme=i < README_PROMPT_REPOS) for i, repo in enumerate(repos)]
+    kept = fit_items(lines, stage_budget("repo_profile"))
+    log_compaction("repo_profile", "\n".join(lines), "\n".join(kept))
+    prompt = (
+        f"You are a career mentor AI. Based on these GitHub repositories (most recently pushed first)"
+        + (f" and this share of their code by language: {shares}" if shares else "")
+        + ":\n" + "\n".join(kept) + "\n\n"
+        "List the technical skills, frameworks, and tools the person is proficient in. "
+        "Return only a comma-separated list."
+    )
+    return generate_text("repo_skills", prompt)
+
+def analyze_github_profile(username: str) -> tuple[list[str], str]:
+    """Fetch a user's repositories and infer skills from them."""
+    repos = fetch_github_profile(username)
+    if not repos:
+        return [], ""
+    return [repo["name"] for repo in repos], infer_skills_from_profile(repos)
+
+def merge_skills(resume_skills: str, github_skills: str) -> str:
+    """Merge and deduplicate skills from resume and GitHub by canonical skill, preserving order."""
+    return ", ".join(canonical_skills(f"{resume_skills or ''}, {github_skills or ''}"))
+
+def build_market_context_prompt(job_title: str, demand_summary: str = "") -> str:
+    prompt = (
+        f"Provide a concise overview of the current job market for the role '{job_title}'. "
+        "Include:\n1. Top technical & soft skills in demand\n2. Common tools or certifications\n"
+        "3. Industries or domains hiring for this role\nRespond in Markdown bullet points."
+    )
+    if demand_summary:
+        prompt += f"\n\nBase the skills section on this data. {demand_summary}"
+    return prompt
+
+def get_job_market_context(job_title: str) -> str:
+    """
+    Market overview for the canonical form of a role: the pre-warmed index, then the response cache,
+    and only then Gemini, grounded in live posting frequencies. The cache is keyed on the ungrounded
+    prompt, so a refreshed job feed doesn't invalidate it and a hit fetches no postings at all.
+    """
+    role = canonicalize_role(job_title)
+    with telemetry.span("market.index") as s:
+        indexed = get_market_index().get(role)
+        s.set(cache="hit" if indexed else "miss")
+    if indexed:
+        return indexed
+
+    def grounded_prompt() -> str:
+        demand, postings = get_market_demand(role) if LIVE_DEMAND else ([], 0)
+        if not demand:
+            return build_market_context_prompt(role)
+        from demand import format_demand_summary
+        return build_market_context_prompt(role, format_demand_summary(demand, postings))
+
+    return generate_text("market_context", build_market_context_prompt(role), miss_prompt=grounded_prompt)
+
+def get_market_demand(job_title: str) -> tuple[list[dict], int]:
+    """
+    Ranked in-demand skills from live job postings, and how many postings they come from.
+    Each skill is also TF-IDF-scored against other popular roles' postings from the same (already
+    fetched) feed.
+    """
+    # Imported on use: BeautifulSoup, NumPy and SciPy add noticeably to app startup
+    from jobs import fetch_job_descriptions, fetch_remoteok_fallback
+    from demand import skill_demand
+    from roles import top_roles
+    role = canonicalize_role(job_title)
+    descriptions = fetch_job_descriptions(role, limit=20) + fetch_remoteok_fallback(role, limit=DEMAND_POSTINGS_LIMIT)
+    if len(descriptions) < MIN_DEMAND_POSTINGS:
+        return [], len(descriptions)
+    with telemetry.span("market.demand", postings=len(descriptions)):
+        peers = {peer: fetch_remoteok_fallback(peer, limit=DEMAND_PEER_POSTINGS)
+                 for peer in top_roles(DEMAND_PEER_ROLES + 1) if peer != role}
+        return skill_demand(descriptions, peers={peer: posts for peer, posts in peers.items() if posts}), len(descriptions)
+
+def get_demand_table(job_title: str) -> tuple[list[dict], int]:
+    """The in-demand skills table shown next to the overview (empty when live demand is off)."""
+    return get_market_demand(job_title) if LIVE_DEMAND else ([], 0)
+
+def build_plan_outline_prompt(project_title: str, job_title: str) -> str:
+    return (
+        f"You are a career mentor outlining a learning project.\n\n"
+        f"Project: {project_title}\n"
+        f"Target Role: {job_title}\n\n"
+        f"Write a {MAX_PLAN_WEEKS}-week outline as JSON objects with the week number and a one-line focus "
+        f"for that week. Progress from setup and basics to advanced concepts, and make every week end with "
+        f"a working, demonstrable increment, so the project can stop after any week with a portfolio piece."
+    )
+
+def get_plan_outline(project_title: str, job_title: str) -> list[str]:
+    """
+    Weekly focus lines for the longest plan the planner allows. Every week chunk of a project is
+    generated against the same outline, whatever the plan length, so changing the number of weeks
+    keeps the weeks already generated.
+    """
+    lock = _outline_locks[hash((project_title, job_title)) % OUTLINE_LOCK_STRIPES]
+    # A project's week chunks start together; the first one generates the outline, the rest hit the cache
+    with lock:
+        text = generate_text("plan_outline", build_plan_outline_prompt(project_title, job_title), PLAN_OUTLINE_SCHEMA)
+    return decode_outline(text)[:MAX_PLAN_WEEKS]
+
+def build_week_plan_prompt(project_title: str, week: int, job_title: str, outline: list[str]) -> str:
+    first_day = (week - 1) * DAYS_PER_WEEK + 1
+    overview = "\n".join(f"Week {i}: {focus}" for i, focus in enumerate(outline, 1))
+    focus = outline[week - 1] if week <= len(outline) else "continue the project"
+    prompt = (
+        f"You are a career mentor creating a detailed daily learning plan.\n\n"
+        f"Project: {project_title}\n"
+        f"Target Role: {job_title}\n"
+        + (f"Project outline:\n{overview}\n" if overview else "")
+        + f"\nPlan week {week} only (days {first_day}-{first_day + DAYS_PER_WEEK - 1} of the project), "
+        f"focused on: {focus}\n\n"
+        f"Create one specific task per day, as JSON objects with the day number within the week (1-7) "
+        f"and the task.\n\n"
+        f"Rules:\n"
+        f"- Keep each task to 1-2 sentences maximum\n"
+        f"- Number the days 1 to {DAYS_PER_WEEK} without gaps\n\n"
+        f"Guidelines for content:\n"
+        f"- Build on the earlier weeks of the outline; do not repeat their work\n"
+        f"- Make tasks concrete and actionable (e.g., 'Set up React project and install dependencies')\n"
+        f"- Day 7 should be 'Review progress, consolidate learnings, and rest'\n"
+        f"- End the week with the working increment its focus describes\n"
+        f"- Be realistic about what can be done each day (2-3 hours of focused work)\n\n"
+        f"Generate exactly {DAYS_PER_WEEK} days."
+    )
+    return prompt
+
+def stream_week_plan(project_title: str, week: int, job_title: str):
+    """
+    Stream one week of a project's daily plan (DAILY_PLAN_SCHEMA JSON, days numbered 1-7 within the
+    week), yielding raw text chunks as the model produces them. Weeks are independent and can run in parallel.
+    """
+    cache = get_llm_cache()
+    outline = get_plan_outline(project_title, job_title)
+    prompt = build_week_plan_prompt(project_title, week, job_title, outline)
+    key = cache_key("daily_plan", prompt, DAILY_PLAN_SCHEMA)
+    with telemetry.span("gemini.daily_plan", project=project_title, week=week) as s:
+        cached = cache.get(key, "daily_plan")
+        if cached is not None:
+            s.set(cache="hit")
+            yield cached
+            return
+        s.set(cache="miss")
+        chunks = []
+        config = json_generation_config(DAILY_PLAN_SCHEMA)
+        for chunk in model_routing.stream("daily_plan", prompt, config):
+            text = safe_gemini_text(chunk, strip=False)
+            if text:
+                chunks.append(text)
+                yield text
+        # Only complete, decodable streams are cached; a cut-off week should be regenerated next time
+        text = "".join(chunks).strip()
+        if cacheable(text, DAILY_PLAN_SCHEMA):
+            cache.set(key, "daily_plan", text, STAGE_TTLS.get("daily_plan"))
+
+def generate_daily_plan(project_title: str, weeks: int, job_title: str) -> list[tuple[int, str]]:
+    """A whole project's (day, task) plan, its week chunks generated in parallel."""
+    def week_plan(week: int) -> list[tuple[int, str]]:
+        return week_days(week, parse_days("".join(stream_week_plan(project_title, week, job_title)), structured=True))
+
+    with ThreadPoolExecutor(max_workers=min(weeks, 4)) as executor:
+        futures = [executor.submit(telemetry.bind(week_plan), week) for week in range(1, weeks + 1)]
+    return [day for future in futures for day in future.result()]
+
+def compare_skills_and_suggest_projects(skills: str, job_title: str, market_data: str) -> SkillReport:
+    """
+    Skill fit report. Matched and missing skills are computed locally from canonical skill IDs;
+    Gemini is only asked for project ideas targeting the missing skills.
+    """
+    with telemetry.span("skill_gap"):
+        matched, missing = compute_skill_gap(skills, market_data)
+    if not matched and not missing:
+        # No recognizable skills in the market overview: let the model do the whole comparison
+        market_brief = trim_to_budget(market_data, stage_budget("report"))
+        log_compaction("report", market_data, market_brief)
+        prompt = (
+            f"My current skills: {skills}\n\nJob market overview for {job_title}:\n{market_brief}\n\n"
+            "Compare my skills with job market requirements: list the matched skills, the missing skills, "
+            "and exactly 3 unique and practical projects aligned with the missing skills, each with a short "
+            "title, a one-line description and the main skill it teaches."
+        )
+        return decode_report(generate_text("report", prompt, REPORT_SCHEMA))
+
+    focus = missing or matched
+    prompt = (
+        f"Target role: {job_title}\n"
+        f"Skills to build: {', '.join(focus)}\n\n"
+        "Suggest exactly 3 unique and practical projects that build these skills, each with a short "
+        "title, a one-line description and the main skill it teaches."
+    )
+    projects = decode_projects(generate_text("report", prompt, PROJECTS_SCHEMA))
+    return SkillReport(matched=matched, missing=missing, projects=projects[:3])
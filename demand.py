@@ -0,0 +1,106 @@
+# demand.py
+"""
+Skill-demand statistics over job descriptions.
+Descriptions are turned into a sparse document-term matrix over the taxonomy skills, and the
+frequency / TF-IDF rankings are computed with vectorized NumPy and SciPy operations.
+"""
+import numpy as np
+from scipy import sparse
+from skills import SkillTaxonomy, get_taxonomy
+
+
+def document_term_matrix(descriptions: list[str], taxonomy: SkillTaxonomy | None = None) -> sparse.csr_matrix:
+    """(descriptions x taxonomy skills) matrix of mention counts."""
+    taxonomy = taxonomy or get_taxonomy()
+    rows, cols = [], []
+    for row, text in enumerate(descriptions):
+        for skill_id in taxonomy.scan(text):
+            rows.append(row)
+            cols.append(taxonomy.index[skill_id])
+    data = np.ones(len(rows), dtype=np.float32)
+    # Duplicate (row, col) pairs are summed, giving per-description mention counts
+    return sparse.csr_matrix(
+        (data, (np.asarray(rows, dtype=np.int32), np.asarray(cols, dtype=np.int32))),
+        shape=(len(descriptions), len(taxonomy.ids_by_index)),
+    )
+
+
+def _rows(taxonomy: SkillTaxonomy, order: np.ndarray, columns: dict[str, np.ndarray], top_n: int) -> list[dict]:
+    rows = []
+    for col in order[:top_n]:
+        skill = taxonomy.skills[taxonomy.ids_by_index[col]]
+        row = {"Skill": skill["name"], "Category": skill["category"]}
+        row.update({name: values[col].item() for name, values in columns.items()})
+        rows.append(row)
+    return rows
+
+
+# Corpus name of the role being ranked among its peers in skill_demand
+_ROLE = "\0role"
+
+
+def skill_demand(descriptions: list[str], top_n: int = 20, taxonomy: SkillTaxonomy | None = None,
+                 peers: dict[str, list[str]] | None = None) -> list[dict]:
+    """
+    Ranked in-demand skills for one role: how many postings mention each skill, the share of
+    postings that do, and total mentions. Ranked by postings, then mentions.
+    With the postings of peer roles, each row also gets the skill's TF-IDF for this role among
+    them (see role_skill_rankings), which tells the skills that set the role apart from the ones
+    every role asks for.
+    """
+    taxonomy = taxonomy or get_taxonomy()
+    if not descriptions:
+        return []
+    X = document_term_matrix(descriptions, taxonomy)
+    postings = np.asarray((X > 0).sum(axis=0)).ravel()
+    mentions = np.asarray(X.sum(axis=0)).ravel()
+    share = np.round(postings / len(descriptions), 3)
+    order = np.lexsort((-mentions, -postings))
+    order = order[postings[order] > 0]
+    rows = _rows(taxonomy, order, {
+        "Postings": postings.astype(int),
+        "Share": share,
+        "Mentions": mentions.astype(int),
+    }, top_n)
+    if peers:
+        rankings = role_skill_rankings({_ROLE: descriptions, **peers}, len(taxonomy.ids_by_index), taxonomy)
+        scores = {row["Skill"]: row["TF-IDF"] for row in rankings.get(_ROLE, [])}
+        for row in rows:
+            row["TF-IDF"] = scores.get(row["Skill"], 0.0)
+    return rows
+
+
+def role_skill_rankings(corpora: dict[str, list[str]], top_n: int = 20, taxonomy: SkillTaxonomy | None = None) -> dict[str, list[dict]]:
+    """
+    TF-IDF ranking of skills per role, treating each role's postings as one document.
+    Skills every role asks for (Git, communication) sink; skills that set a role apart rise.
+    """
+    taxonomy = taxonomy or get_taxonomy()
+    roles = [role for role, descriptions in corpora.items() if descriptions]
+    if not roles:
+        return {}
+    # (roles x skills) mention counts: one sparse column-sum per role, stacked
+    R = sparse.vstack([
+        sparse.csr_matrix(document_term_matrix(corpora[role], taxonomy).sum(axis=0))
+        for role in roles
+    ]).tocsr()
+    totals = np.asarray(R.sum(axis=1)).ravel()
+    totals[totals == 0] = 1
+    tf = sparse.diags(1.0 / totals) @ R
+    df = np.asarray((R > 0).sum(axis=0)).ravel()
+    idf = np.log((1 + len(roles)) / (1 + df)) + 1
+    scores = (tf @ sparse.diags(idf)).toarray()
+
+    rankings = {}
+    for i, role in enumerate(roles):
+        row = scores[i]
+        order = np.argsort(-row, kind="stable")
+        order = order[row[order] > 0]
+        rankings[role] = _rows(taxonomy, order, {"TF-IDF": np.round(row, 4)}, top_n)
+    return rankings
+
+
+def format_demand_summary(rows: list[dict], postings: int, top_n: int = 15) -> str:
+    """One-line summary used to ground the market-context prompt."""
+    skills = ", ".join(f"{r['Skill']} ({r['Share']:.0%})" for r in rows[:top_n])
+    return f"Share of {postings} recent job postings mentioning each skill: {skills}"
@@ -0,0 +1,131 @@
+# exports.py
+"""
+Planner downloads: summary / daily CSV, iCalendar, JSON and Parquet.
+Artifacts are only built when requested and are memoized by a hash of the plan contents, so an
+unchanged plan is never exported twice. The calendar is written line by line rather than through
+per-event objects.
+"""
+import io
+import csv
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+import telemetry
+
+# format -> (MIME type, download file name)
+FORMATS = {
+    "summary_csv": ("text/csv", "career_planner_summary.csv"),
+    "daily_csv": ("text/csv", "career_planner_detailed.csv"),
+    "ics": ("text/calendar", "career_planner_daily.ics"),
+    "json": ("application/json", "career_planner.json"),
+    "parquet": ("application/vnd.apache.parquet", "career_planner_daily.parquet"),
+}
+
+# Every task is a 2-hour block starting on its date
+EVENT_DURATION = "PT2H"
+# Number of built artifacts remembered across sessions
+CACHE_SIZE = 64
+
+
+def plan_hash(summary_rows: list[dict], daily_rows: list[dict]) -> str:
+    payload = json.dumps([summary_rows, daily_rows], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def to_csv(rows: list[dict]) -> bytes:
+    out = io.StringIO()
+    if rows:
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]), lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(rows)
+    return out.getvalue().encode("utf-8")
+
+
+def _ics_text(value: str) -> str:
+    """Escape a TEXT property value (RFC 5545 §3.3.11)."""
+    return (str(value).replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line: str) -> str:
+    """Fold a content line at 75 octets, never splitting a UTF-8 character."""
+    if len(line) <= 75 and line.isascii():
+        return line
+    parts, current, size = [], [], 0
+    for ch in line:
+        width = len(ch.encode("utf-8"))
+        if size + width > 75:
+            parts.append("".join(current))
+            current, size = [" "], 1
+        current.append(ch)
+        size += width
+    parts.append("".join(current))
+    return "\r\n".join(parts)
+
+
+def iter_ics(daily_rows: list[dict]):
+    """iCalendar content lines for the daily task rows, one event per task."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield "PRODID:-//Career-iFy//Learning Planner//EN"
+    for row in daily_rows:
+        date = row["Date"].replace("-", "")
+        # Stable UIDs, so re-importing an updated plan replaces events instead of duplicating them
+        uid = hashlib.sha1(f"{row['Project']}|{row['Day']}|{row['Date']}".encode("utf-8")).hexdigest()[:20]
+        yield "BEGIN:VEVENT"
+        yield f"UID:{uid}@careerify"
+        yield f"DTSTAMP:{stamp}"
+        yield f"DTSTART:{date}T000000Z"
+        yield f"DURATION:{EVENT_DURATION}"
+        yield _fold(f"SUMMARY:{_ics_text(row['Project'])}: {_ics_text(row['Day'])}")
+        yield _fold(f"DESCRIPTION:{_ics_text(row['Task'])}")
+        yield "END:VEVENT"
+    yield "END:VCALENDAR"
+
+
+def to_ics(daily_rows: list[dict]) -> bytes:
+    return ("\r\n".join(iter_ics(daily_rows)) + "\r\n").encode("utf-8")
+
+
+def to_json(summary_rows: list[dict], daily_rows: list[dict]) -> bytes:
+    return json.dumps({"projects": summary_rows, "tasks": daily_rows}, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def to_parquet(daily_rows: list[dict]) -> bytes:
+    # pyarrow ships with Streamlit; imported here because only this format needs it
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    out = io.BytesIO()
+    pq.write_table(pa.Table.from_pylist(daily_rows), out)
+    return out.getvalue()
+
+
+_BUILDERS = {
+    "summary_csv": lambda summary, daily: to_csv(summary),
+    "daily_csv": lambda summary, daily: to_csv(daily),
+    "ics": lambda summary, daily: to_ics(daily),
+    "json": to_json,
+    "parquet": lambda summary, daily: to_parquet(daily),
+}
+
+_cache: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def render(fmt: str, summary_rows: list[dict], daily_rows: list[dict]) -> bytes:
+    """The fmt artifact for a plan, built on first request and then served from memory."""
+    key = (plan_hash(summary_rows, daily_rows), fmt)
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    with telemetry.span(f"export.{fmt}", rows=len(daily_rows)):
+        data = _BUILDERS[fmt](summary_rows, daily_rows)
+    with _cache_lock:
+        _cache[key] = data
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return data
@@ -0,0 +1,322 @@
+# gemini_gateway.py
+"""
+Single gateway for every Gemini call in the process.
+Calls wait on their model's token buckets (requests and tokens per minute), are retried with jittered
+exponential backoff on 429 / 5xx, and fail fast through their model's circuit breaker while it is
+degraded. Gemini rate-limits each model separately, so one model running out of quota leaves the
+others (and the fallbacks routed to them) untouched.
+"""
+import os
+import time
+import random
+import threading
+import telemetry
+
+# Per-model quota shared by every session in the process
+REQUESTS_PER_MINUTE = float(os.getenv("CAREERIFY_GEMINI_RPM", "60"))
+TOKENS_PER_MINUTE = float(os.getenv("CAREERIFY_GEMINI_TPM", "250000"))
+# Longest a call waits in the quota queue before giving up
+MAX_QUEUE_SECONDS = float(os.getenv("CAREERIFY_GEMINI_MAX_QUEUE_SECONDS", "120"))
+
+MAX_RETRIES = int(os.getenv("CAREERIFY_GEMINI_MAX_RETRIES", "4"))
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_MAX_SECONDS = 30.0
+
+# Consecutive failed calls that open the breaker, and how long it stays open before a trial call
+BREAKER_THRESHOLD = int(os.getenv("CAREERIFY_GEMINI_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN_SECONDS = float(os.getenv("CAREERIFY_GEMINI_BREAKER_COOLDOWN", "30"))
+
+_api_key = None
+_genai = None
+_genai_lock = threading.Lock()
+
+
+def configure(api_key: str) -> None:
+    """Set the API key; the SDK is configured with it when it is first loaded."""
+    global _api_key
+    with _genai_lock:
+        _api_key = api_key
+        if _genai is not None:
+            _genai.configure(api_key=api_key)
+
+
+def load_genai():
+    """google.generativeai, imported on the first Gemini call (the import alone takes about a second)."""
+    global _genai
+    with _genai_lock:
+        if _genai is None:
+            import google.generativeai as genai
+            if _api_key:
+                genai.configure(api_key=_api_key)
+            _genai = genai
+        return _genai
+
+
+def retryable_errors() -> tuple:
+    """429 (quota) and 5xx (including gateway timeouts) are worth retrying; 4xx client errors are not."""
+    from google.api_core import exceptions as api_exceptions
+    return (api_exceptions.TooManyRequests, api_exceptions.ServerError)
+
+
+def request_options(timeout: float | None) -> dict:
+    """Extra generate_content arguments: a per-request deadline when timeout is set."""
+    return {"request_options": {"timeout": timeout}} if timeout else {}
+
+
+class GeminiUnavailable(RuntimeError):
+    """Raised without calling the API: the circuit breaker is open or the quota queue is too long."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used to reserve quota before a call."""
+    return len(text or "") // 4 + 1
+
+
+class TokenBucket:
+    """
+    Continuously refilling bucket holding up to one minute of quota.
+    Debits after a call may drive it negative, which delays the callers that follow.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Seconds until amount is available (requests larger than the bucket only need a full one)."""
+        self._refill(now)
+        needed = min(amount, self.capacity) - self.level
+        return needed / self.rate if needed > 0 else 0.0
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+
+class CircuitBreaker:
+    """Closed → open after BREAKER_THRESHOLD consecutive failures → half-open (one trial call) after the cooldown."""
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN_SECONDS):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> str | None:
+        """"call" while closed, "trial" for the one call let through once the cooldown has passed, None while open."""
+        with self._lock:
+            if self.opened_at is None:
+                return "call"
+            if time.monotonic() - self.opened_at >= self.cooldown and not self._trial:
+                self._trial = True
+                return "trial"
+            return None
+
+    def release_trial(self) -> None:
+        """End a trial call that finished without a verdict (a client error, a timeout, a dropped stream)."""
+        with self._lock:
+            self._trial = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class ModelLimits:
+    """Quota buckets and circuit breaker of one model."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.breaker = CircuitBreaker()
+
+
+# Best first: status() reports the best state across models, since calls fall back to the others
+_BREAKER_STATES = ("closed", "half-open", "open")
+
+
+class GeminiGateway:
+    """Rate-limited, retrying front for generate_content, streaming included."""
+
+    def __init__(self, requests_per_minute: float = REQUESTS_PER_MINUTE, tokens_per_minute: float = TOKENS_PER_MINUTE):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._limits: dict[str, ModelLimits] = {}
+        self._cond = threading.Condition()
+        self.waiting = 0
+        self.last_wait = 0.0
+        self.recent_wait = 0.0  # exponentially weighted average of queue waits
+        self.retries = 0
+        self._models = {}
+
+    def model(self, model_name: str):
+        """One GenerativeModel per model name, reused across calls."""
+        with self._cond:
+            model = self._models.get(model_name)
+        if model is None:
+            model = load_genai().GenerativeModel(model_name)
+            with self._cond:
+                model = self._models.setdefault(model_name, model)
+        return model
+
+    def limits(self, model_name: str) -> ModelLimits:
+        """The quota buckets and breaker of a model, created on its first call."""
+        with self._cond:
+            limits = self._limits.get(model_name)
+            if limits is None:
+                limits = self._limits[model_name] = ModelLimits(self.requests_per_minute, self.tokens_per_minute)
+            return limits
+
+    def status(self) -> dict:
+        """Queue and breaker state for display; "breaker" is only "open" while every model's breaker is."""
+        with self._cond:
+            status = {
+                "waiting": self.waiting,
+                "last_wait": self.last_wait,
+                "recent_wait": self.recent_wait,
+                "retries": self.retries,
+            }
+            models = dict(self._limits)
+        status["breakers"] = {name: limits.breaker.state for name, limits in models.items()}
+        status["breaker"] = next((state for state in _BREAKER_STATES if state in status["breakers"].values()), "closed")
+        return status
+
+    def _acquire(self, limits: ModelLimits, model_name: str, tokens: int) -> bool:
+        """Block until one request and `tokens` tokens fit the model's quota; returns whether this is the breaker's trial call."""
+        admitted = limits.breaker.allow()
+        if not admitted:
+            raise GeminiUnavailable(f"{model_name} is temporarily unavailable after repeated errors; try again shortly.")
+        trial = admitted == "trial"
+        start = time.monotonic()
+        with self._cond:
+            self.waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = max(limits.requests.delay(1, now), limits.tokens.delay(tokens, now))
+                    if delay <= 0:
+                        break
+                    if now - start + delay > MAX_QUEUE_SECONDS:
+                        if trial:
+                            limits.breaker.release_trial()
+                        raise GeminiUnavailable(f"{model_name} quota is exhausted for now; try again in a minute.")
+                    self._cond.wait(delay)
+                limits.requests.take(1, now)
+                limits.tokens.take(tokens, now)
+            finally:
+                self.waiting -= 1
+            waited = time.monotonic() - start
+            self.last_wait = waited
+            self.recent_wait = 0.8 * self.recent_wait + 0.2 * waited
+        telemetry.count("queue_wait", waited)
+        return trial
+
+    def _settle(self, limits: ModelLimits, response, reserved: int) -> None:
+        """Charge the tokens a call actually used (from usage_metadata) beyond what was reserved."""
+        usage = getattr(response, "usage_metadata", None)
+        used = getattr(usage, "total_token_count", 0) or 0
+        telemetry.count("prompt_tokens", getattr(usage, "prompt_token_count", 0) or 0)
+        telemetry.count("response_tokens", getattr(usage, "candidates_token_count", 0) or 0)
+        if used > reserved:
+            with self._cond:
+                limits.tokens.take(used - reserved, time.monotonic())
+
+    def _backoff(self, limits: ModelLimits, error: Exception, attempt: int, max_retries: int) -> None:
+        """Record a retryable failure; re-raise it on the last attempt, otherwise sleep with full jitter."""
+        limits.breaker.record_failure()
+        if attempt >= max_retries:
+            raise error
+        with self._cond:
+            self.retries += 1
+        telemetry.count("retries")
+        time.sleep(random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt)))
+
+    def generate(self, model_name: str, prompt: str, generation_config: dict | None = None,
+                 max_retries: int = MAX_RETRIES, timeout: float | None = None):
+        """generate_content through the quota queue, with retries (each request abandoned after timeout seconds)."""
+        model, limits = self.model(model_name), self.limits(model_name)
+        reserved = estimate_tokens(prompt)
+        for attempt in range(max_retries + 1):
+            trial = self._acquire(limits, model_name, reserved)
+            try:
+                response = model.generate_content(prompt, generation_config=generation_config, **request_options(timeout))
+            except retryable_errors() as e:
+                self._backoff(limits, e, attempt, max_retries)
+                continue
+            except BaseException:
+                # Not a verdict on the API's health, but the next call must be able to try again
+                if trial:
+                    limits.breaker.release_trial()
+                raise
+            limits.breaker.record_success()
+            self._settle(limits, response, reserved)
+            return response
+
+    def stream(self, model_name: str, prompt: str, generation_config: dict | None = None,
+               max_retries: int = MAX_RETRIES, timeout: float | None = None):
+        """
+        Streaming generate_content through the quota queue, yielding response chunks.
+        A call is only retried until its first chunk arrives; a stream cut off later raises.
+        """
+        model, limits = self.model(model_name), self.limits(model_name)
+        reserved = estimate_tokens(prompt)
+        for attempt in range(max_retries + 1):
+            trial = self._acquire(limits, model_name, reserved)
+            last = None
+            try:
+                for chunk in model.generate_content(prompt, generation_config=generation_config, stream=True,
+                                                    **request_options(timeout)):
+                    last = chunk
+                    yield chunk
+            except retryable_errors() as e:
+                if last is not None:
+                    limits.breaker.record_failure()
+                    raise
+                self._backoff(limits, e, attempt, max_retries)
+                continue
+            except BaseException:
+                # Client errors, timeouts and a consumer closing the stream (GeneratorExit)
+                if trial:
+                    limits.breaker.release_trial()
+                raise
+            limits.breaker.record_success()
+            # usage_metadata on the final chunk covers the whole stream
+            self._settle(limits, last, reserved)
+            return
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> GeminiGateway:
+    """One gateway per process, so every session shares the project quota."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = GeminiGateway()
+        return _gateway
@@ -0,0 +1,212 @@
+# github_client.py
+import os
+import re
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+
+API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", f"{API_URL}/graphql")
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+
+# How long a user's repo list is served from memory before it is revalidated with GitHub
+REPO_CACHE_TTL_SECONDS = float(os.getenv("CAREERIFY_GITHUB_CACHE_TTL", "3600"))
+# Safety net for pagination: 10 pages of 100 repos
+MAX_PAGES = 10
+PER_PAGE = 100
+# Bound on remembered ETags / repo lists; the oldest entries are dropped first
+MAX_CACHE_ENTRIES = 2000
+# Enrichment: the most recently pushed repos, fetched over GraphQL in pages of this size
+MAX_ENRICHED_REPOS = int(os.getenv("CAREERIFY_GITHUB_ENRICH_REPOS", "100"))
+GRAPHQL_PAGE_SIZE = 50
+# Characters of each README kept (GraphQL returns whole blobs)
+README_CHARS = 600
+
+# One page of a user's repositories with everything skill inference needs; README.md or readme.md
+REPOS_QUERY = """
+query($login: String!, $first: Int!, $after: String) {
+  user(login: $login) {
+    repositories(first: $first, after: $after, ownerAffiliations: OWNER, privacy: PUBLIC,
+                 orderBy: {field: PUSHED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        description
+        isFork
+        primaryLanguage { name }
+        languages(first: 10, orderBy: {field: SIZE, direction: DESC}) { edges { size node { name } } }
+        repositoryTopics(first: 10) { nodes { topic { name } } }
+        readme: object(expression: "HEAD:README.md") { ... on Blob { text } }
+        readmeLower: object(expression: "HEAD:readme.md") { ... on Blob { text } }
+      }
+    }
+  }
+}
+"""
+
+
+# Badge and image Markdown at the top of most READMEs carries no signal
+_README_IMAGE_RE = re.compile(r"\[?!\[[^\]]*\]\([^)]*\)(?:\]\([^)]*\))?")
+
+
+class GitHubError(RuntimeError):
+    """A GitHub API call failed or returned errors."""
+
+
+class GitHubClient:
+    """
+    Small GitHub REST client with a pooled session, Link-header pagination,
+    ETag revalidation (304s don't count against the rate limit) and a TTL cache of repo lists.
+    """
+
+    def __init__(self, token: str | None = GITHUB_TOKEN, cache_ttl: float = REPO_CACHE_TTL_SECONDS, timeout: float = 20):
+        self.cache_ttl = cache_ttl
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Accept": "application/vnd.github+json",
+            "User-Agent": "Career-iFy-App"
+        })
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        self._lock = threading.Lock()
+        # url -> (etag, json payload, next page url)
+        self._etags: dict[str, tuple[str, object, str | None]] = {}
+        self.token = token
+        # username -> (fetched_at, repos)
+        self._repos: dict[str, tuple[float, list[dict]]] = {}
+        # username -> (fetched_at, enriched repos)
+        self._enriched: dict[str, tuple[float, list[dict]]] = {}
+
+    def _get(self, url: str, params: dict | None = None) -> tuple[object, str | None]:
+        """Conditional GET; returns (payload, next page url). Raises on non-2xx/304 responses."""
+        cache_key = requests.Request("GET", url, params=params).prepare().url
+        with self._lock:
+            cached = self._etags.get(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+
+        r = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        if r.status_code == 304 and cached:
+            return cached[1], cached[2]
+        r.raise_for_status()
+
+        payload = r.json()
+        next_url = r.links.get("next", {}).get("url")
+        etag = r.headers.get("ETag")
+        if etag:
+            with self._lock:
+                self._etags.pop(cache_key, None)
+                self._etags[cache_key] = (etag, payload, next_url)
+                while len(self._etags) > MAX_CACHE_ENTRIES:
+                    self._etags.pop(next(iter(self._etags)))
+        return payload, next_url
+
+    def list_repos(self, username: str) -> list[dict]:
+        """All public repositories of a user, following pagination."""
+        key = username.lower()
+        with self._lock:
+            cached = self._repos.get(key)
+        if cached and time.time() - cached[0] < self.cache_ttl:
+            return cached[1]
+
+        repos = []
+        url, params = f"{API_URL}/users/{username}/repos", {"per_page": PER_PAGE, "sort": "pushed"}
+        for _ in range(MAX_PAGES):
+            payload, url = self._get(url, params)
+            params = None  # the Link header already carries the query string
+            repos.extend(repo for repo in payload if isinstance(repo, dict))
+            if not url:
+                break
+
+        self._remember(self._repos, key, repos)
+        return repos
+
+    def _remember(self, cache: dict, key: str, value: list[dict]) -> None:
+        with self._lock:
+            cache.pop(key, None)
+            cache[key] = (time.time(), value)
+            while len(cache) > MAX_CACHE_ENTRIES:
+                cache.pop(next(iter(cache)))
+
+    def _graphql(self, query: str, variables: dict) -> dict:
+        r = self.session.post(GRAPHQL_URL, json={"query": query, "variables": variables}, timeout=self.timeout)
+        r.raise_for_status()
+        payload = r.json()
+        if payload.get("errors"):
+            raise GitHubError("; ".join(str(e.get("message", e)) for e in payload["errors"]))
+        return payload.get("data") or {}
+
+    def enrich_repos(self, username: str, limit: int = MAX_ENRICHED_REPOS) -> list[dict]:
+        """
+        A user's most recently pushed repositories with languages (bytes per language), topics,
+        description and a README excerpt, in ceil(limit / GRAPHQL_PAGE_SIZE) GraphQL requests at most.
+        GitHub's GraphQL API requires a token; raises GitHubError without one.
+        """
+        if not self.token:
+            raise GitHubError("GitHub GraphQL needs GITHUB_TOKEN")
+        key = username.lower()
+        with self._lock:
+            cached = self._enriched.get(key)
+        if cached and time.time() - cached[0] < self.cache_ttl:
+            return cached[1]
+
+        repos, after = [], None
+        while len(repos) < limit:
+            data = self._graphql(REPOS_QUERY, {"login": username, "first": min(GRAPHQL_PAGE_SIZE, limit - len(repos)), "after": after})
+            page = (data.get("user") or {}).get("repositories") or {}
+            repos.extend(_repo_record(node) for node in page.get("nodes") or [] if node)
+            info = page.get("pageInfo") or {}
+            if not info.get("hasNextPage"):
+                break
+            after = info.get("endCursor")
+
+        self._remember(self._enriched, key, repos)
+        return repos
+
+
+def _repo_record(node: dict) -> dict:
+    readme = (node.get("readme") or node.get("readmeLower") or {}).get("text") or ""
+    return {
+        "name": node.get("name", ""),
+        "description": (node.get("description") or "").strip(),
+        "fork": bool(node.get("isFork")),
+        "language": (node.get("primaryLanguage") or {}).get("name"),
+        "languages": {
+            edge["node"]["name"]: edge.get("size", 0)
+            for edge in (node.get("languages") or {}).get("edges") or []
+            if edge.get("node")
+        },
+        "topics": [t["topic"]["name"] for t in (node.get("repositoryTopics") or {}).get("nodes") or [] if t.get("topic")],
+        "readme": " ".join(_README_IMAGE_RE.sub(" ", readme[:README_CHARS * 4]).split())[:README_CHARS],
+    }
+
+
+def language_shares(repos: list[dict]) -> list[tuple[str, float]]:
+    """Share of code bytes per language across repos (forks excluded), largest first."""
+    totals: dict[str, int] = {}
+    for repo in repos:
+        if repo.get("fork"):
+            continue
+        for language, size in (repo.get("languages") or {}).items():
+            totals[language] = totals.get(language, 0) + size
+    grand_total = sum(totals.values())
+    if not grand_total:
+        return []
+    return sorted(((language, size / grand_total) for language, size in totals.items()), key=lambda item: -item[1])
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> GitHubClient:
+    """The process-wide client, so every session shares one connection pool and cache."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = GitHubClient()
+        return _client
@@ -1,7 +1,191 @@
 # jobs.py
+import os
+import re
+import time
+import bisect
+import threading
+from typing import Callable
+from urllib.parse import urlsplit
 import requests
+import telemetry
 from bs4 import BeautifulSoup
 
+REMOTEOK_URL = "https://remoteok.com/api"
+# How long a fetched feed/search page is served before it is revalidated
+FEED_REFRESH_SECONDS = float(os.getenv("CAREERIFY_JOB_FEED_REFRESH", "1800"))
+# How long a failed fetch (blocked, non-200, timed out) is remembered before the URL is tried again
+FEED_RETRY_SECONDS = float(os.getenv("CAREERIFY_JOB_FEED_RETRY", "300"))
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+
+def _tokens(text: str) -> list[str]:
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def _html_to_text(html: str) -> str:
+    return BeautifulSoup(html, "html.parser").get_text(" ").strip()
+
+
+class HTTPCache:
+    """
+    Conditional-GET cache shared by the job sources.
+    A response is parsed once and the parsed value is kept; fresh entries never touch the network,
+    stale ones are revalidated in the background with ETag / Last-Modified while the old value is served.
+    Concurrent misses for a URL share one request, and a failed fetch is not retried for retry_interval.
+    """
+
+    def __init__(self, refresh_interval: float = FEED_REFRESH_SECONDS, retry_interval: float = FEED_RETRY_SECONDS):
+        self.refresh_interval = refresh_interval
+        self.retry_interval = retry_interval
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        # url -> {"fetched_at", "etag", "last_modified", "value"}
+        self._entries: dict[str, dict] = {}
+        # url -> when its last fetch failed
+        self._failed_at: dict[str, float] = {}
+        # url -> set once the fetch in flight for it finishes
+        self._inflight: dict[str, threading.Event] = {}
+
+    def get(self, url: str, parse: Callable[[requests.Response], object], headers: dict | None = None):
+        """Parsed value for url, or None if it has never been fetched successfully."""
+        with telemetry.span("jobs.fetch", source=urlsplit(url).hostname) as s:
+            with self._lock:
+                entry = self._entries.get(url)
+                if entry and time.time() - entry["fetched_at"] < self.refresh_interval:
+                    s.set(cache="hit")
+                    return entry["value"]
+                retry_pending = time.time() - self._failed_at.get(url, 0.0) < self.retry_interval
+                if entry:
+                    if url not in self._inflight and not retry_pending:
+                        self._inflight[url] = threading.Event()
+                        threading.Thread(target=self._refresh, args=(url, parse, headers), daemon=True).start()
+                    s.set(cache="stale")
+                    return entry["value"]
+                if retry_pending:
+                    s.set(cache="failed")
+                    return None
+                done = self._inflight.get(url)
+                if done is None:
+                    self._inflight[url] = threading.Event()
+            if done is not None:
+                s.set(cache="joined")
+                done.wait()
+            else:
+                s.set(cache="miss")
+                self._refresh(url, parse, headers)
+            with self._lock:
+                entry = self._entries.get(url)
+                return entry["value"] if entry else None
+
+    def _refresh(self, url: str, parse: Callable[[requests.Response], object], headers: dict | None) -> None:
+        """Fetch url into the cache; the caller has registered it in _inflight."""
+        with self._lock:
+            entry = self._entries.get(url)
+        request_headers = dict(headers or {})
+        if entry and entry.get("etag"):
+            request_headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            request_headers["If-Modified-Since"] = entry["last_modified"]
+        ok = False
+        try:
+            r = self.session.get(url, headers=request_headers, timeout=20)
+            if r.status_code == 304 and entry:
+                with self._lock:
+                    entry["fetched_at"] = time.time()
+                ok = True
+            elif r.status_code == 200:
+                value = parse(r)
+                with self._lock:
+                    self._entries[url] = {
+                        "fetched_at": time.time(),
+                        "etag": r.headers.get("ETag"),
+                        "last_modified": r.headers.get("Last-Modified"),
+                        "value": value,
+                    }
+                ok = True
+        except Exception:
+            pass
+        finally:
+            with self._lock:
+                if ok:
+                    self._failed_at.pop(url, None)
+                else:
+                    self._failed_at[url] = time.time()
+                self._inflight.pop(url).set()
+
+
+class JobFeedIndex:
+    """Job postings with their text extracted once, and an inverted index from title tokens to postings."""
+
+    def __init__(self, postings: list[tuple[str, str]]):
+        # (lowercased title, plain-text snippet)
+        self.postings = postings
+        self.index: dict[str, list[int]] = {}
+        for i, (title, _) in enumerate(postings):
+            for token in set(_tokens(title)):
+                self.index.setdefault(token, []).append(i)
+        self.vocabulary = sorted(self.index)
+
+    @classmethod
+    def from_remoteok(cls, r: requests.Response) -> "JobFeedIndex":
+        postings = []
+        for item in r.json():
+            if not isinstance(item, dict):
+                continue
+            title = (item.get("position") or item.get("title") or "").lower()
+            snippet = _html_to_text((item.get("description") or "")[:1500])
+            if title and snippet:
+                postings.append((title, snippet))
+        return cls(postings)
+
+    def _prefix_postings(self, prefix: str) -> set[int]:
+        """Postings for every indexed token starting with prefix ("engineer" also finds "engineering")."""
+        ids = set()
+        start = bisect.bisect_left(self.vocabulary, prefix)
+        for token in self.vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            ids.update(self.index[token])
+        return ids
+
+    def search(self, job_title: str, limit: int = 10) -> list[str]:
+        """Snippets of postings whose title contains job_title, in feed order."""
+        jt = (job_title or "").lower()
+        tokens = _tokens(jt)
+        if not tokens:
+            return []
+        candidates = None
+        for token in sorted(set(tokens), key=len, reverse=True):
+            ids = self._prefix_postings(token)
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        results = []
+        for i in sorted(candidates):
+            title, snippet = self.postings[i]
+            if jt in title:
+                results.append(snippet)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+_http_cache = HTTPCache()
+
+
+def _parse_indeed(r: requests.Response) -> list[str]:
+    soup = BeautifulSoup(r.text, "html.parser")
+    jobs = []
+    for div in soup.select("div.job_seen_beacon"):
+        desc = div.select_one("div.job-snippet")
+        if desc:
+            text = desc.get_text(" ").strip()
+            if text:
+                jobs.append(text)
+    return jobs
+
+
 def fetch_job_descriptions(job_title: str, location: str = "United States", limit: int = 10) -> list[str]:
     """
     Try Indeed first. If it returns nothing, caller can optionally try RemoteOK fallback.
@@ -16,44 +200,13 @@ def fetch_job_descriptions(job_title: str, location: str = "United States", limi
             "Chrome/125.0.0.0 Safari/537.36"
         )
     }
-    try:
-        r = requests.get(url, headers=headers, timeout=20)
-        if r.status_code != 200:
-            return []
-        soup = BeautifulSoup(r.text, "html.parser")
-        jobs = []
-        for div in soup.select("div.job_seen_beacon"):
-            desc = div.select_one("div.job-snippet")
-            if desc:
-                text = desc.get_text(" ").strip()
-                if text:
-                    jobs.append(text)
-        return jobs[:limit]
-    except Exception:
-        return []
+    jobs = _http_cache.get(url, _parse_indeed, headers)
+    return (jobs or [])[:limit]
 
 
 def fetch_remoteok_fallback(job_title: str, limit: int = 10) -> list[str]:
-    """RemoteOK public API fallback; returns short text snippets."""
-    try:
-        r = requests.get("https://remoteok.com/api", timeout=20, headers={"User-Agent": "Mozilla/5.0"})
-        if r.status_code != 200:
-            return []
-        data = r.json()
-        results = []
-        jt = job_title.lower()
-        for item in data:
-            if not isinstance(item, dict):
-                continue
-            title = (item.get("position") or item.get("title") or "").lower()
-            if jt in title:
-                html = (item.get("description") or "")[:1500]
-                soup = BeautifulSoup(html, "html.parser")
-                snippet = soup.get_text(" ").strip()
-                if snippet:
-                    results.append(snippet)
-            if len(results) >= limit:
-                break
-        return results
-    except Exception:
-        return []
\ No newline at end of file
+    """RemoteOK public API fallback; returns short text snippets from the cached, indexed feed."""
+    index = _http_cache.get(REMOTEOK_URL, JobFeedIndex.from_remoteok, {"User-Agent": "Mozilla/5.0"})
+    if index is None:
+        return []
+    return index.search(job_title, limit)
@@ -0,0 +1,188 @@
+# llm_cache.py
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+
+DEFAULT_CACHE_PATH = os.getenv("CAREERIFY_CACHE_PATH", os.path.join(".cache", "llm_cache.sqlite3"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("CAREERIFY_CACHE_MAX_ENTRIES", "5000"))
+# Seconds hit/miss counters and last-used times are buffered in memory before they are written,
+# so a cache hit is a plain read
+STATS_FLUSH_SECONDS = 5.0
+
+# Seconds a response stays valid per stage; None means it never expires.
+# Resume extraction needs no TTL because the resume text itself is part of the key.
+STAGE_TTLS = {
+    "resume_skills": None,
+    "repo_skills": 7 * 24 * 3600,
+    "market_context": 24 * 3600,
+    "report": 6 * 3600,
+    "daily_plan": 6 * 3600,
+    # Outlives the week chunks generated against it, so a later extension reuses the same outline
+    "plan_outline": 24 * 3600,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    value TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used);
+CREATE TABLE IF NOT EXISTS stats (
+    stage TEXT PRIMARY KEY,
+    hits INTEGER NOT NULL DEFAULT 0,
+    misses INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so cosmetic differences don't defeat the cache."""
+    return re.sub(r"\s+", " ", prompt or "").strip()
+
+
+def make_key(model_name: str, prompt: str) -> str:
+    """Cache key: model name plus a hash of the normalized prompt."""
+    digest = hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+    return f"{model_name}:{digest}"
+
+
+class LLMCache:
+    """
+    Disk-backed (SQLite) cache of LLM responses, shared by every session and process using the same file.
+    Entries expire per stage TTL and the least recently used ones are evicted past max_entries.
+    Per-stage counters and last-used times are written in batches (see STATS_FLUSH_SECONDS), and
+    always before an eviction, so eviction order stays exact.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # (stage, "hits" | "misses") -> count, and key -> last used, not yet written
+        self._counts: dict[tuple[str, str], int] = {}
+        self._touched: dict[str, float] = {}
+        self._flushed_at = time.monotonic()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per call keeps the cache safe to use from worker threads
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _record(self, stage: str, column: str, key: str | None = None, now: float | None = None) -> None:
+        """Buffer a hit or miss (and the hit key's last-used time); flush once the buffer is old enough."""
+        with self._lock:
+            if column == "hits":
+                self.hits += 1
+                self._touched[key] = now
+            else:
+                self.misses += 1
+            self._counts[(stage, column)] = self._counts.get((stage, column), 0) + 1
+            due = time.monotonic() - self._flushed_at >= STATS_FLUSH_SECONDS
+        if due:
+            self.flush()
+
+    def _write_pending(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            counts, self._counts = self._counts, {}
+            touched, self._touched = self._touched, {}
+            self._flushed_at = time.monotonic()
+        conn.executemany(
+            "UPDATE responses SET last_used = MAX(last_used, ?) WHERE key = ?",
+            [(used, key) for key, used in touched.items()],
+        )
+        for (stage, column), amount in counts.items():
+            conn.execute(
+                f"INSERT INTO stats(stage, {column}) VALUES (?, ?) "
+                f"ON CONFLICT(stage) DO UPDATE SET {column} = {column} + excluded.{column}",
+                (stage, amount),
+            )
+
+    def flush(self) -> None:
+        """Write the buffered counters and last-used times."""
+        try:
+            with self._connect() as conn:
+                self._write_pending(conn)
+        except sqlite3.Error:
+            pass
+
+    def get(self, key: str, stage: str = "default") -> str | None:
+        """Return the cached response for key, or None on a miss or expired entry."""
+        now = time.time()
+        value = None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and (row[1] is None or row[1] > now):
+                    value = row[0]
+                elif row:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error:
+            pass
+        if value is None:
+            self._record(stage, "misses")
+        else:
+            self._record(stage, "hits", key, now)
+        return value
+
+    def set(self, key: str, stage: str, value: str, ttl: float | None = None) -> None:
+        """Store a response and evict the least recently used entries over the size cap."""
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses(key, stage, value, created_at, expires_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, stage, value, now, expires_at, now),
+                )
+                self._write_pending(conn)
+                conn.execute("DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process and, per stage, for everyone sharing the cache file."""
+        self.flush()
+        result = {"process": {"hits": self.hits, "misses": self.misses}, "stages": {}, "entries": 0}
+        try:
+            with self._connect() as conn:
+                for stage, hits, misses in conn.execute("SELECT stage, hits, misses FROM stats"):
+                    result["stages"][stage] = {"hits": hits, "misses": misses}
+                result["entries"] = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        except sqlite3.Error:
+            pass
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counts, self._touched = {}, {}
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
+            conn.execute("DELETE FROM stats")
@@ -0,0 +1,124 @@
+# model_routing.py
+"""
+Which Gemini model answers each stage.
+
+Every stage has a route: model tiers in the order they are tried. The first tier answers; when it
+times out or runs out of quota the call moves on to the next one instead of retrying the same model
+for minutes. Plain list extraction (resume and repository skills) starts on the lite tier, the
+market overview, report and plans on flash.
+
+Each attempt is recorded as a "model.<stage>" stage labelled with its model, so the metrics file has
+latency, failures, fallbacks and tokens per stage and model for tuning the routes.
+"""
+import os
+import time
+import telemetry
+from gemini_gateway import GeminiUnavailable, get_gateway
+
+# Model behind each tier; override with CAREERIFY_MODEL_<TIER>, e.g. CAREERIFY_MODEL_LITE=gemini-2.0-flash-lite
+TIERS = {
+    "lite": os.getenv("CAREERIFY_MODEL_LITE", "gemini-2.5-flash-lite"),
+    "flash": os.getenv("CAREERIFY_MODEL_FLASH", "gemini-2.5-flash"),
+    "pro": os.getenv("CAREERIFY_MODEL_PRO", "gemini-2.5-pro"),
+}
+
+# Tiers tried per stage, in order; override with CAREERIFY_MODEL_ROUTE_<STAGE>, e.g. CAREERIFY_MODEL_ROUTE_REPORT=pro,flash
+DEFAULT_ROUTES = {
+    "resume_skills": ("lite", "flash"),
+    "repo_skills": ("lite", "flash"),
+    "market_context": ("flash", "lite"),
+    "plan_outline": ("flash", "lite"),
+    "daily_plan": ("flash", "lite"),
+    "report": ("flash", "lite"),
+}
+DEFAULT_ROUTE = ("flash", "lite")
+
+# Seconds before a request is abandoned as timed out (and the next tier tried)
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("CAREERIFY_MODEL_TIMEOUT", "60"))
+# Gateway retries on a tier that still has a fallback; the last tier gets the gateway's full retries
+FALLBACK_RETRIES = int(os.getenv("CAREERIFY_MODEL_FALLBACK_RETRIES", "1"))
+
+
+def route(stage: str) -> list[str]:
+    """Model names tried for a stage, in order (a model reached through two tiers is only tried once)."""
+    override = os.getenv(f"CAREERIFY_MODEL_ROUTE_{stage.upper()}")
+    tiers = [tier.strip().lower() for tier in override.split(",") if tier.strip()] if override else DEFAULT_ROUTES.get(stage, DEFAULT_ROUTE)
+    unknown = [tier for tier in tiers if tier not in TIERS]
+    if unknown or not tiers:
+        raise ValueError(f"Unknown model tier(s) {unknown or tiers} for stage '{stage}'; expected one of {sorted(TIERS)}")
+    return list(dict.fromkeys(TIERS[tier] for tier in tiers))
+
+
+def primary_model(stage: str) -> str:
+    """The model that answers a stage when nothing goes wrong (and that its cache entries are keyed on)."""
+    return route(stage)[0]
+
+
+def fallback_errors() -> tuple:
+    """
+    Quota (429) and timeout errors, and a model the gateway refuses to call (its breaker is open or
+    its quota queue too long), move on to the next tier; other errors fail the call.
+    """
+    from google.api_core import exceptions as api_exceptions
+    return (api_exceptions.TooManyRequests, api_exceptions.DeadlineExceeded, TimeoutError, GeminiUnavailable)
+
+
+def _attempts(stage: str):
+    """(model, gateway kwargs) for each tier of the stage's route."""
+    models = route(stage)
+    for i, model_name in enumerate(models):
+        kwargs = {"timeout": REQUEST_TIMEOUT_SECONDS}
+        if i < len(models) - 1:
+            kwargs["max_retries"] = FALLBACK_RETRIES
+        yield model_name, kwargs, i == len(models) - 1
+
+
+def _record(stage: str, model_name: str, start: float, error: Exception | None = None) -> None:
+    if error is None:
+        telemetry.record_stage(f"model.{stage}", time.perf_counter() - start, model=model_name)
+    else:
+        telemetry.record_stage(f"model.{stage}", time.perf_counter() - start, "error",
+                               model=model_name, error=type(error).__name__)
+
+
+def generate(stage: str, prompt: str, generation_config: dict | None = None):
+    """The stage's response from the first model on its route that answers in time and within quota."""
+    gateway = get_gateway()
+    for model_name, kwargs, last in _attempts(stage):
+        start = time.perf_counter()
+        try:
+            response = gateway.generate(model_name, prompt, generation_config, **kwargs)
+        except Exception as e:
+            _record(stage, model_name, start, e)
+            if last or not isinstance(e, fallback_errors()):
+                raise
+            telemetry.count("fallbacks")
+            continue
+        _record(stage, model_name, start)
+        telemetry.annotate(model=model_name)
+        return response
+
+
+def stream(stage: str, prompt: str, generation_config: dict | None = None):
+    """
+    Streamed chunks of the stage's response. The route only moves on to the next model before the
+    first chunk arrives; a stream cut off later raises, as the gateway does.
+    """
+    gateway = get_gateway()
+    for model_name, kwargs, last in _attempts(stage):
+        start = time.perf_counter()
+        started = False
+        try:
+            for chunk in gateway.stream(model_name, prompt, generation_config, **kwargs):
+                if not started:
+                    started = True
+                    telemetry.annotate(model=model_name)
+                yield chunk
+        except Exception as e:
+            _record(stage, model_name, start, e)
+            if started or last or not isinstance(e, fallback_errors()):
+                raise
+            telemetry.count("fallbacks")
+            continue
+        _record(stage, model_name, start)
+        return
@@ -0,0 +1,182 @@
+# pipeline.py
+"""
+The analysis as a small DAG of stages:
+
+    role ─────────┬→ market ──────────────────────────────┐
+                  └→ demand                               │
+    github_user ──→ github_repos ──→ repo_skills ──┐      ├─→ report
+    resume_text ──→ resume_skills ─────────────────┴─→ skills
+
+Each stage result is memoized in a process-wide, content-addressed store under a hash of the
+values it actually reads (upstream results included). Editing one input therefore only recomputes
+the stages downstream of it, and an identical resubmission returns without running anything.
+The store is shared by every session, so a rerun or "Reset" doesn't throw finished work away.
+
+The live demand table shown next to the market overview is a separate stage (DEMAND) run on its
+own through run_stage, so the analysis never waits for the job boards.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass
+from typing import Callable
+import telemetry
+from github_client import REPO_CACHE_TTL_SECONDS
+from llm_cache import STAGE_TTLS
+from career_ai import (
+    DEMAND_REFRESH_SECONDS,
+    DEMAND_RETRY_SECONDS,
+    compare_skills_and_suggest_projects,
+    extract_skills_from_resume,
+    fetch_github_profile,
+    get_demand_table,
+    get_job_market_context,
+    infer_skills_from_profile,
+    merge_skills,
+)
+
+# Stage results remembered per process; the least recently used are dropped first
+MEMO_SIZE = int(os.getenv("CAREERIFY_PIPELINE_MEMO_SIZE", "512"))
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    fn: Callable
+    inputs: tuple[str, ...]
+    # Seconds a result stays valid, for stages that read live data; None means it never expires
+    ttl: float | None = None
+    # Whether a result is worth remembering; empty ones (a failed fetch, a blank answer) are retried next time
+    complete: Callable[[object], bool] = bool
+    # Seconds an empty result is remembered anyway, for stages whose retries are costly; None retries at once
+    empty_ttl: float | None = None
+
+
+def _resume_skills(resume_text: str) -> str:
+    return extract_skills_from_resume(resume_text) if resume_text else ""
+
+def _github_repos(username: str) -> list[dict]:
+    return fetch_github_profile(username) if username else []
+
+def _repo_skills(repos: list[dict]) -> str:
+    return infer_skills_from_profile(repos) if repos else ""
+
+def _report(skills: str, role: str, market: str):
+    # Nothing to compare: the caller reports the missing skills instead of spending a Gemini call
+    return compare_skills_and_suggest_projects(skills, role, market) if skills else None
+
+def _has_rows(demand: tuple) -> bool:
+    return bool(demand[0])
+
+def _has_projects(report) -> bool:
+    # A report whose project list failed to decode has none
+    return report is not None and bool(report.projects)
+
+
+# Roots first, then dependents, each after everything it reads (see submit)
+INPUTS = ("role", "github_user", "resume_text")
+STAGES = (
+    Stage("market", get_job_market_context, ("role",), ttl=STAGE_TTLS["market_context"]),
+    Stage("github_repos", _github_repos, ("github_user",), ttl=REPO_CACHE_TTL_SECONDS),
+    Stage("resume_skills", _resume_skills, ("resume_text",)),
+    Stage("repo_skills", _repo_skills, ("github_repos",)),
+    Stage("skills", merge_skills, ("resume_skills", "repo_skills")),
+    Stage("report", _report, ("skills", "role", "market"), complete=_has_projects),
+)
+# A role without postings (or a blocked board) is only looked up again after the feeds' retry interval
+DEMAND = Stage("demand", get_demand_table, ("role",), ttl=DEMAND_REFRESH_SECONDS, complete=_has_rows,
+               empty_ttl=DEMAND_RETRY_SECONDS)
+
+
+class MemoStore:
+    """Bounded LRU of stage results by content key, with per-entry expiry."""
+
+    def __init__(self, max_entries: int = MEMO_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[object, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value, ttl: float | None = None) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.time() + ttl if ttl is not None else None)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> MemoStore:
+    """One stage-result store per process, shared by every session."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MemoStore()
+        return _store
+
+
+def stage_key(stage: Stage, values: list) -> str:
+    payload = json.dumps([stage.name, values], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _run_stage(store: MemoStore, stage: Stage, args: list):
+    values = [arg.result() if isinstance(arg, Future) else arg for arg in args]
+    key = stage_key(stage, values)
+    with telemetry.span(f"pipeline.{stage.name}") as s:
+        value = store.get(key)
+        if value is not _MISSING:
+            s.set(cache="hit")
+            return value
+        s.set(cache="miss")
+        value = stage.fn(*values)
+    # Empty results (a failed fetch, a blank answer) are retried next time rather than remembered
+    if stage.complete(value):
+        store.set(key, value, stage.ttl)
+    elif stage.empty_ttl is not None:
+        store.set(key, value, stage.empty_ttl)
+    return value
+
+
+def run_stage(stage: Stage, inputs: dict):
+    """Run a stage that only reads pipeline inputs on its own, through the same store."""
+    return _run_stage(get_store(), stage, [inputs.get(name) for name in stage.inputs])
+
+
+def submit(inputs: dict, executor: Executor) -> dict[str, Future]:
+    """
+    Schedule every stage on executor and return a future per stage name.
+    Stages are submitted in dependency order and each waits on its upstream futures; a FIFO executor
+    has always started a stage's upstream before the stage itself, so the waits cannot deadlock.
+    A failed stage fails every stage downstream of it with the same exception.
+    """
+    store = get_store()
+    futures: dict[str, Future] = {}
+    for stage in STAGES:
+        args = [futures[name] if name in futures else inputs.get(name) for name in stage.inputs]
+        futures[stage.name] = executor.submit(telemetry.bind(_run_stage), store, stage, args)
+    return futures
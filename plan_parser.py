@@ -0,0 +1,169 @@
+# plan_parser.py
+import re
+import json
+import time
+import threading
+from typing import Iterable
+import telemetry
+
+# Matches "Day 3: task" as well as the bold "**Day 3:** task" variant the prompt asks for
+DAY_PATTERN = re.compile(r"Day (\d+):\**\s*(.+)")
+# Characters that change the string / object nesting of a structured (JSON) plan
+JSON_TOKEN_PATTERN = re.compile(r'[{}"\\]')
+# Daily plans are generated one week per request
+DAYS_PER_WEEK = 7
+
+
+class DayParser:
+    """
+    Incremental daily-plan parser.
+    Text can be fed in arbitrary chunks. In the default mode each "Day N: task" line is parsed as soon
+    as it is complete; in structured mode each {"day", "task"} JSON object is decoded as soon as it closes,
+    so a truncated JSON document still yields every finished day.
+    """
+
+    def __init__(self, structured: bool = False):
+        self.structured = structured
+        self._buffer = ""
+        self.days: list[tuple[int, str]] = []
+        # Structured mode: scan position in the buffer, whether it is inside a string, open object starts
+        self._scan = 0
+        self._in_string = False
+        self._open: list[int] = []
+
+    def feed(self, chunk: str) -> list[tuple[int, str]]:
+        """Add a chunk of text and return the days completed by it."""
+        self._buffer += chunk
+        if self.structured:
+            return self._parse_objects()
+        *lines, self._buffer = self._buffer.split("\n")
+        return self._parse_lines(lines)
+
+    def close(self) -> list[tuple[int, str]]:
+        """Flush the trailing partial line (end of stream or a cut-off response)."""
+        if self.structured:
+            self._buffer, self._scan, self._in_string, self._open = "", 0, False, []
+            return []
+        lines, self._buffer = [self._buffer], ""
+        return self._parse_lines(lines)
+
+    def _parse_objects(self) -> list[tuple[int, str]]:
+        # Track strings and object nesting across chunks, so braces inside a task never end an object early
+        found, buffer, pos = [], self._buffer, self._scan
+        while m := JSON_TOKEN_PATTERN.search(buffer, pos):
+            i, char = m.start(), m.group()
+            pos = i + 1
+            if self._in_string:
+                if char == "\\":
+                    if pos == len(buffer):
+                        pos = i  # the escaped character is in the next chunk
+                        break
+                    pos += 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._open.append(i)
+            elif char == "}" and self._open:
+                day = self._decode_day(buffer[self._open.pop():pos])
+                if day:
+                    found.append(day)
+        if self._open:
+            self._scan = pos
+        else:
+            self._buffer, self._scan = buffer[pos:], 0
+        self.days.extend(found)
+        return found
+
+    @staticmethod
+    def _decode_day(text: str) -> tuple[int, str] | None:
+        try:
+            item = json.loads(text)
+            day, task = int(item["day"]), str(item["task"]).strip()
+        except (ValueError, KeyError, TypeError):
+            return None
+        return (day, task) if task else None
+
+    def _parse_lines(self, lines: list[str]) -> list[tuple[int, str]]:
+        found = []
+        for line in lines:
+            m = DAY_PATTERN.search(line)
+            if not m:
+                continue
+            task = m.group(2).strip().strip("*").strip()
+            if task:
+                found.append((int(m.group(1)), task))
+        self.days.extend(found)
+        return found
+
+
+def parse_days(text: str, structured: bool = False) -> list[tuple[int, str]]:
+    """Parse every Day entry from a complete plan."""
+    parser = DayParser(structured)
+    parser.feed(text or "")
+    parser.close()
+    return parser.days
+
+
+def week_days(week: int, days: list[tuple[int, str]]) -> list[tuple[int, str]]:
+    """Renumber a week chunk's days (1-7, or plan-wide numbers if the model used those) within the whole plan."""
+    offset = (week - 1) * DAYS_PER_WEEK
+    return [(offset + (day - 1) % DAYS_PER_WEEK + 1, task) for day, task in days[:DAYS_PER_WEEK]]
+
+
+def format_plan_markdown(days: list[tuple[int, str]]) -> str:
+    """Render parsed days the way the planner shows them."""
+    return "\n\n".join(f"**Day {day}:** {task}" for day, task in days)
+
+
+class PlanStream:
+    """
+    A daily plan being streamed by a worker thread.
+    The worker calls consume(); the Streamlit script thread polls snapshot() to render progress.
+    """
+
+    def __init__(self, text: str | None = None, structured: bool = False):
+        self._lock = threading.Lock()
+        self._parser = DayParser(structured)
+        self._chunks: list[str] = []
+        self.done = False
+        self.error: Exception | None = None
+        # Time spent in the Day parser, reported once the stream finishes
+        self.parse_seconds = 0.0
+        if text is not None:
+            # An already generated plan: parse it in one go
+            self.feed(text)
+            self.finish()
+
+    def feed(self, chunk: str) -> None:
+        with self._lock:
+            self._chunks.append(chunk)
+            start = time.perf_counter()
+            self._parser.feed(chunk)
+            self.parse_seconds += time.perf_counter() - start
+
+    def finish(self, error: Exception | None = None) -> None:
+        with self._lock:
+            start = time.perf_counter()
+            self._parser.close()
+            self.parse_seconds += time.perf_counter() - start
+            self.error = error
+            self.done = True
+            days = len(self._parser.days)
+        telemetry.record_stage("plan_parse", self.parse_seconds, days=days)
+
+    def consume(self, chunks: Iterable[str]) -> None:
+        """Drain a chunk iterator; days parsed before a failure are kept."""
+        try:
+            for chunk in chunks:
+                self.feed(chunk)
+        except Exception as e:
+            self.finish(e)
+        else:
+            self.finish()
+
+    def snapshot(self) -> tuple[str, list[tuple[int, str]]]:
+        """Return the text and parsed days received so far."""
+        with self._lock:
+            return "".join(self._chunks), list(self._parser.days)
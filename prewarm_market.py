@@ -0,0 +1,62 @@
+# prewarm_market.py
+"""
+Pre-build market-context answers for the most popular canonical roles.
+
+    python prewarm_market.py --top 25
+
+The results are written to the local market index (data/market_index.json by default),
+so requests for those roles are answered without an LLM call on the hot path.
+"""
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import gemini_gateway
+from config import GEMINI_KEY
+from career_ai import build_market_context_prompt, generate_text
+from model_routing import primary_model
+from roles import MARKET_INDEX_PATH, MarketIndex, top_roles
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-warm the market-context index for popular roles.")
+    parser.add_argument("--top", type=int, default=25, help="number of canonical roles to build")
+    parser.add_argument("--index", default=MARKET_INDEX_PATH, help="path of the index file")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent Gemini requests")
+    parser.add_argument("--refresh", action="store_true", help="rebuild roles that are already indexed")
+    args = parser.parse_args()
+
+    if not GEMINI_KEY:
+        raise SystemExit("GEMINI_API_KEY not found. Set it in the environment or a .env file.")
+    gemini_gateway.configure(GEMINI_KEY)
+
+    index = MarketIndex(args.index)
+    roles = [r for r in top_roles(args.top) if args.refresh or not index.get(r)]
+    print(f"Building market context for {len(roles)} role(s)...")
+
+    def build(role: str) -> str:
+        # A refresh asks the model again instead of replaying the response cache
+        return generate_text("market_context", build_market_context_prompt(role), refresh=args.refresh)
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {executor.submit(build, role): role for role in roles}
+        for future in as_completed(futures):
+            role = futures[future]
+            try:
+                market_data = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"  ✗ {role} ({e})")
+                continue
+            if market_data:
+                index.put(role, market_data, primary_model("market_context"))
+                index.save()
+                print(f"  ✓ {role}")
+            else:
+                failed += 1
+                print(f"  ✗ {role} (empty response)")
+
+    print(f"Index written to {args.index}" + (f"; {failed} role(s) failed" if failed else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# resume_parser.py
+import io
+import os
+import time
+import hashlib
+import threading
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+import telemetry
+
+PDF_TYPE = "application/pdf"
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+TXT_TYPE = "text/plain"
+
+# Resumes longer than this are almost always scans or attachments; the first pages carry the skills
+MAX_PAGES = int(os.getenv("CAREERIFY_RESUME_MAX_PAGES", "30"))
+# Wall-clock budget for one document; whatever was extracted by then is returned
+EXTRACT_TIMEOUT_SECONDS = float(os.getenv("CAREERIFY_RESUME_TIMEOUT", "20"))
+# PDFs with at least this many pages are split across a process pool
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("CAREERIFY_RESUME_PARALLEL_PAGES", "16"))
+PDF_WORKERS = max(1, int(os.getenv("CAREERIFY_RESUME_WORKERS", str(min(4, os.cpu_count() or 1)))))
+# Number of extracted documents remembered by content hash
+TEXT_CACHE_SIZE = 128
+
+
+class ResumeParseError(Exception):
+    """Raised when a resume can't be read; the message is safe to show to the user."""
+
+
+def _pdf_page_range_text(data: bytes, start: int, stop: int) -> list[str]:
+    """Extract pages [start, stop) of a PDF; runs inside pool workers, so it re-opens the document."""
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Forking a process that runs Streamlit's and the task queue's threads can copy a held lock
+            # into the child and deadlock it; spawned workers start clean and only import this module
+            _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def read_pdf(data: bytes, max_pages: int = MAX_PAGES, timeout: float = EXTRACT_TIMEOUT_SECONDS) -> tuple[str, bool]:
+    """
+    Text of a PDF, reading at most max_pages pages within timeout seconds, and whether it is
+    complete: False when pages were left out for either limit.
+    """
+    import PyPDF2
+    deadline = time.monotonic() + timeout
+    try:
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        page_count = min(len(reader.pages), max_pages)
+        complete = page_count == len(reader.pages)
+    except Exception as e:
+        raise ResumeParseError(f"Error reading PDF: {e}") from e
+
+    pages = []
+    if page_count >= PARALLEL_PAGE_THRESHOLD and PDF_WORKERS > 1:
+        # Fan contiguous page ranges out to worker processes; keep results in page order
+        step = -(-page_count // PDF_WORKERS)
+        pool = _get_pool()
+        futures = [
+            pool.submit(_pdf_page_range_text, data, start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        for future in futures:
+            try:
+                pages.extend(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeout:
+                complete = False
+                break
+            except Exception as e:
+                raise ResumeParseError(f"Error reading PDF: {e}") from e
+        # cancel() only drops ranges that haven't started; running ones keep their worker busy until
+        # they finish, so the page ranges abandoned that way are counted on the current span
+        running = sum(1 for future in futures if not future.done() and not future.cancel())
+        if running:
+            telemetry.count("abandoned_page_ranges", running)
+    else:
+        try:
+            for i in range(page_count):
+                if time.monotonic() > deadline:
+                    complete = False
+                    break
+                pages.append(reader.pages[i].extract_text() or "")
+        except Exception as e:
+            raise ResumeParseError(f"Error reading PDF: {e}") from e
+
+    return "\n".join(pages).strip(), complete
+
+
+def extract_text_from_pdf(data: bytes, max_pages: int = MAX_PAGES, timeout: float = EXTRACT_TIMEOUT_SECONDS) -> str:
+    """Extract text from a PDF, reading at most max_pages pages within timeout seconds."""
+    return read_pdf(data, max_pages, timeout)[0]
+
+
+def extract_text_from_docx(data: bytes) -> str:
+    """Extract text from a DOCX file."""
+    from docx import Document
+    try:
+        doc = Document(io.BytesIO(data))
+        return "\n".join(para.text for para in doc.paragraphs).strip()
+    except Exception as e:
+        raise ResumeParseError(f"Error reading DOCX: {e}") from e
+
+
+def extract_text_from_txt(data: bytes) -> str:
+    """Extract text from a UTF-8 text file."""
+    try:
+        return data.decode("utf-8").strip()
+    except Exception as e:
+        raise ResumeParseError(f"Error reading TXT: {e}") from e
+
+
+# MIME type -> extractor returning (text, whether it is complete)
+_EXTRACTORS = {
+    PDF_TYPE: read_pdf,
+    DOCX_TYPE: lambda data: (extract_text_from_docx(data), True),
+    TXT_TYPE: lambda data: (extract_text_from_txt(data), True),
+}
+
+_text_cache: OrderedDict[str, str] = OrderedDict()
+_text_cache_lock = threading.Lock()
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def extract_resume_text(data: bytes, file_type: str) -> str:
+    """
+    Extract text from resume bytes of the given MIME type.
+    Complete results are memoized by content hash, so re-analyzing the same upload doesn't re-parse
+    it; a PDF cut short by the page cap or the timeout is parsed again next time.
+    """
+    extractor = _EXTRACTORS.get(file_type)
+    if extractor is None:
+        raise ResumeParseError("Unsupported file format. Please upload PDF, DOCX, or TXT.")
+
+    key = f"{file_type}:{content_hash(data)}"
+    with _text_cache_lock:
+        if key in _text_cache:
+            _text_cache.move_to_end(key)
+            return _text_cache[key]
+
+    text, complete = extractor(data)
+    if complete:
+        with _text_cache_lock:
+            _text_cache[key] = text
+            while len(_text_cache) > TEXT_CACHE_SIZE:
+                _text_cache.popitem(last=False)
+    return text
@@ -0,0 +1,177 @@
+# roles.py
+import os
+import re
+import json
+import time
+import difflib
+import threading
+
+MARKET_INDEX_PATH = os.getenv("CAREERIFY_MARKET_INDEX_PATH", os.path.join("data", "market_index.json"))
+MARKET_INDEX_MAX_AGE_DAYS = float(os.getenv("CAREERIFY_MARKET_INDEX_MAX_AGE_DAYS", "30"))
+
+# Canonical roles in rough order of popularity, each with the aliases users actually type.
+# The order matters: the pre-warm job builds the index for the first N roles.
+CANONICAL_ROLES = {
+    "Software Engineer": ["software developer", "swe", "sde", "software dev", "programmer", "software engineering"],
+    "Data Scientist": ["data science", "ds", "data scientist ml"],
+    "Data Analyst": ["data analytics", "analytics analyst", "bi analyst", "business intelligence analyst"],
+    "Machine Learning Engineer": ["ml engineer", "mle", "machine learning developer", "ai ml engineer"],
+    "Full Stack Developer": ["full stack engineer", "fullstack developer", "fullstack engineer", "full stack web developer"],
+    "Frontend Developer": ["front end developer", "frontend engineer", "front end engineer", "ui developer", "react developer"],
+    "Backend Developer": ["back end developer", "backend engineer", "back end engineer", "server side developer"],
+    "DevOps Engineer": ["devops", "site reliability engineer", "sre", "platform engineer", "build and release engineer"],
+    "Cloud Engineer": ["cloud architect", "aws engineer", "azure engineer", "gcp engineer", "cloud developer"],
+    "Data Engineer": ["big data engineer", "etl developer", "data platform engineer", "analytics engineer"],
+    "AI Engineer": ["artificial intelligence engineer", "generative ai engineer", "llm engineer", "genai engineer"],
+    "Product Manager": ["pm", "product owner", "technical product manager", "tpm"],
+    "Cybersecurity Analyst": ["security analyst", "information security analyst", "soc analyst", "cyber security analyst"],
+    "Security Engineer": ["application security engineer", "appsec engineer", "cybersecurity engineer", "infosec engineer"],
+    "Mobile Developer": ["mobile engineer", "app developer", "mobile app developer"],
+    "iOS Developer": ["ios engineer"],
+    "Android Developer": ["android engineer", "kotlin developer"],
+    "QA Engineer": ["quality assurance engineer", "test engineer", "sdet", "software tester", "automation tester", "qa analyst"],
+    "UX Designer": ["ui ux designer", "ux ui designer", "product designer", "user experience designer", "ui designer"],
+    "Business Analyst": ["ba", "business systems analyst", "it business analyst"],
+    "Database Administrator": ["dba", "database engineer", "sql dba"],
+    "Systems Administrator": ["sysadmin", "system administrator", "linux administrator", "it administrator"],
+    "Network Engineer": ["network administrator", "network architect"],
+    "Solutions Architect": ["solution architect", "software architect", "technical architect", "enterprise architect"],
+    "Research Scientist": ["ai research scientist", "ml research scientist", "applied scientist", "research engineer"],
+    "Computer Vision Engineer": ["cv engineer", "vision engineer", "image processing engineer"],
+    "NLP Engineer": ["natural language processing engineer", "nlp scientist", "computational linguist"],
+    "MLOps Engineer": ["ml ops engineer", "machine learning operations engineer", "ml platform engineer"],
+    "Embedded Systems Engineer": ["embedded engineer", "firmware engineer", "embedded software engineer"],
+    "Game Developer": ["game programmer", "unity developer", "unreal developer", "gameplay engineer"],
+    "Blockchain Developer": ["web3 developer", "smart contract developer", "solidity developer"],
+    "Technical Writer": ["documentation engineer", "api writer"],
+    "IT Support Specialist": ["help desk technician", "it support", "desktop support", "technical support specialist"],
+    "Data Architect": ["data modeler", "data warehouse architect"],
+    "Engineering Manager": ["software engineering manager", "development manager", "dev manager"],
+    "Quantitative Analyst": ["quant", "quant analyst", "quantitative researcher", "quant developer"],
+    "Salesforce Developer": ["salesforce engineer", "sfdc developer", "salesforce administrator"],
+    "Web Developer": ["web engineer", "website developer", "wordpress developer"],
+    "Scrum Master": ["agile coach", "agile project manager"],
+    "Project Manager": ["it project manager", "technical project manager"],
+}
+
+# Abbreviations expanded token by token before lookup ("Machine Learning Eng." -> "machine learning engineer")
+_ABBREVIATIONS = {
+    "eng": "engineer", "engr": "engineer", "engg": "engineer", "dev": "developer", "devs": "developer",
+    "mgr": "manager", "admin": "administrator", "sci": "scientist", "analyt": "analyst",
+}
+
+# Seniority and filler words don't change the market for a role
+_IGNORED_TOKENS = {
+    "senior", "sr", "junior", "jr", "lead", "staff", "principal", "associate", "entry", "level",
+    "intern", "internship", "i", "ii", "iii", "iv", "remote", "mid", "experienced",
+}
+
+# Similarity needed for a fuzzy alias match (difflib ratio)
+FUZZY_CUTOFF = 0.85
+# Words most titles end in; a fuzzy match must also agree, word by word, on the words that aren't these
+# ("Go Developer" is not "iOS Developer", ".NET Developer" is not "ETL Developer")
+_GENERIC_TOKENS = {
+    "developer", "engineer", "manager", "analyst", "scientist", "administrator", "architect",
+    "designer", "specialist", "technician", "programmer", "tester", "writer", "owner", "consultant",
+}
+# Similarity each of those words needs to its counterpart (tolerates typos such as "lerning")
+FUZZY_TOKEN_CUTOFF = 0.8
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip punctuation, expand abbreviations and drop seniority words."""
+    text = (title or "").lower().replace("&", " and ").replace("/", " ").replace("-", " ")
+    text = re.sub(r"[^a-z0-9+# ]+", " ", text)
+    tokens = [_ABBREVIATIONS.get(t, t) for t in text.split()]
+    return " ".join(t for t in tokens if t not in _IGNORED_TOKENS)
+
+
+def _build_alias_table() -> dict[str, str]:
+    table = {}
+    for role, aliases in CANONICAL_ROLES.items():
+        for alias in [role, *aliases]:
+            table.setdefault(normalize_title(alias), role)
+    return table
+
+
+ALIAS_TABLE = _build_alias_table()
+
+
+def _heads_match(key: str, alias: str) -> bool:
+    """Whether two normalized titles have the same non-generic words, allowing a typo per word."""
+    heads = [t for t in key.split() if t not in _GENERIC_TOKENS]
+    alias_heads = [t for t in alias.split() if t not in _GENERIC_TOKENS]
+    return len(heads) == len(alias_heads) and all(
+        difflib.SequenceMatcher(None, a, b).ratio() >= FUZZY_TOKEN_CUTOFF for a, b in zip(heads, alias_heads)
+    )
+
+
+def canonicalize_role(title: str) -> str:
+    """
+    Map a free-form job title to its canonical role.
+    Tries an exact alias match, then a fuzzy match that must agree on the role's distinctive words;
+    unknown titles come back cleaned up but unchanged.
+    """
+    key = normalize_title(title)
+    if not key:
+        return (title or "").strip()
+    if key in ALIAS_TABLE:
+        return ALIAS_TABLE[key]
+    for alias in difflib.get_close_matches(key, list(ALIAS_TABLE), n=5, cutoff=FUZZY_CUTOFF):
+        if _heads_match(key, alias):
+            return ALIAS_TABLE[alias]
+    return " ".join(w if w.isupper() else w.capitalize() for w in (title or "").split())
+
+
+def top_roles(n: int) -> list[str]:
+    """The N most requested canonical roles."""
+    return list(CANONICAL_ROLES)[:n]
+
+
+class MarketIndex:
+    """
+    Local JSON index of pre-generated market-context answers, keyed by canonical role.
+    Entries older than max_age_days are ignored so stale markets fall back to a live call.
+    """
+
+    def __init__(self, path: str = MARKET_INDEX_PATH, max_age_days: float = MARKET_INDEX_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age_days = max_age_days
+        self.entries = {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("roles", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, role: str) -> str | None:
+        entry = self.entries.get(role)
+        if not entry:
+            return None
+        if time.time() - entry.get("generated_at", 0) > self.max_age_days * 86400:
+            return None
+        return entry.get("market_data") or None
+
+    def put(self, role: str, market_data: str, model_name: str) -> None:
+        self.entries[role] = {"market_data": market_data, "model": model_name, "generated_at": time.time()}
+
+    def save(self) -> None:
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"roles": self.entries}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+_market_index = None
+_market_index_lock = threading.Lock()
+
+
+def get_market_index() -> MarketIndex:
+    """The process-wide market index, loaded once."""
+    global _market_index
+    with _market_index_lock:
+        if _market_index is None:
+            _market_index = MarketIndex()
+        return _market_index
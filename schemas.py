@@ -0,0 +1,146 @@
+# schemas.py
+"""
+Typed records for structured Gemini output, and the JSON response schemas that produce them.
+"""
+import json
+from dataclasses import dataclass, field
+
+# ──────────────────────────────────────────────────────────────
+# Response Schemas (Gemini response_schema, OpenAPI subset)
+# ──────────────────────────────────────────────────────────────
+_PROJECT = {
+    "type": "object",
+    "properties": {
+        "title": {"type": "string"},
+        "description": {"type": "string"},
+        "skill": {"type": "string"},
+    },
+    "required": ["title", "description", "skill"],
+}
+
+PROJECTS_SCHEMA = {
+    "type": "object",
+    "properties": {"projects": {"type": "array", "items": _PROJECT}},
+    "required": ["projects"],
+}
+
+REPORT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "matched_skills": {"type": "array", "items": {"type": "string"}},
+        "missing_skills": {"type": "array", "items": {"type": "string"}},
+        "projects": {"type": "array", "items": _PROJECT},
+    },
+    "required": ["matched_skills", "missing_skills", "projects"],
+}
+
+DAILY_PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "days": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"day": {"type": "integer"}, "task": {"type": "string"}},
+                "required": ["day", "task"],
+            },
+        }
+    },
+    "required": ["days"],
+}
+
+PLAN_OUTLINE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "weeks": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {"week": {"type": "integer"}, "focus": {"type": "string"}},
+                "required": ["week", "focus"],
+            },
+        }
+    },
+    "required": ["weeks"],
+}
+
+
+# ──────────────────────────────────────────────────────────────
+# Records
+# ──────────────────────────────────────────────────────────────
+@dataclass
+class ProjectSuggestion:
+    title: str
+    description: str = ""
+    skill: str = ""
+
+    def to_markdown(self) -> str:
+        line = self.title
+        if self.description:
+            line += f" — {self.description}"
+        if self.skill:
+            line += f" ({self.skill})"
+        return line
+
+
+@dataclass
+class SkillReport:
+    matched: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    projects: list[ProjectSuggestion] = field(default_factory=list)
+
+    def to_markdown(self) -> str:
+        """The three-section layout the UI has always displayed."""
+        def bullets(items: list[str]) -> str:
+            return "\n".join(f"- {item}" for item in items) if items else "- None identified"
+
+        projects = "\n".join(f"{i}. {p.to_markdown()}" for i, p in enumerate(self.projects, 1))
+        return (
+            f"### Matched Skills\n{bullets(self.matched)}\n\n"
+            f"### Missing Skills\n{bullets(self.missing)}\n\n"
+            f"### Suggested Projects\n{projects or '- None suggested'}"
+        )
+
+
+def _load(text: str) -> dict:
+    try:
+        data = json.loads(text or "")
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def decode_projects(text: str) -> list[ProjectSuggestion]:
+    """Project records from a PROJECTS_SCHEMA (or REPORT_SCHEMA) response; malformed items are skipped."""
+    projects = []
+    for item in _load(text).get("projects") or []:
+        if isinstance(item, dict) and str(item.get("title") or "").strip():
+            projects.append(ProjectSuggestion(
+                title=str(item["title"]).strip(),
+                description=str(item.get("description") or "").strip(),
+                skill=str(item.get("skill") or "").strip(),
+            ))
+    return projects
+
+
+def decode_report(text: str) -> SkillReport:
+    """SkillReport from a REPORT_SCHEMA response."""
+    data = _load(text)
+    return SkillReport(
+        matched=[str(s) for s in data.get("matched_skills") or [] if str(s).strip()],
+        missing=[str(s) for s in data.get("missing_skills") or [] if str(s).strip()],
+        projects=decode_projects(text),
+    )
+
+
+def decode_outline(text: str) -> list[str]:
+    """Weekly focus lines, in week order, from a PLAN_OUTLINE_SCHEMA response."""
+    weeks = []
+    for item in _load(text).get("weeks") or []:
+        if not isinstance(item, dict) or not str(item.get("focus") or "").strip():
+            continue
+        try:
+            weeks.append((int(item.get("week")), str(item["focus"]).strip()))
+        except (TypeError, ValueError):
+            continue
+    return [focus for _, focus in sorted(weeks)]
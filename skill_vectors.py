@@ -0,0 +1,109 @@
+# skill_vectors.py
+"""
+Local semantic skill matching, no network or model download.
+
+Skill strings are embedded as hashed character n-gram vectors (signed feature hashing into a
+fixed number of dimensions), L2-normalized into a NumPy matrix, and compared all at once with a
+single matrix multiply. A skill the user has is expanded with its taxonomy aliases and "related"
+phrases ("PyTorch" -> "deep learning frameworks", "Postgres" -> "sql databases"), so a related
+market requirement scores close to 1 while unrelated names stay well below the threshold.
+"""
+import os
+import zlib
+from functools import lru_cache
+import numpy as np
+from skills import get_taxonomy, normalize_skill
+
+# Hashed feature dimensions; a power of two so the bucket is a bit mask
+DIMENSIONS = 1024
+NGRAM_SIZES = (2, 3, 4)
+# Cosine similarity at which a user skill counts as covering a market skill
+SEMANTIC_THRESHOLD = float(os.getenv("CAREERIFY_SEMANTIC_THRESHOLD", "0.85"))
+
+
+@lru_cache(maxsize=65536)
+def _features(text: str) -> tuple[np.ndarray, np.ndarray]:
+    """Hashed n-gram buckets of a skill string and their signs (+1 / -1)."""
+    padded = f" {normalize_skill(text) or text.lower().strip()} "
+    hashes = np.fromiter(
+        (zlib.crc32(padded[i:i + n].encode("utf-8")) for n in NGRAM_SIZES for i in range(len(padded) - n + 1)),
+        dtype=np.uint32,
+    )
+    buckets = (hashes & (DIMENSIONS - 1)).astype(np.intp)
+    signs = np.where(hashes & 0x80000000, 1.0, -1.0).astype(np.float32)
+    return buckets, signs
+
+
+def embed(texts: list[str]) -> np.ndarray:
+    """(len(texts), DIMENSIONS) matrix of unit-length n-gram vectors (all-zero rows for blank strings)."""
+    if not texts:
+        return np.zeros((0, DIMENSIONS), dtype=np.float32)
+    features = [_features(text) for text in texts]
+    rows = np.repeat(np.arange(len(texts)), [len(b) for b, _ in features])
+    cells = rows * DIMENSIONS + np.concatenate([b for b, _ in features])
+    weights = np.concatenate([s for _, s in features])
+    matrix = np.bincount(cells, weights, minlength=len(texts) * DIMENSIONS).astype(np.float32)
+    matrix = matrix.reshape(len(texts), DIMENSIONS)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _layout(skills: list[str], related: bool) -> tuple[list[str], int, np.ndarray, np.ndarray]:
+    """
+    The distinct strings of one side, in embedding order: every distinct skill string, then each
+    taxonomy skill's name, aliases and (with related) related phrases as one contiguous block.
+    Also returns the number of skill strings, the start of each taxonomy block, and per skill the
+    "units" it is scored by: its own string plus its taxonomy skills (-1 padded).
+    """
+    taxonomy = get_taxonomy()
+    strings: dict[str, int] = {}
+    ids: dict[str, int] = {}
+    skill_units = []
+    for skill in skills:
+        skill_units.append([strings.setdefault(skill, len(strings))]
+                           + [ids.setdefault(skill_id, len(ids)) for skill_id in taxonomy.resolve(skill)])
+    texts, offsets = list(strings), []
+    for skill_id in ids:
+        offsets.append(len(texts))
+        entry = taxonomy.skills[skill_id]
+        texts += [entry["name"], *entry.get("aliases", []), *(entry.get("related", []) if related else [])]
+    units = np.full((len(skills), max(map(len, skill_units))), -1, dtype=np.intp)
+    for row, (own, *taxonomy_units) in enumerate(skill_units):
+        units[row, 0] = own
+        units[row, 1:1 + len(taxonomy_units)] = [len(strings) + unit for unit in taxonomy_units]
+    return texts, len(strings), np.array(offsets, dtype=np.intp), units
+
+
+def _collapse(scores: np.ndarray, n_strings: int, offsets: np.ndarray, units: np.ndarray) -> np.ndarray:
+    """Per-string score rows collapsed to one row per skill: the max over its string and taxonomy skills."""
+    unit_scores = scores[:n_strings]
+    if len(offsets):
+        unit_scores = np.vstack([unit_scores, np.maximum.reduceat(scores[n_strings:], offsets - n_strings, axis=0)])
+    collapsed = unit_scores[units[:, 0]]
+    for k in range(1, units.shape[1]):
+        rows = np.flatnonzero(units[:, k] >= 0)
+        collapsed[rows] = np.maximum(collapsed[rows], unit_scores[units[rows, k]])
+    return collapsed
+
+
+def similarity(user_skills: list[str], market_skills: list[str]) -> np.ndarray:
+    """
+    (len(user_skills), len(market_skills)) cosine similarities: the best match between a user skill
+    or any of its taxonomy names and related phrases, and a market skill or any of its taxonomy names.
+    """
+    if not user_skills or not market_skills:
+        return np.zeros((len(user_skills), len(market_skills)), dtype=np.float32)
+    user_texts, *user_layout = _layout(user_skills, related=True)
+    market_texts, *market_layout = _layout(market_skills, related=False)
+    # One multiply over distinct strings only; skills share most of their taxonomy expansions
+    scores = embed(user_texts) @ embed(market_texts).T
+    return _collapse(_collapse(scores, *user_layout).T, *market_layout).T
+
+
+def covered(user_skills: list[str], market_skills: list[str], threshold: float = SEMANTIC_THRESHOLD) -> list[str | None]:
+    """For each market skill, the user skill that best covers it at or above threshold, else None."""
+    scores = similarity(user_skills, market_skills)
+    if not scores.size:
+        return [None] * len(market_skills)
+    best = scores.argmax(axis=0)
+    return [user_skills[u] if scores[u, m] >= threshold else None for m, u in enumerate(best)]
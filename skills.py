@@ -0,0 +1,264 @@
+# skills.py
+import os
+import re
+import json
+import threading
+
+TAXONOMY_PATH = os.getenv(
+    "CAREERIFY_SKILLS_TAXONOMY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skills_taxonomy.json"),
+)
+
+# "llm" (Gemini only), "local" (taxonomy only, no network) or "hybrid" (taxonomy + Gemini for the leftovers)
+EXTRACTION_MODES = ("llm", "local", "hybrid")
+SKILL_EXTRACTION_MODE = os.getenv("CAREERIFY_SKILL_EXTRACTION", "llm").lower()
+if SKILL_EXTRACTION_MODE not in EXTRACTION_MODES:
+    SKILL_EXTRACTION_MODE = "llm"
+
+# Match skills a user skill implies ("PyTorch" covers "Deep Learning") with local n-gram vectors
+SEMANTIC_MATCH = os.getenv("CAREERIFY_SEMANTIC_MATCH", "1") == "1"
+
+# Tokens keep the characters that matter in skill names: "c++", "c#", ".net", "node.js";
+# a dot only continues a token when more token characters follow, so "Python." is just "Python"
+_TOKEN_RE = re.compile(r"\.?[A-Za-z0-9](?:[A-Za-z0-9+#]|\.(?=[A-Za-z0-9+#]))*")
+# Characters allowed next to a case-sensitive single-letter alias ("R", "C", "Go")
+_STRICT_BOUNDARY = set(" \t\n\r,;:.()[]|/")
+# Separators between requirement phrases in a Markdown market overview, and list numbering
+_PHRASE_SPLIT_RE = re.compile(r"[\n,;:()]|\band\b|\bor\b")
+_NUMBERING_RE = re.compile(r"^\d+[.)]\s*")
+
+
+def tokenize(text: str) -> list[tuple[str, int, int]]:
+    """Split text into (token, start, end); dashes and slashes separate tokens, trailing dots are dropped."""
+    return [(m.group(), m.start(), m.end()) for m in _TOKEN_RE.finditer(text or "")]
+
+
+def normalize_skill(name: str) -> str:
+    """Lowercased token form used for alias lookups ("Scikit-Learn" -> "scikit learn")."""
+    return " ".join(t.lower() for t, _, _ in tokenize(name))
+
+
+class SkillTaxonomy:
+    """
+    Bundled skills taxonomy compiled into a token trie.
+    extract() scans text in a single pass, taking the longest alias match at each position.
+    """
+
+    def __init__(self, path: str = TAXONOMY_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            entries = json.load(f)["skills"]
+        self.skills = {e["id"]: e for e in entries}
+        # Stable integer per skill: its bit in SkillSet masks
+        self.index = {e["id"]: i for i, e in enumerate(entries)}
+        self.ids_by_index = [e["id"] for e in entries]
+        self._trie: dict = {}
+        self._aliases: dict[str, str] = {}
+        self._strict: dict[str, str] = {}
+        for e in entries:
+            strict = e.get("strict_aliases", [])
+            for alias in [e["name"], *e.get("aliases", [])]:
+                # Names like "R" or "Go" are only matched case-sensitively, as strict aliases
+                if alias not in strict:
+                    self._insert(normalize_skill(alias), e["id"])
+                    self._aliases.setdefault(normalize_skill(alias), e["id"])
+            for alias in strict:
+                self._strict[alias] = e["id"]
+        # First tokens of every alias: only these positions can start a match
+        self._starters = set(self._trie)
+        self._strict_re = None
+        if self._strict:
+            alternatives = "|".join(re.escape(a) for a in sorted(self._strict, key=len, reverse=True))
+            self._strict_re = re.compile(rf"(?<![A-Za-z0-9+#.])(?:{alternatives})(?![A-Za-z0-9+#])")
+
+    def _insert(self, alias: str, skill_id: str) -> None:
+        if not alias:
+            return
+        node = self._trie
+        for token in alias.split(" "):
+            node = node.setdefault(token, {})
+        node.setdefault("$", skill_id)
+
+    def name(self, skill_id: str) -> str:
+        return self.skills[skill_id]["name"]
+
+    def scan(self, text: str) -> list[str]:
+        """Skill ID of every mention in text, in order (repeats included)."""
+        text = text or ""
+        lowered = _TOKEN_RE.findall(text.lower())
+        # Token positions are only needed to check case-sensitive aliases, which are rare
+        tokens = None
+        if self._strict_re and self._strict_re.search(text):
+            tokens = tokenize(text)
+            if len(tokens) != len(lowered):
+                # lower() changed the text length (some non-ASCII letters); tokenize it directly
+                lowered = [t.lower() for t, _, _ in tokens]
+        starters = self._starters if tokens is None else self._starters | {a.lower() for a in self._strict}
+        mentions = []
+        next_free = 0
+        for i in [i for i, w in enumerate(lowered) if w in starters]:
+            if i < next_free:
+                continue
+            node, match, match_end = self._trie, None, i
+            j = i
+            while j < len(lowered) and lowered[j] in node:
+                node = node[lowered[j]]
+                j += 1
+                if "$" in node:
+                    match, match_end = node["$"], j
+            if match is None and tokens is not None:
+                token, start, end = tokens[i]
+                if token in self._strict and self._strict_bounded(text, start, end):
+                    match, match_end = self._strict[token], i + 1
+            if match is not None:
+                mentions.append(match)
+                next_free = match_end
+        return mentions
+
+    def extract_ids(self, text: str) -> list[str]:
+        """Skill IDs mentioned in text, in order of first appearance."""
+        return list(dict.fromkeys(self.scan(text)))
+
+    @staticmethod
+    def _strict_bounded(text: str, start: int, end: int) -> bool:
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        return before in _STRICT_BOUNDARY and after in _STRICT_BOUNDARY
+
+    def extract(self, text: str) -> list[str]:
+        """Canonical skill names mentioned in text, in order of first appearance."""
+        return [self.name(skill_id) for skill_id in self.extract_ids(text)]
+
+    def resolve(self, name: str) -> list[str]:
+        """
+        Skill IDs for one skill string: an exact alias ("JS"), otherwise whatever the scanner finds in it
+        ("Javascript (ES6)" -> javascript, "HTML/CSS" -> html, css). Empty for skills outside the taxonomy.
+        """
+        name = name.strip()
+        if name in self._strict:
+            return [self._strict[name]]
+        skill_id = self._aliases.get(normalize_skill(name))
+        if skill_id:
+            return [skill_id]
+        return self.extract_ids(name)
+
+    def mask(self, skill_ids: list[str]) -> int:
+        mask = 0
+        for skill_id in skill_ids:
+            mask |= 1 << self.index[skill_id]
+        return mask
+
+    def skill_set(self, names: list[str]) -> "SkillSet":
+        """Canonical set of a list of skill strings; unknown skills are kept by normalized name."""
+        mask, custom = 0, {}
+        for name in names:
+            ids = self.resolve(name)
+            if ids:
+                mask |= self.mask(ids)
+            elif normalize_skill(name):
+                custom.setdefault(normalize_skill(name), name.strip())
+        return SkillSet(mask, custom)
+
+
+class SkillSet:
+    """A set of skills: a bitmask over taxonomy indices plus free-form skills keyed by normalized name."""
+
+    __slots__ = ("mask", "custom")
+
+    def __init__(self, mask: int = 0, custom: dict[str, str] | None = None):
+        self.mask = mask
+        self.custom = custom or {}
+
+    def __and__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.mask & other.mask, {k: v for k, v in self.custom.items() if k in other.custom})
+
+    def __or__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.mask | other.mask, {**other.custom, **self.custom})
+
+    def __sub__(self, other: "SkillSet") -> "SkillSet":
+        return SkillSet(self.mask & ~other.mask, {k: v for k, v in self.custom.items() if k not in other.custom})
+
+    def __len__(self) -> int:
+        return bin(self.mask).count("1") + len(self.custom)
+
+    def __contains__(self, skill_id: str) -> bool:
+        taxonomy = get_taxonomy()
+        return skill_id in taxonomy.index and bool(self.mask >> taxonomy.index[skill_id] & 1)
+
+
+def split_skills(skills_text: str) -> list[str]:
+    """Split a comma/line separated skill list, dropping bullets and blanks."""
+    parts = re.split(r"[,\n]", skills_text or "")
+    return [p.strip().lstrip("-*• ").strip() for p in parts if p.strip().lstrip("-*• ").strip()]
+
+
+def canonical_skills(skills_text: str) -> list[str]:
+    """
+    Deduplicate a skill list by canonical ID, keeping first-appearance order.
+    "JS", "JavaScript" and "Javascript (ES6)" all become "JavaScript"; unknown skills keep their spelling.
+    """
+    taxonomy = get_taxonomy()
+    seen, result = set(), []
+    for raw in split_skills(skills_text):
+        ids = taxonomy.resolve(raw)
+        entries = [(skill_id, taxonomy.name(skill_id)) for skill_id in ids] or [(normalize_skill(raw), raw)]
+        for key, name in entries:
+            if key and key not in seen:
+                seen.add(key)
+                result.append(name)
+    return result
+
+
+def market_phrases(market_text: str) -> list[str]:
+    """Short requirement phrases of a market overview that name no taxonomy skill ("relational databases")."""
+    taxonomy = get_taxonomy()
+    phrases = []
+    for part in _PHRASE_SPLIT_RE.split(market_text or ""):
+        phrase = part.strip().strip("*_#>`-•. ").strip()
+        phrase = _NUMBERING_RE.sub("", phrase)
+        if not phrase or len(phrase) > 40 or len(phrase.split()) > 4 or taxonomy.extract_ids(phrase):
+            continue
+        phrases.append(phrase)
+    return list(dict.fromkeys(phrases))
+
+
+def compute_skill_gap(skills_text: str, market_text: str) -> tuple[list[str], list[str]]:
+    """
+    Matched and missing skills for a role, from set operations over canonical skill IDs.
+    The market side is every taxonomy skill mentioned in the market overview, in the order it appears.
+    With semantic matching on, a missing skill a user skill implies ("Deep Learning" for "PyTorch")
+    counts as matched, as do generic requirement phrases a user skill covers ("SQL databases").
+    """
+    taxonomy = get_taxonomy()
+    user_skills = split_skills(skills_text)
+    have = taxonomy.skill_set(user_skills)
+    market_ids = taxonomy.extract_ids(market_text)
+    need = SkillSet(taxonomy.mask(market_ids))
+    matched, missing = need & have, need - have
+    matched_names = [taxonomy.name(i) for i in market_ids if i in matched]
+    missing_names = [taxonomy.name(i) for i in market_ids if i in missing]
+    if not SEMANTIC_MATCH or not user_skills:
+        return matched_names, missing_names
+
+    # Imported on use: NumPy adds noticeably to app startup
+    from skill_vectors import covered
+    phrases = market_phrases(market_text)
+    coverage = covered(user_skills, missing_names + phrases)
+    implied = {name for name, by in zip(missing_names, coverage) if by}
+    return (
+        [taxonomy.name(i) for i in market_ids if i in matched or taxonomy.name(i) in implied]
+        + [phrase for phrase, by in zip(phrases, coverage[len(missing_names):]) if by],
+        [name for name in missing_names if name not in implied],
+    )
+
+
+_taxonomy = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """The bundled taxonomy, compiled once per process."""
+    global _taxonomy
+    with _taxonomy_lock:
+        if _taxonomy is None:
+            _taxonomy = SkillTaxonomy()
+        return _taxonomy
@@ -0,0 +1,303 @@
+# task_queue.py
+"""
+Background tasks for the long-running work (analyses, daily-plan weeks), so a rerun, a widget
+change or a user navigating away doesn't interrupt Gemini calls that are already paid for.
+
+submit() returns a task ID straight away; a process-wide thread pool runs the task and records
+its status, progress and result in a SQLite table, which the UI polls (across reruns) to pick the
+result up. Parameters are handed to the worker in memory and only their digest is stored, so
+resume text never reaches the task table.
+
+Several processes (app servers, batch runs) may share the table. Each row records the process that
+owns it, and a queue only fails the unfinished tasks of owners that are no longer running.
+"""
+import os
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable
+import telemetry
+
+logger = logging.getLogger("careerify.tasks")
+
+TASKS_PATH = os.getenv("CAREERIFY_TASKS_PATH", os.path.join(".cache", "tasks.sqlite3"))
+# Tasks running at once across all sessions of this process (override per deployment)
+TASK_WORKERS = max(1, int(os.getenv("CAREERIFY_TASK_WORKERS", "4")))
+# Seconds finished tasks are kept for pickup before they are deleted
+TASK_RETENTION_SECONDS = float(os.getenv("CAREERIFY_TASK_RETENTION", "3600"))
+# Telemetry runs of recent tasks kept in memory for the debug panel
+MAX_TASK_RUNS = 200
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+FINISHED = (DONE, FAILED)
+
+# Owner of the tasks this process submits: its PID plus a per-start token, since a restarted
+# container often gets the same PID back
+OWNER = f"{os.getpid()}:{uuid.uuid4().hex[:12]}"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    owner TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_digest ON tasks(digest, status);
+CREATE INDEX IF NOT EXISTS tasks_finished ON tasks(finished_at);
+"""
+
+# kind -> handler(params, report_progress) returning a JSON-serializable result
+HANDLERS: dict[str, Callable[[dict, Callable[[dict], None]], object]] = {}
+
+
+def handler(kind: str):
+    """Register the function that runs tasks of this kind."""
+    def register(fn):
+        HANDLERS[kind] = fn
+        return fn
+    return register
+
+
+def _owner_alive(owner: str | None) -> bool:
+    """Whether the process that owns a task is still running (on this host)."""
+    pid, _, token = (owner or "").partition(":")
+    if not pid.isdigit():
+        return False
+    if int(pid) == os.getpid():
+        return owner == OWNER
+    if os.name == "nt":
+        # os.kill would terminate the process there rather than probe it
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def params_digest(kind: str, params: dict) -> str:
+    payload = json.dumps([kind, params], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TaskQueue:
+    """SQLite-backed task table plus the thread pool that works through it."""
+
+    def __init__(self, path: str = TASKS_PATH, workers: int = TASK_WORKERS):
+        self.path = path
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="careerify-task")
+        self._lock = threading.Lock()
+        self.runs: OrderedDict[str, telemetry.Run] = OrderedDict()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if "owner" not in {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}:
+                conn.execute("ALTER TABLE tasks ADD COLUMN owner TEXT")
+            # Parameters only ever lived in the memory of the owner; tasks of live owners are theirs to finish
+            unfinished = conn.execute(
+                "SELECT id, owner FROM tasks WHERE status IN (?, ?)", (QUEUED, RUNNING),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE tasks SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                [(FAILED, "Interrupted by a server restart", time.time(), task_id)
+                 for task_id, owner in unfinished if not _owner_alive(owner)],
+            )
+
+    @contextmanager
+    def _connect(self):
+        # A short-lived connection per call keeps the table safe to use from worker threads
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def submit(self, kind: str, params: dict) -> str:
+        """
+        Queue a task and return its ID. An identical task (same kind and parameters) that is
+        still queued or running in a live process is joined instead of started twice.
+        """
+        if kind not in HANDLERS:
+            raise KeyError(f"No handler for task kind '{kind}'")
+        digest = params_digest(kind, params)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, owner FROM tasks WHERE digest = ? AND status IN (?, ?) ORDER BY created_at DESC",
+                (digest, QUEUED, RUNNING),
+            ).fetchall()
+            for task_id, owner in rows:
+                if _owner_alive(owner):
+                    return task_id
+            task_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO tasks(id, kind, digest, status, created_at, owner) VALUES (?, ?, ?, ?, ?, ?)",
+                (task_id, kind, digest, QUEUED, now, OWNER),
+            )
+            conn.execute(
+                "DELETE FROM tasks WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (now - TASK_RETENTION_SECONDS,),
+            )
+        self._executor.submit(self._run, task_id, kind, params)
+        return task_id
+
+    def get(self, task_id: str) -> dict | None:
+        """Status, progress, result and error of a task, or None if it is unknown (or expired)."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT kind, status, progress, result, error, created_at, started_at, finished_at "
+                "FROM tasks WHERE id = ?", (task_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        kind, status, progress, result, error, created_at, started_at, finished_at = row
+        return {
+            "id": task_id,
+            "kind": kind,
+            "status": status,
+            "progress": json.loads(progress) if progress else {},
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "created_at": created_at,
+            "started_at": started_at,
+            "finished_at": finished_at,
+        }
+
+    def counts(self) -> dict:
+        """Tasks per status, for queue captions."""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall())
+
+    def _update(self, task_id: str, **columns) -> None:
+        assignments = ", ".join(f"{column} = ?" for column in columns)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE tasks SET {assignments} WHERE id = ?", (*columns.values(), task_id))
+
+    def _run(self, task_id: str, kind: str, params: dict) -> None:
+        self._update(task_id, status=RUNNING, started_at=time.time())
+        run = telemetry.start_run(kind)
+        with self._lock:
+            self.runs[task_id] = run
+            while len(self.runs) > MAX_TASK_RUNS:
+                self.runs.popitem(last=False)
+
+        def report(progress: dict) -> None:
+            self._update(task_id, progress=json.dumps(progress, default=str))
+
+        try:
+            result = HANDLERS[kind](params, report)
+        except Exception as e:
+            logger.warning("task %s (%s) failed: %s", task_id, kind, e)
+            self._update(task_id, status=FAILED, error=str(e) or type(e).__name__, finished_at=time.time())
+        else:
+            self._update(task_id, status=DONE, result=json.dumps(result, default=str), finished_at=time.time())
+        finally:
+            telemetry.end_run(run)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_task_queue() -> TaskQueue:
+    """The process-wide task queue, shared by every session."""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = TaskQueue()
+        return _queue
+
+
+# ──────────────────────────────────────────────────────────────
+# Task handlers
+# ──────────────────────────────────────────────────────────────
+# Concurrent stages within one analysis task: one per root stage (pipeline.INPUTS), so no root
+# queues behind another's network wait
+ANALYSIS_WORKERS = 3
+# Seconds between progress writes while a plan week streams in
+PLAN_PROGRESS_SECONDS = 0.25
+
+
+@handler("analysis")
+def run_analysis(params: dict, report: Callable[[dict], None]) -> dict:
+    """The analysis pipeline for {"role", "github_user", "resume_text"}, reporting finished stages."""
+    import pipeline
+    from github_client import language_shares
+
+    progress: dict = {"done": []}
+    with ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS) as executor:
+        futures = pipeline.submit(params, executor)
+        for stage in ("resume_skills", "github_repos", "repo_skills", "market", "skills", "report"):
+            value = futures[stage].result()
+            progress["done"].append(stage)
+            if stage == "github_repos":
+                progress["repos"] = len(value)
+            report(progress)
+
+    repos = futures["github_repos"].result()
+    skill_report = futures["report"].result()
+    return {
+        "resume_skills": futures["resume_skills"].result(),
+        "github_skills": futures["repo_skills"].result(),
+        "combined_skills": futures["skills"].result(),
+        "repos": len(repos),
+        "language_shares": language_shares(repos),
+        "market_data": futures["market"].result(),
+        "report": skill_report.to_markdown() if skill_report else "",
+        "project_titles": [p.title for p in skill_report.projects] if skill_report else [],
+    }
+
+
+@handler("demand")
+def run_demand(params: dict, report: Callable[[dict], None]) -> dict:
+    """The live in-demand skills table for {"role"}, submitted next to its analysis rather than inside it."""
+    import pipeline
+
+    rows, postings = pipeline.run_stage(pipeline.DEMAND, params)
+    return {"market_demand": rows, "demand_postings": postings}
+
+
+@handler("plan_week")
+def run_plan_week(params: dict, report: Callable[[dict], None]) -> str:
+    """
+    One week of a daily plan for {"project", "week", "role"}. The text and parsed days are reported
+    as they stream in; a stream cut off part way reports what it had before the task fails.
+    """
+    from career_ai import stream_week_plan
+    from plan_parser import PlanStream
+
+    stream, last_report = PlanStream(structured=True), 0.0
+    try:
+        for chunk in stream_week_plan(params["project"], params["week"], params["role"]):
+            stream.feed(chunk)
+            if time.monotonic() - last_report >= PLAN_PROGRESS_SECONDS:
+                text, days = stream.snapshot()
+                report({"text": text, "days": days})
+                last_report = time.monotonic()
+    except Exception as e:
+        stream.finish(e)
+        text, days = stream.snapshot()
+        report({"text": text, "days": days})
+        raise
+    stream.finish()
+    return stream.snapshot()[0]
@@ -0,0 +1,243 @@
+# telemetry.py
+"""
+Per-stage instrumentation: wall time, Gemini token usage, retries, quota waits and cache hits.
+Every finished stage is logged as one JSON line on the "careerify.telemetry" logger, aggregated into
+process-wide metrics written to a Prometheus text file, and added to the active Run (if any), which
+the app renders as a timing waterfall.
+"""
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+
+logger = logging.getLogger("careerify.telemetry")
+
+# Prometheus text-format file (for node_exporter's textfile collector or any scraper sidecar)
+METRICS_PATH = os.getenv("CAREERIFY_METRICS_PATH", os.path.join(".cache", "metrics.prom"))
+METRICS_WRITE_INTERVAL_SECONDS = 10.0
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Numeric span attributes exported as counters: attribute -> (metric, extra labels)
+_COUNTED_ATTRS = {
+    "prompt_tokens": ("careerify_gemini_tokens_total", (("kind", "prompt"),)),
+    "response_tokens": ("careerify_gemini_tokens_total", (("kind", "response"),)),
+    "retries": ("careerify_gemini_retries_total", ()),
+    "queue_wait": ("careerify_gemini_queue_wait_seconds_total", ()),
+    "fallbacks": ("careerify_model_fallbacks_total", ()),
+}
+
+
+class Span:
+    """One timed stage; attributes are filled in while it runs."""
+
+    __slots__ = ("stage", "start", "duration", "status", "attrs")
+
+    def __init__(self, stage: str, attrs: dict | None = None):
+        self.stage = stage
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.status = "ok"
+        self.attrs = attrs or {}
+
+    def add(self, key: str, amount: float = 1) -> None:
+        self.attrs[key] = self.attrs.get(key, 0) + amount
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+
+class Run:
+    """The spans of one user action (an analysis, a batch of daily plans), for the waterfall."""
+
+    def __init__(self, name: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.started = time.perf_counter()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+        self._token = None
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def waterfall(self) -> list[dict]:
+        """Spans as rows with start/end offsets in seconds from the start of the run."""
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return [{
+            "Stage": s.stage,
+            "Start (s)": round(s.start - self.started, 3),
+            "End (s)": round(s.start - self.started + s.duration, 3),
+            "Duration (s)": round(s.duration, 3),
+            "Status": s.status,
+            **{k: (round(v, 3) if isinstance(v, float) else v) for k, v in s.attrs.items()},
+        } for s in spans]
+
+
+class Metrics:
+    """Process-wide duration histograms and counters, rendered in Prometheus text format."""
+
+    def __init__(self, path: str = METRICS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        # (stage[, model]) labels -> [bucket counts..., +Inf count], sum
+        self._durations: dict[tuple, tuple[list[int], list[float]]] = {}
+        # (metric, sorted label pairs) -> value
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._last_write = 0.0
+
+    def _count(self, metric: str, labels: tuple, amount: float = 1) -> None:
+        key = (metric, labels)
+        self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, span: Span) -> None:
+        # Gemini calls are also labelled with the model that answered, for per-model latency and cost
+        stage = (("stage", span.stage),) + ((("model", span.attrs["model"]),) if span.attrs.get("model") else ())
+        with self._lock:
+            buckets, total = self._durations.setdefault(stage, ([0] * (len(DURATION_BUCKETS) + 1), [0.0]))
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if span.duration <= bound:
+                    buckets[i] += 1
+            buckets[-1] += 1
+            total[0] += span.duration
+            if span.status != "ok":
+                self._count("careerify_stage_errors_total", stage)
+            for attr, (metric, extra) in _COUNTED_ATTRS.items():
+                if span.attrs.get(attr):
+                    self._count(metric, stage + extra, span.attrs[attr])
+            if span.attrs.get("cache"):
+                self._count("careerify_cache_requests_total", stage + (("result", span.attrs["cache"]),))
+        self.write()
+
+    def render(self) -> str:
+        def fmt(labels: tuple) -> str:
+            return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+        lines = [
+            "# HELP careerify_stage_duration_seconds Wall time of pipeline stages.",
+            "# TYPE careerify_stage_duration_seconds histogram",
+        ]
+        with self._lock:
+            for labels, (buckets, total) in sorted(self._durations.items()):
+                for bound, count in zip([*DURATION_BUCKETS, "+Inf"], buckets):
+                    lines.append(f"careerify_stage_duration_seconds_bucket{fmt(labels + (('le', bound),))} {count}")
+                lines.append(f"careerify_stage_duration_seconds_sum{fmt(labels)} {total[0]:.6f}")
+                lines.append(f"careerify_stage_duration_seconds_count{fmt(labels)} {buckets[-1]}")
+            metrics = sorted({metric for metric, _ in self._counters})
+            for metric in metrics:
+                lines.append(f"# TYPE {metric} counter")
+                for (name, labels), value in sorted(self._counters.items()):
+                    if name == metric:
+                        lines.append(f"{metric}{fmt(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, force: bool = False) -> None:
+        """Rewrite the metrics file atomically, at most every METRICS_WRITE_INTERVAL_SECONDS unless forced."""
+        now = time.monotonic()
+        with self._lock:
+            if not self.path or (not force and now - self._last_write < METRICS_WRITE_INTERVAL_SECONDS):
+                return
+            self._last_write = now
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(self.render())
+            os.replace(tmp, self.path)
+        except OSError:
+            pass  # read-only deployments still get logs and the in-app panel
+
+
+metrics = Metrics()
+
+_current_run: contextvars.ContextVar[Run | None] = contextvars.ContextVar("careerify_run", default=None)
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("careerify_span", default=None)
+
+
+def _finish(span: Span) -> None:
+    run = _current_run.get()
+    if run is not None:
+        run.add(span)
+    metrics.observe(span)
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps({
+            "event": "stage",
+            "run": run.id if run else None,
+            "stage": span.stage,
+            "duration_ms": round(span.duration * 1000, 1),
+            "status": span.status,
+            **span.attrs,
+        }, default=str))
+
+
+@contextmanager
+def span(stage: str, **attrs):
+    """Time a stage; the yielded Span (also reachable via count/annotate) collects its attributes."""
+    s = Span(stage, attrs)
+    token = _current_span.set(s)
+    try:
+        yield s
+    except GeneratorExit:
+        s.status = "cancelled"
+        raise
+    except BaseException as e:
+        s.status = "error"
+        s.attrs.setdefault("error", type(e).__name__)
+        raise
+    finally:
+        s.duration = time.perf_counter() - s.start
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # A generator finished in a different context than it started in
+            _current_span.set(None)
+        _finish(s)
+
+
+def record_stage(stage: str, duration: float, status: str = "ok", **attrs) -> None:
+    """Record a stage timed elsewhere (e.g. accumulated across many small calls)."""
+    s = Span(stage, attrs)
+    s.start -= duration
+    s.duration = duration
+    s.status = status
+    _finish(s)
+
+
+def count(key: str, amount: float = 1) -> None:
+    """Add to a numeric attribute of the current span (tokens, retries, queue wait)."""
+    s = _current_span.get()
+    if s is not None:
+        s.add(key, amount)
+
+
+def annotate(**attrs) -> None:
+    """Set attributes of the current span, e.g. annotate(cache="hit")."""
+    s = _current_span.get()
+    if s is not None:
+        s.set(**attrs)
+
+
+def start_run(name: str) -> Run:
+    """Collect the spans of this thread (and of functions wrapped with bind) into a new Run."""
+    run = Run(name)
+    run._token = _current_run.set(run)
+    return run
+
+
+def end_run(run: Run) -> None:
+    try:
+        _current_run.reset(run._token)
+    except ValueError:
+        _current_run.set(None)
+    metrics.write(force=True)
+
+
+def bind(fn):
+    """fn running in the caller's telemetry context, for executor.submit(bind(fn), ...)."""
+    return functools.partial(contextvars.copy_context().run, fn)
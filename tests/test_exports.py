@@ -0,0 +1,42 @@
+import pytest
+import exports
+
+ROW = {"Project": "API, v2; core", "Day": "Day 1", "Date": "2026-01-05", "Task": "Read C:\\docs\nthen write, test; ship"}
+
+
+def unfold(ics: str) -> list[str]:
+    return ics.replace("\r\n ", "").split("\r\n")
+
+
+def property_value(ics: str, name: str) -> str:
+    return next(line for line in unfold(ics) if line.startswith(f"{name}:"))[len(name) + 1:]
+
+
+def test_text_values_are_escaped():
+    ics = exports.to_ics([ROW]).decode("utf-8")
+    assert property_value(ics, "SUMMARY") == r"API\, v2\; core: Day 1"
+    assert property_value(ics, "DESCRIPTION") == r"Read C:\\docs\nthen write\, test\; ship"
+
+
+@pytest.mark.parametrize("task", ["x" * 200, "é" * 120, "日本語のタスク" * 20, "a" * 74 + "é" * 3])
+def test_long_lines_fold_at_75_octets(task):
+    ics = exports.to_ics([{**ROW, "Task": task}])
+    lines = ics.split(b"\r\n")
+    assert all(len(line) <= 75 for line in lines)
+    # Every physical line decodes on its own: no UTF-8 sequence is split across a fold
+    for line in lines:
+        line.decode("utf-8")
+    assert property_value(ics.decode("utf-8"), "DESCRIPTION") == task
+
+
+def test_calendar_structure_and_stable_uids():
+    ics = exports.to_ics([ROW, {**ROW, "Day": "Day 2", "Date": "2026-01-06"}]).decode("utf-8")
+    lines = unfold(ics)
+    assert ics.endswith("\r\n") and "\n" not in ics.replace("\r\n", "")
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-2] == "END:VCALENDAR"
+    assert lines.count("BEGIN:VEVENT") == 2
+    assert "DTSTART:20260105T000000Z" in lines
+    uids = [line for line in lines if line.startswith("UID:")]
+    assert len(set(uids)) == 2
+    again = unfold(exports.to_ics([ROW, {**ROW, "Day": "Day 2", "Date": "2026-01-06"}]).decode("utf-8"))
+    assert uids == [line for line in again if line.startswith("UID:")]
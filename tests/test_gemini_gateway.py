@@ -0,0 +1,119 @@
+import time
+import types
+import pytest
+from google.api_core import exceptions as api_exceptions
+from gemini_gateway import CircuitBreaker, GeminiGateway, GeminiUnavailable
+
+COOLDOWN = 0.05
+
+
+class ScriptedModel:
+    """generate_content raising or answering from a list of outcomes, one per call."""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+
+    def _next(self):
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return types.SimpleNamespace(text=outcome, usage_metadata=None)
+
+    def generate_content(self, prompt, generation_config=None, stream=False, **kwargs):
+        if stream:
+            return self._stream()
+        return self._next()
+
+    def _stream(self):
+        yield self._next()
+        yield types.SimpleNamespace(text="more", usage_metadata=None)
+
+
+def gateway_with(outcomes) -> GeminiGateway:
+    gateway = GeminiGateway(requests_per_minute=1e6, tokens_per_minute=1e9)
+    gateway.limits("stub").breaker = CircuitBreaker(threshold=2, cooldown=COOLDOWN)
+    gateway._models["stub"] = ScriptedModel(outcomes)
+    return gateway
+
+
+def open_breaker(gateway: GeminiGateway) -> None:
+    for _ in range(2):
+        with pytest.raises(api_exceptions.ServiceUnavailable):
+            gateway.generate("stub", "prompt", max_retries=0)
+    assert gateway.limits("stub").breaker.state == "open"
+
+
+def test_breaker_opens_then_closes_after_successful_trial():
+    gateway = gateway_with([api_exceptions.ServiceUnavailable("503")] * 2 + ["ok"])
+    open_breaker(gateway)
+    with pytest.raises(GeminiUnavailable):
+        gateway.generate("stub", "prompt", max_retries=0)
+    time.sleep(COOLDOWN)
+    assert gateway.limits("stub").breaker.state == "half-open"
+    assert gateway.generate("stub", "prompt", max_retries=0).text == "ok"
+    assert gateway.limits("stub").breaker.state == "closed"
+
+
+def test_failed_trial_reopens_breaker():
+    gateway = gateway_with([api_exceptions.ServiceUnavailable("503")] * 3)
+    open_breaker(gateway)
+    time.sleep(COOLDOWN)
+    with pytest.raises(api_exceptions.ServiceUnavailable):
+        gateway.generate("stub", "prompt", max_retries=0)
+    assert gateway.limits("stub").breaker.state == "open"
+
+
+@pytest.mark.parametrize("error", [api_exceptions.InvalidArgument("400"), TimeoutError()])
+def test_trial_without_verdict_lets_the_next_call_try(error):
+    gateway = gateway_with([api_exceptions.ServiceUnavailable("503")] * 2 + [error, "ok"])
+    open_breaker(gateway)
+    time.sleep(COOLDOWN)
+    with pytest.raises(type(error)):
+        gateway.generate("stub", "prompt", max_retries=0)
+    assert gateway.generate("stub", "prompt", max_retries=0).text == "ok"
+    assert gateway.limits("stub").breaker.state == "closed"
+
+
+def test_dropped_trial_stream_lets_the_next_call_try():
+    gateway = gateway_with([api_exceptions.ServiceUnavailable("503")] * 2 + ["first", "ok"])
+    open_breaker(gateway)
+    time.sleep(COOLDOWN)
+    stream = gateway.stream("stub", "prompt", max_retries=0)
+    assert next(stream).text == "first"
+    stream.close()
+    assert gateway.generate("stub", "prompt", max_retries=0).text == "ok"
+    assert gateway.limits("stub").breaker.state == "closed"
+
+
+def test_trial_lost_in_quota_queue_lets_the_next_call_try(monkeypatch):
+    gateway = gateway_with([api_exceptions.ServiceUnavailable("503")] * 2 + ["ok"])
+    open_breaker(gateway)
+    time.sleep(COOLDOWN)
+    monkeypatch.setattr("gemini_gateway.MAX_QUEUE_SECONDS", 0.0)
+    requests = gateway.limits("stub").requests
+    requests.level = -requests.capacity
+    with pytest.raises(GeminiUnavailable):
+        gateway.generate("stub", "prompt", max_retries=0)
+    requests.level = requests.capacity
+    assert gateway.generate("stub", "prompt", max_retries=0).text == "ok"
+
+
+def test_open_breaker_only_pauses_its_own_model():
+    gateway = gateway_with([api_exceptions.ServiceUnavailable("503")] * 2)
+    gateway._models["other"] = ScriptedModel(["ok"])
+    open_breaker(gateway)
+    with pytest.raises(GeminiUnavailable):
+        gateway.generate("stub", "prompt", max_retries=0)
+    assert gateway.generate("other", "prompt", max_retries=0).text == "ok"
+    assert gateway.status()["breakers"] == {"stub": "open", "other": "closed"}
+    assert gateway.status()["breaker"] == "closed"
+
+
+def test_route_falls_back_past_an_open_breaker(monkeypatch):
+    import model_routing
+    gateway = gateway_with([api_exceptions.ServiceUnavailable("503")] * 2)
+    gateway._models["other"] = ScriptedModel(["fallback"])
+    open_breaker(gateway)
+    monkeypatch.setattr(model_routing, "get_gateway", lambda: gateway)
+    monkeypatch.setattr(model_routing, "route", lambda stage: ["stub", "other"])
+    assert model_routing.generate("report", "prompt").text == "fallback"
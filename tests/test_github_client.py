@@ -0,0 +1,92 @@
+import types
+import pytest
+import career_ai
+from github_client import GitHubClient, GitHubError, language_shares
+
+
+def node(name: str, languages: dict[str, int], fork: bool = False) -> dict:
+    return {
+        "name": name,
+        "description": f" {name} description ",
+        "isFork": fork,
+        "primaryLanguage": {"name": next(iter(languages), None)},
+        "languages": {"edges": [{"size": size, "node": {"name": lang}} for lang, size in languages.items()]},
+        "repositoryTopics": {"nodes": [{"topic": {"name": "cli"}}]},
+        "readme": {"text": "[![build](https://ci/badge.svg)](https://ci) A tool"},
+        "readmeLower": None,
+    }
+
+
+class GraphQLStub:
+    """session.post answering REPOS_QUERY from a list of nodes, paginated by an index cursor."""
+
+    def __init__(self, nodes: list[dict] | None = None, user_missing: bool = False):
+        self.nodes, self.user_missing, self.variables = nodes or [], user_missing, []
+
+    def post(self, url, json=None, timeout=None):
+        variables = json["variables"]
+        self.variables.append(variables)
+        if self.user_missing:
+            body = {"data": {"user": None}, "errors": [{"message": "Could not resolve to a User"}]}
+        else:
+            start = int(variables["after"] or 0)
+            end = start + variables["first"]
+            body = {"data": {"user": {"repositories": {
+                "pageInfo": {"hasNextPage": end < len(self.nodes), "endCursor": str(end)},
+                "nodes": self.nodes[start:end],
+            }}}}
+        return types.SimpleNamespace(json=lambda: body, raise_for_status=lambda: None)
+
+
+def client_with(stub: GraphQLStub, token: str | None = "token") -> GitHubClient:
+    client = GitHubClient(token=token)
+    client.session = stub
+    return client
+
+
+def test_enrich_repos_follows_end_cursor(monkeypatch):
+    monkeypatch.setattr("github_client.GRAPHQL_PAGE_SIZE", 2)
+    stub = GraphQLStub([node(f"repo-{i}", {"Python": 100}) for i in range(5)])
+    repos = client_with(stub).enrich_repos("octocat")
+    assert [repo["name"] for repo in repos] == [f"repo-{i}" for i in range(5)]
+    assert [v["after"] for v in stub.variables] == [None, "2", "4"]
+    assert repos[0]["description"] == "repo-0 description"
+    assert repos[0]["readme"] == "A tool"
+    assert repos[0]["topics"] == ["cli"]
+
+
+def test_enrich_repos_stops_at_limit(monkeypatch):
+    monkeypatch.setattr("github_client.GRAPHQL_PAGE_SIZE", 2)
+    stub = GraphQLStub([node(f"repo-{i}", {"Python": 100}) for i in range(5)])
+    assert len(client_with(stub).enrich_repos("octocat", limit=3)) == 3
+    assert [v["first"] for v in stub.variables] == [2, 1]
+
+
+def test_unknown_user_raises():
+    with pytest.raises(GitHubError, match="Could not resolve"):
+        client_with(GraphQLStub(user_missing=True)).enrich_repos("nobody")
+
+
+def test_profile_without_token_falls_back_to_rest(monkeypatch):
+    stub = GraphQLStub([node("repo", {"Python": 100})])
+    monkeypatch.setattr(career_ai, "get_github_client", lambda: client_with(stub, token=None))
+    monkeypatch.setattr(career_ai, "fetch_github_repos", lambda username: ["rest-repo"])
+    assert career_ai.fetch_github_profile("octocat") == [{"name": "rest-repo"}]
+    assert stub.variables == []
+
+
+def test_profile_falls_back_to_rest_when_graphql_fails(monkeypatch):
+    monkeypatch.setattr(career_ai, "get_github_client", lambda: client_with(GraphQLStub(user_missing=True)))
+    monkeypatch.setattr(career_ai, "fetch_github_repos", lambda username: ["rest-repo"])
+    assert career_ai.fetch_github_profile("octocat") == [{"name": "rest-repo"}]
+
+
+def test_language_shares_skip_forks_and_sort_by_bytes():
+    repos = [
+        {"languages": {"Python": 300, "Shell": 100}},
+        {"languages": {"Go": 600}},
+        {"languages": {"Rust": 10_000}, "fork": True},
+        {"name": "no languages"},
+    ]
+    assert language_shares(repos) == [("Go", 0.6), ("Python", 0.3), ("Shell", 0.1)]
+    assert language_shares([]) == []
@@ -0,0 +1,49 @@
+import threading
+import time
+import types
+from jobs import HTTPCache
+
+URL = "https://jobs.example/search"
+
+
+class CountingSession:
+    """session.get answering every request with status after delay seconds, counting requests."""
+
+    def __init__(self, status: int = 200, delay: float = 0.0):
+        self.status, self.delay, self.requests = status, delay, 0
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests += 1
+        time.sleep(self.delay)
+        return types.SimpleNamespace(status_code=self.status, headers={}, text="postings")
+
+
+def cache_with(session: CountingSession, retry_interval: float = 60.0) -> HTTPCache:
+    cache = HTTPCache(refresh_interval=60.0, retry_interval=retry_interval)
+    cache.session = session
+    return cache
+
+
+def test_concurrent_misses_share_one_request():
+    session = CountingSession(delay=0.1)
+    cache = cache_with(session)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get(URL, lambda r: r.text))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == ["postings"] * 4
+    assert session.requests == 1
+
+
+def test_failed_fetch_is_not_retried_until_retry_interval():
+    session = CountingSession(status=403)
+    cache = cache_with(session, retry_interval=0.05)
+    assert cache.get(URL, lambda r: r.text) is None
+    assert cache.get(URL, lambda r: r.text) is None
+    assert session.requests == 1
+    time.sleep(0.05)
+    session.status = 200
+    assert cache.get(URL, lambda r: r.text) == "postings"
+    assert session.requests == 2
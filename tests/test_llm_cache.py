@@ -0,0 +1,66 @@
+import sqlite3
+import time
+import pytest
+import career_ai
+import llm_cache
+from llm_cache import LLMCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LLMCache(str(tmp_path / "llm.sqlite3"), max_entries=2)
+
+
+def stored_stats(cache: LLMCache) -> dict:
+    with sqlite3.connect(cache.path) as conn:
+        return {stage: (hits, misses) for stage, hits, misses in conn.execute("SELECT stage, hits, misses FROM stats")}
+
+
+def test_entries_expire_after_their_ttl(cache):
+    cache.set("short", "report", "a", ttl=0.05)
+    cache.set("forever", "resume_skills", "b", ttl=None)
+    assert cache.get("short", "report") == "a"
+    time.sleep(0.06)
+    assert cache.get("short", "report") is None
+    assert cache.get("forever", "resume_skills") == "b"
+
+
+def test_generate_text_stores_with_the_stage_ttl(monkeypatch, cache):
+    monkeypatch.setitem(llm_cache.STAGE_TTLS, "report", 0.05)
+    monkeypatch.setattr(career_ai, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(career_ai.model_routing, "generate", lambda stage, prompt, config=None: "answer")
+    monkeypatch.setattr(career_ai, "safe_gemini_text", lambda resp: resp)
+    career_ai.generate_text("report", "prompt")
+    key = career_ai.cache_key("report", "prompt")
+    assert cache.get(key, "report") == "answer"
+    time.sleep(0.06)
+    assert cache.get(key, "report") is None
+
+
+def test_set_evicts_least_recently_used(cache):
+    cache.set("a", "report", "1")
+    cache.set("b", "report", "2")
+    # The hit is only buffered, but set writes it before evicting
+    assert cache.get("a", "report") == "1"
+    cache.set("c", "report", "3")
+    assert cache.get("b", "report") is None
+    assert cache.get("a", "report") == "1" and cache.get("c", "report") == "3"
+
+
+def test_hits_and_misses_are_counted_per_stage_in_batches(cache):
+    cache.set("a", "report", "1")
+    cache.get("a", "report")
+    cache.get("a", "report")
+    cache.get("missing", "market_context")
+    # Nothing written yet: hits don't cost a write transaction
+    assert stored_stats(cache) == {}
+    stats = cache.stats()
+    assert stats["process"] == {"hits": 2, "misses": 1}
+    assert stats["stages"] == {"report": {"hits": 2, "misses": 0}, "market_context": {"hits": 0, "misses": 1}}
+    assert stored_stats(cache) == {"report": (2, 0), "market_context": (0, 1)}
+
+
+def test_counters_flush_once_the_interval_passes(monkeypatch, cache):
+    monkeypatch.setattr(llm_cache, "STATS_FLUSH_SECONDS", 0.0)
+    cache.get("missing", "report")
+    assert stored_stats(cache) == {"report": (0, 1)}
@@ -0,0 +1,59 @@
+import pytest
+import career_ai
+from llm_cache import LLMCache
+
+
+@pytest.fixture
+def market(monkeypatch, tmp_path):
+    """Market context with an empty index, a fresh response cache, and counted demand fetches and prompts."""
+    calls = {"demand": 0, "prompts": []}
+    index, cache = {}, LLMCache(str(tmp_path / "llm.sqlite3"))
+
+    def fetch_demand(role):
+        calls["demand"] += 1
+        return [{"skill": "python", "share": 40 + calls["demand"]}], 50
+
+    def generate(stage, prompt, generation_config=None):
+        calls["prompts"].append(prompt)
+        return f"overview {len(calls['prompts'])}"
+
+    monkeypatch.setattr(career_ai, "LIVE_DEMAND", True)
+    monkeypatch.setattr(career_ai, "get_market_index", lambda: index)
+    monkeypatch.setattr(career_ai, "get_market_demand", fetch_demand)
+    monkeypatch.setattr(career_ai, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(career_ai.model_routing, "generate", generate)
+    monkeypatch.setattr(career_ai, "safe_gemini_text", lambda resp: resp)
+    monkeypatch.setattr("demand.format_demand_summary", lambda demand, postings: f"python in {demand[0]['share']}%")
+    return index, calls
+
+
+def test_indexed_role_fetches_no_postings(market):
+    index, calls = market
+    index["Data Scientist"] = "indexed overview"
+    assert career_ai.get_job_market_context("Data Scientist") == "indexed overview"
+    assert calls["demand"] == 0 and calls["prompts"] == []
+
+
+def test_cache_survives_a_feed_refresh(market):
+    _, calls = market
+    first = career_ai.get_job_market_context("Data Scientist")
+    # The grounded prompt went to the model, but the next lookup hits before fetching demand again
+    assert "python in 41%" in calls["prompts"][0]
+    assert career_ai.get_job_market_context("Data Scientist") == first
+    assert calls["demand"] == 1 and len(calls["prompts"]) == 1
+
+
+def test_demand_rows_rank_distinctive_skills_above_shared_ones():
+    from demand import skill_demand
+    rows = skill_demand(["Python SQL Spark"] * 5, peers={"Frontend Developer": ["JavaScript React Python"] * 5})
+    scores = {row["Skill"]: row["TF-IDF"] for row in rows}
+    assert {row["Skill"]: row["Share"] for row in rows}["Python"] == 1.0
+    assert scores["SQL"] > scores["Python"] > 0
+
+
+def test_refresh_skips_the_cached_response(market):
+    _, calls = market
+    assert career_ai.generate_text("market_context", "prompt") == "overview 1"
+    assert career_ai.generate_text("market_context", "prompt") == "overview 1"
+    assert career_ai.generate_text("market_context", "prompt", refresh=True) == "overview 2"
+    assert career_ai.generate_text("market_context", "prompt") == "overview 2"
@@ -0,0 +1,104 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import pipeline
+from pipeline import MemoStore, Stage
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Stage functions replaced by counting stubs, run against a fresh store."""
+    calls: dict[str, int] = {}
+
+    def stub(name, fn):
+        def run(*args):
+            calls[name] = calls.get(name, 0) + 1
+            return fn(*args)
+        return run
+
+    stages = {
+        "market": lambda role: f"overview of {role}",
+        "github_repos": lambda user: [{"name": f"{user}-repo"}] if user else [],
+        "resume_skills": lambda text: "Python" if text else "",
+        "repo_skills": lambda repos: "Go" if repos else "",
+        "skills": lambda resume, repo: ", ".join(s for s in (resume, repo) if s),
+        "report": lambda skills, role, market: f"{skills} for {role}" if skills else None,
+    }
+    monkeypatch.setattr(pipeline, "STAGES", tuple(
+        Stage(s.name, stub(s.name, stages[s.name]), s.inputs, s.ttl, complete=bool) for s in pipeline.STAGES
+    ))
+    store = MemoStore()
+    monkeypatch.setattr(pipeline, "get_store", lambda: store)
+    return calls
+
+
+def run(inputs: dict) -> dict:
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = pipeline.submit(inputs, executor)
+        return {name: future.result() for name, future in futures.items()}
+
+
+INPUTS = {"role": "Data Scientist", "github_user": "octocat", "resume_text": "resume"}
+
+
+def test_identical_resubmission_runs_nothing(calls):
+    first = run(INPUTS)
+    before = dict(calls)
+    assert run(INPUTS) == first
+    assert calls == before
+
+
+def test_changed_input_only_recomputes_its_dependents(calls):
+    run(INPUTS)
+    calls.clear()
+    result = run({**INPUTS, "github_user": "hubber"})
+    assert set(calls) == {"github_repos", "repo_skills"}
+    # repo_skills is unchanged ("Go"), so skills and report are served from the store
+    assert result["report"] == "Python, Go for Data Scientist"
+
+
+def test_changed_role_leaves_skill_stages_alone(calls):
+    run(INPUTS)
+    calls.clear()
+    run({**INPUTS, "role": "Backend Developer"})
+    assert set(calls) == {"market", "report"}
+
+
+def test_incomplete_results_are_not_stored():
+    store, count = MemoStore(), []
+    stage = Stage("flaky", lambda x: count.append(x) or "", ("x",))
+    pipeline._run_stage(store, stage, [1])
+    pipeline._run_stage(store, stage, [1])
+    assert len(count) == 2
+
+
+def test_empty_ttl_remembers_incomplete_results_briefly():
+    store, count = MemoStore(), []
+    stage = Stage("demand", lambda x: count.append(x) or ([], 0), ("x",), complete=lambda v: bool(v[0]), empty_ttl=0.05)
+    pipeline._run_stage(store, stage, [1])
+    pipeline._run_stage(store, stage, [1])
+    assert len(count) == 1
+    time.sleep(0.06)
+    pipeline._run_stage(store, stage, [1])
+    assert len(count) == 2
+
+
+def test_results_expire_after_the_stage_ttl():
+    store, count = MemoStore(), []
+    stage = Stage("live", lambda x: count.append(x) or "value", ("x",), ttl=0.05)
+    pipeline._run_stage(store, stage, [1])
+    pipeline._run_stage(store, stage, [1])
+    assert len(count) == 1
+    time.sleep(0.06)
+    pipeline._run_stage(store, stage, [1])
+    assert len(count) == 2
+
+
+def test_store_drops_least_recently_used():
+    store = MemoStore(max_entries=2)
+    store.set("a", 1)
+    store.set("b", 2)
+    store.get("a")
+    store.set("c", 3)
+    assert store.get("b") is pipeline._MISSING
+    assert store.get("a") == 1 and store.get("c") == 3
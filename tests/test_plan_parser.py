@@ -0,0 +1,29 @@
+import json
+import pytest
+from plan_parser import DayParser, parse_days
+
+DAYS = [
+    (1, "Set up the repo"),
+    (2, 'Parse config like {a: 1} and {"b": [2]}'),
+    (3, 'Escape "quotes" and a trailing backslash \\'),
+    (4, "Ship it"),
+]
+PLAN = json.dumps({"days": [{"day": day, "task": task} for day, task in DAYS]})
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 40, len(PLAN)])
+def test_structured_days_survive_any_chunking(chunk_size):
+    parser = DayParser(structured=True)
+    for start in range(0, len(PLAN), chunk_size):
+        parser.feed(PLAN[start:start + chunk_size])
+    parser.close()
+    assert parser.days == DAYS
+
+
+def test_truncated_structured_plan_keeps_finished_days():
+    cut = PLAN.index('{"day": 3')
+    assert parse_days(PLAN[:cut + 20], structured=True) == DAYS[:2]
+
+
+def test_markdown_days():
+    assert parse_days("**Day 1:** Read\n\nDay 2: Write") == [(1, "Read"), (2, "Write")]
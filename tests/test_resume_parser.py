@@ -0,0 +1,33 @@
+import io
+import pytest
+from PyPDF2 import PdfWriter
+import resume_parser
+
+
+def blank_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(100, 100)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def empty_text_cache():
+    with resume_parser._text_cache_lock:
+        resume_parser._text_cache.clear()
+
+
+def test_complete_pdf_is_memoized():
+    resume_parser.extract_resume_text(blank_pdf(3), resume_parser.PDF_TYPE)
+    assert len(resume_parser._text_cache) == 1
+
+
+@pytest.mark.parametrize("limits", [{"max_pages": 2}, {"timeout": -1}])
+def test_pdf_cut_short_is_not_memoized(monkeypatch, limits):
+    _, complete = resume_parser.read_pdf(blank_pdf(3), **limits)
+    assert not complete
+    monkeypatch.setitem(resume_parser._EXTRACTORS, resume_parser.PDF_TYPE, lambda data: resume_parser.read_pdf(data, **limits))
+    resume_parser.extract_resume_text(blank_pdf(3), resume_parser.PDF_TYPE)
+    assert resume_parser._text_cache == {}
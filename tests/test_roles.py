@@ -0,0 +1,20 @@
+import pytest
+from roles import canonicalize_role
+
+
+@pytest.mark.parametrize("title, role", [
+    ("ML Engineer", "Machine Learning Engineer"),
+    ("Machine Learning Eng.", "Machine Learning Engineer"),
+    ("Senior Data Scientist", "Data Scientist"),
+    ("Machine Lerning Engineer", "Machine Learning Engineer"),
+    ("Datta Scientist", "Data Scientist"),
+    ("Full-Stack Developer", "Full Stack Developer"),
+])
+def test_known_titles_map_to_their_role(title, role):
+    assert canonicalize_role(title) == role
+
+
+@pytest.mark.parametrize("title", [".NET Developer", "Go Developer", "Swift Developer", "Program Manager"])
+def test_short_titles_are_not_fuzzy_matched_to_another_role(title):
+    # Unknown titles come back unchanged rather than as "Data Engineer", "iOS Developer" or "Project Manager"
+    assert canonicalize_role(title) == title
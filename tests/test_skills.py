@@ -0,0 +1,74 @@
+import pytest
+import skills
+from skills import SkillSet, canonical_skills, compute_skill_gap, get_taxonomy
+from skill_vectors import covered, similarity
+
+
+@pytest.fixture
+def literal_gap(monkeypatch):
+    monkeypatch.setattr(skills, "SEMANTIC_MATCH", False)
+
+
+def test_aliases_resolve_to_one_skill():
+    taxonomy = get_taxonomy()
+    assert taxonomy.resolve("JS") == taxonomy.resolve("Javascript (ES6)") == ["javascript"]
+    assert taxonomy.resolve("HTML/CSS") == ["html", "css"]
+    assert taxonomy.extract("Deployed on k8s") == ["Kubernetes"]
+    assert canonical_skills("JS, JavaScript, Javascript (ES6), Frobnicator") == ["JavaScript", "Frobnicator"]
+
+
+def test_scanner_matches_whole_tokens_only():
+    taxonomy = get_taxonomy()
+    assert taxonomy.extract("JavaScript developer") == ["JavaScript"]
+    assert taxonomy.extract("Java and JavaScript") == ["Java", "JavaScript"]
+    assert taxonomy.extract("C++ and C# services") == ["C++", "C#"]
+
+
+def test_case_sensitive_aliases_skip_ordinary_words():
+    taxonomy = get_taxonomy()
+    assert taxonomy.extract("I go to the store") == []
+    assert taxonomy.extract("Experience with Go and R") == ["Go", "R"]
+    assert taxonomy.resolve("go") == []
+
+
+def test_skill_set_operations():
+    taxonomy = get_taxonomy()
+    have = taxonomy.skill_set(["Python", "JS", "Frobnicator"])
+    need = taxonomy.skill_set(["python", "Docker", "frobnicator "])
+    assert "python" in have and "javascript" in have and "docker" not in have
+    assert len(have) == 3
+    assert len(have & need) == 2 and (have & need).custom == {"frobnicator": "Frobnicator"}
+    assert "docker" in need - have and len(need - have) == 1
+    assert len(have | need) == 4
+
+
+def test_gap_keeps_market_order(literal_gap):
+    matched, missing = compute_skill_gap("Python, JS", "Need Kubernetes, Python, Docker and JavaScript")
+    assert matched == ["Python", "JavaScript"]
+    assert missing == ["Kubernetes", "Docker"]
+
+
+def test_gap_without_user_skills(literal_gap):
+    assert compute_skill_gap("", "Python and SQL") == ([], ["Python", "SQL"])
+
+
+def test_semantic_match_covers_implied_skills():
+    market = "Python, Deep Learning, Docker"
+    assert compute_skill_gap("PyTorch", market) == (["Deep Learning"], ["Python", "Docker"])
+
+
+def test_semantic_match_can_be_turned_off(literal_gap):
+    assert compute_skill_gap("PyTorch", "Python, Deep Learning, Docker") == ([], ["Python", "Deep Learning", "Docker"])
+
+
+def test_coverage_threshold():
+    user, market = ["Frobnicator tuning"], ["frobnicator tuning work"]
+    score = float(similarity(user, market)[0, 0])
+    assert 0 < score < 1
+    assert covered(user, market, threshold=score) == ["Frobnicator tuning"]
+    assert covered(user, market, threshold=score + 0.01) == [None]
+
+
+def test_coverage_picks_the_best_user_skill():
+    assert covered(["Excel", "PyTorch"], ["Deep Learning", "Kubernetes"]) == ["PyTorch", None]
+    assert covered([], ["Deep Learning"]) == [None]
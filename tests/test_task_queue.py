@@ -0,0 +1,46 @@
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+import task_queue
+from task_queue import FAILED, QUEUED, RUNNING, TaskQueue
+
+
+def add_task(path, task_id: str, status: str, owner: str | None) -> None:
+    TaskQueue(path, workers=1)
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "INSERT INTO tasks(id, kind, digest, status, created_at, owner) VALUES (?, 'analysis', ?, ?, ?, ?)",
+            (task_id, task_id, status, time.time(), owner),
+        )
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def test_restart_only_fails_tasks_of_dead_owners(tmp_path):
+    path = str(tmp_path / "tasks.sqlite3")
+    own_pid = task_queue.OWNER.split(":")[0]
+    add_task(path, "live", RUNNING, f"{os.getppid()}:other")
+    add_task(path, "dead", RUNNING, f"{dead_pid()}:gone")
+    add_task(path, "previous-start", QUEUED, f"{own_pid}:stale")
+    add_task(path, "legacy", QUEUED, None)
+
+    queue = TaskQueue(path, workers=1)
+    statuses = {task_id: queue.get(task_id)["status"] for task_id in ("live", "dead", "previous-start", "legacy")}
+    assert statuses == {"live": RUNNING, "dead": FAILED, "previous-start": FAILED, "legacy": FAILED}
+
+
+def test_adds_owner_column_to_an_old_table(tmp_path):
+    path = str(tmp_path / "tasks.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE tasks (id TEXT PRIMARY KEY, kind TEXT NOT NULL, digest TEXT NOT NULL, status TEXT NOT NULL, "
+            "progress TEXT, result TEXT, error TEXT, created_at REAL NOT NULL, started_at REAL, finished_at REAL)"
+        )
+        conn.execute("INSERT INTO tasks(id, kind, digest, status, created_at) VALUES ('old', 'analysis', 'd', ?, 0)", (RUNNING,))
+    assert TaskQueue(path, workers=1).get("old")["status"] == FAILED
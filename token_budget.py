@@ -0,0 +1,143 @@
+# token_budget.py
+"""
+Per-stage input token budgets.
+Resumes are compacted to the sections that carry skills before they are sent to Gemini, and
+intermediate outputs (market overview, repository lists) are trimmed to the budget of the stage
+that consumes them. Token counts before and after are logged under "careerify.tokens".
+"""
+import os
+import re
+import logging
+from gemini_gateway import estimate_tokens, get_gateway
+from model_routing import DEFAULT_ROUTE, TIERS, primary_model
+
+logger = logging.getLogger("careerify.tokens")
+
+# "estimate" (local, ~4 characters per token) or "api" (Gemini count_tokens on the stage's primary model,
+# one extra request per prompt)
+TOKEN_COUNTER = os.getenv("CAREERIFY_TOKEN_COUNTER", "estimate").lower()
+
+# Input tokens allowed for the variable part of each stage's prompt;
+# override with CAREERIFY_TOKEN_BUDGET_<STAGE>, e.g. CAREERIFY_TOKEN_BUDGET_RESUME_SKILLS=1500
+DEFAULT_BUDGETS = {
+    "resume_skills": 2000,
+    "repo_skills": 600,
+    # Enriched repositories: languages, topics and README excerpts per repo
+    "repo_profile": 4000,
+    "report": 800,
+}
+
+# Resume sections in the order they are kept when the budget runs out; None marks sections that are dropped
+_SECTIONS = [
+    ("skills", r"(?:technical |core |key )?(?:skills|competencies|technologies|tech stack|tools)(?: (?:&|and) \w+)?"),
+    ("projects", r"(?:personal |academic |selected |key )?projects?"),
+    ("experience", r"(?:work |professional |relevant )?(?:experience|employment(?: history)?|work history)"),
+    ("certifications", r"certifications?|licenses?(?: (?:&|and) certifications?)?|courses|training"),
+    ("summary", r"(?:professional )?(?:summary|profile|objective|about me)"),
+    ("education", r"education(?: (?:&|and) training)?|academic background"),
+    (None, r"references|hobbies|interests|personal (?:details|information)|languages spoken|declaration"),
+]
+_SECTION_PRIORITY = [name for name, _ in _SECTIONS if name] + ["other"]
+_HEADING_RES = [(name, re.compile(rf"^(?:{pattern})\s*:?$", re.IGNORECASE)) for name, pattern in _SECTIONS]
+
+_BOILERPLATE_RE = re.compile(
+    r"^(?:curriculum vitae|resume|r[ée]sum[ée]|page \d+(?: of \d+)?|references available(?: upon| on)? request\.?)$",
+    re.IGNORECASE,
+)
+# Emails, phone numbers and links carry no skills
+_CONTACT_RE = re.compile(
+    r"[\w.+-]+@[\w-]+\.[\w.]+|(?:\+\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]\d{3}[\s.-]\d{4}|(?:https?://|www\.)\S+",
+    re.IGNORECASE,
+)
+
+
+def stage_budget(stage: str) -> int:
+    return int(os.getenv(f"CAREERIFY_TOKEN_BUDGET_{stage.upper()}", DEFAULT_BUDGETS.get(stage, 2000)))
+
+
+def count_tokens(text: str, stage: str | None = None) -> int:
+    """
+    Token count of text, from the Gemini model that answers stage (the default route's first model
+    without one) when CAREERIFY_TOKEN_COUNTER=api, otherwise estimated locally.
+    """
+    if TOKEN_COUNTER == "api":
+        try:
+            model_name = primary_model(stage) if stage else TIERS[DEFAULT_ROUTE[0]]
+            return get_gateway().model(model_name).count_tokens(text).total_tokens
+        except Exception:
+            pass
+    return estimate_tokens(text)
+
+
+def _heading(line: str) -> str | None:
+    """Section name for a heading line, "" for a section that is dropped, None for an ordinary line."""
+    if len(line) > 40:
+        return None
+    stripped = line.strip("#*-•:_= ").strip()
+    for name, pattern in _HEADING_RES:
+        if pattern.match(stripped):
+            return name or ""
+    return None
+
+
+def _fit_lines(lines: list[str], budget: int) -> list[str]:
+    """Leading lines that fit in budget tokens."""
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line)
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def compact_resume(text: str, budget: int) -> str:
+    """
+    Resume text cut down for a skills prompt: boilerplate, contact details and repeated lines
+    (page headers and footers) are removed, sections like references are dropped, and if it is still
+    over budget the skills, projects and experience sections are kept ahead of the rest.
+    """
+    sections: dict[str, list[str]] = {}
+    current, seen = "other", set()
+    for raw in (text or "").splitlines():
+        line = " ".join(_CONTACT_RE.sub(" ", raw).split()).strip(" |·•,")
+        if not line or _BOILERPLATE_RE.match(line):
+            continue
+        heading = _heading(line)
+        if heading is not None:
+            current = heading
+            continue
+        key = line.lower()
+        if current and key not in seen:
+            seen.add(key)
+            sections.setdefault(current, []).append(line)
+
+    blocks, used = [], 0
+    for name in _SECTION_PRIORITY:
+        lines = _fit_lines(sections.get(name, []), budget - used)
+        if not lines:
+            continue
+        block = "\n".join(lines if name == "other" else [f"{name.title()}:", *lines])
+        blocks.append(block)
+        used += estimate_tokens(block)
+    return "\n\n".join(blocks)
+
+
+def trim_to_budget(text: str, budget: int) -> str:
+    """Leading whole lines of text (a Markdown overview) that fit in budget tokens."""
+    if estimate_tokens(text) <= budget:
+        return text
+    return "\n".join(_fit_lines((text or "").splitlines(), budget))
+
+
+def fit_items(items: list[str], budget: int) -> list[str]:
+    """Leading items of a list that fit in budget tokens."""
+    return _fit_lines(items, budget)
+
+
+def log_compaction(stage: str, before: str, after: str) -> None:
+    if logger.isEnabledFor(logging.INFO):
+        original, compacted = count_tokens(before, stage), count_tokens(after, stage)
+        saved = 1 - compacted / original if original else 0.0
+        logger.info("%s input tokens: %d -> %d (%.0f%% saved)", stage, original, compacted, saved * 100)